@@ -0,0 +1,42 @@
+"""#### Picture benchmark
+
+Compare size of photo as taken by phone with cover prepared by
+`bookmeister.picture.prepare` and measure time of preparation. Photo is
+generated with noise, so it compresses like real one.
+
+Run with `$ python -m benchmarks.picture`.
+"""
+
+from io import BytesIO
+from time import perf_counter
+
+import PIL.Image
+
+from bookmeister.picture import prepare
+
+
+def photo(size=(4032, 3024), quality=95):
+    """Return JPEG encoded noisy photo of phone camera size."""
+    image = PIL.Image.merge('RGB', [PIL.Image.effect_noise(size, sigma)
+                                    for sigma in (40, 60, 80)])
+    output = BytesIO()
+    image.save(output, 'JPEG', quality=quality)
+    return output.getvalue()
+
+
+def main(repeat=5):
+    """Print sizes and preparation times for both formats."""
+    source = photo()
+    print(f'source: {len(source) / 2 ** 20:.2f} MiB')
+    for image_format in ('JPEG', 'WEBP'):
+        start = perf_counter()
+        for _ in range(repeat):
+            prepared = prepare(BytesIO(source), image_format=image_format)
+        elapsed = (perf_counter() - start) / repeat
+        size = len(prepared.getvalue())
+        print(f'{image_format}: {size / 2 ** 10:.0f} KiB, '
+              f'{len(source) / size:.0f}x smaller, {elapsed * 1000:.0f} ms')
+
+
+if __name__ == '__main__':
+    main()
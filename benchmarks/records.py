@@ -0,0 +1,43 @@
+"""#### Records benchmark
+
+Compare memory used by many records stored as `bookmeister.record.Record`
+dictionaries and as `bookmeister.record.BookRecord` objects. Values are
+shared by both, so only containers are measured.
+
+Run with `$ python -m benchmarks.records`.
+"""
+
+import gc
+import tracemalloc
+
+from benchmarks.replica import generate
+from bookmeister.record import BookRecord, Record
+
+
+def measure(kind, data):
+    """Return number of bytes allocated to convert data to `kind`."""
+    gc.collect()
+    tracemalloc.start()
+    records = [kind(values) for values in data]
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del records
+    return size
+
+
+def main(count=100000):
+    """Print memory used by records of both types."""
+    data = generate(count)
+    for values in data:
+        values.update(Type='Test', Publisher='Tester', Language='EN',
+                      Release=2020, Quantity=5, Price=12.5, Discount=0,
+                      Hardcover=True, Cover=None)
+    sizes = [measure(kind, data) for kind in (Record, BookRecord)]
+    for kind, size in zip((Record, BookRecord), sizes):
+        print(f'{kind.__name__}: {size / 2 ** 20:.1f} MiB, '
+              f'{size / count:.0f} bytes per record')
+    print(f'ratio: {sizes[0] / sizes[1]:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+"""#### Replica benchmark
+
+Measure search latency of `bookmeister.replica.Replica` holding generated
+collection and compare it with search sent to local stand-in server.
+
+Run with `$ python -m benchmarks.replica`.
+"""
+
+from statistics import median
+from time import perf_counter
+
+from benchmarks import server
+from bookmeister.connection import Database
+from bookmeister.replica import Replica
+
+
+def generate(count):
+    """Return list of `count` generated records."""
+    return [{'_id': f'{number:024x}', '_changed': '2020-05-01T10:00:00Z',
+             'ISBN': 9780000000000 + number, 'Title': f'Title {number}',
+             'Author': f'Author {number % 1000}', 'Pages': number % 900}
+            for number in range(count)]
+
+
+def measure(search, parameters, repeat):
+    """Return median latency of search in microseconds."""
+    latencies = []
+    for _ in range(repeat):
+        start = perf_counter()
+        search(parameters)
+        latencies.append((perf_counter() - start) * 10 ** 6)
+    return median(latencies)
+
+
+def main(count=100000, repeat=200):
+    """Print median search latencies for replica and for server."""
+    records = generate(count)
+    stand_in = server.start()
+    stand_in.records.update((record['_id'], record) for record in records)
+    host, port = stand_in.server_address
+    database = Database()
+    database.url = f'http://{host}:{port}'
+
+    replica = Replica()
+    start = perf_counter()
+    replica.sync(database, page_size=5000)
+    print(f'full sync of {count} records: {perf_counter() - start:.2f} s')
+
+    parameters = {'ISBN': 9780000000000 + count // 2}
+    local = measure(replica.search, parameters, repeat)
+    remote = measure(database.search, parameters, repeat // 10)
+    stand_in.shutdown()
+
+    print(f'replica search: {local:.1f} us')
+    print(f'server search:  {remote:.1f} us')
+
+
+if __name__ == '__main__':
+    main()
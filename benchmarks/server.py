@@ -0,0 +1,185 @@
+"""#### Server
+
+Local stand-in of database REST API used by benchmarks. It keeps books
+collection and uploaded media in memory and answers requests sent by
+`bookmeister.connection.Database`. Server speaks HTTP/1.1 so connections can
+be kept alive between requests. Each response can be delayed and chosen part
+of requests can fail with status 503 to imitate slow or unreliable network.
+Modules used: `http.server`, `json`, `random`, `threading`, `time` and
+`uuid`.
+"""
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from json import dumps, loads
+from random import Random
+from threading import Lock, Thread
+from time import sleep
+from urllib.parse import parse_qs, urlsplit
+from uuid import uuid4
+
+COLLECTION = '/rest/books'
+MEDIA = '/media'
+
+
+class Handler(BaseHTTPRequestHandler):
+    """Answer requests with records stored in `self.server.records`."""
+
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def log_message(self, *_):
+        """Do not print access log."""
+
+    def reply(self, body, status=200):
+        """Send `body` converted to JSON."""
+        self.send(dumps(body).encode(), 'application/json', status)
+
+    def send(self, data, content_type, status=200):
+        """Send raw bytes."""
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def read(self, decode=True):
+        """Return request body, decoded from JSON by default."""
+        length = int(self.headers.get('Content-Length', 0))
+        data = self.rfile.read(length)
+        return loads(data or 'null') if decode else data
+
+    def parse_request(self):
+        """Delay request, answer with status 503 when it should fail."""
+        if not super().parse_request():
+            return False
+        self.server.delay()
+        if self.server.fails():
+            self.read(decode=False)
+            self.reply({'message': 'Injected failure'}, 503)
+            return False
+        return True
+
+    def record_id(self):
+        """Return record id from request path or None."""
+        path = urlsplit(self.path).path
+        if path.startswith(COLLECTION + '/'):
+            return path[len(COLLECTION) + 1:]
+        return None
+
+    def do_GET(self):
+        """Return records matching `q` parameter or uploaded media.
+
+        Only plain values are compared, query operators are ignored. `sort`,
+        `skip` and `max` parameters are supported.
+        """
+        path = urlsplit(self.path).path
+        if path.startswith(MEDIA + '/'):
+            data = self.server.media.get(path[len(MEDIA) + 1:])
+            if data is None:
+                return self.reply({'message': 'Not found'}, 404)
+            return self.send(data, 'application/octet-stream')
+        query = parse_qs(urlsplit(self.path).query)
+        parameters = loads(query.get('q', ['{}'])[0])
+        records = [record for record in self.server.records.values()
+                   if all(isinstance(value, dict) or record.get(key) == value
+                          for key, value in parameters.items())]
+        if 'sort' in query:
+            records.sort(key=lambda record: record.get(query['sort'][0]))
+        skip = int(query.get('skip', [0])[0])
+        limit = int(query.get('max', [len(records)])[0])
+        self.reply(records[skip:skip + limit])
+
+    def do_POST(self):
+        """Store record, list of records or media and return assigned ids."""
+        if urlsplit(self.path).path == MEDIA:
+            media_id = uuid4().hex
+            self.server.media[media_id] = self.read(decode=False)
+            return self.reply({'ids': [media_id]}, 201)
+        body = self.read()
+        records = [dict(values, _id=uuid4().hex)
+                   for values in (body if isinstance(body, list) else [body])]
+        for record in records:
+            self.server.records[record['_id']] = record
+        self.reply(records if isinstance(body, list) else records[0], 201)
+
+    def do_PATCH(self):
+        """Update record fields."""
+        record = self.server.records.get(self.record_id())
+        if record is None:
+            return self.reply({'message': 'Not found'}, 404)
+        record.update(self.read())
+        self.reply(record)
+
+    def do_DELETE(self):
+        """Remove record."""
+        record_id = self.record_id()
+        if self.server.records.pop(record_id, None) is None:
+            return self.reply({'message': 'Not found'}, 404)
+        self.reply({'result': [record_id]})
+
+
+class Server(ThreadingHTTPServer):
+    """
+    Serve requests in threads, keep records and media in memory.
+
+    ...
+
+    Attributes
+    ----------
+    records : dict
+        stored records with ids as keys
+    media : dict
+        uploaded files content with ids as keys
+    latency : float
+        seconds by which every request is delayed
+    failure_rate : float
+        part of requests answered with status 503, between 0 and 1
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address, latency=0.0, failure_rate=0.0, seed=None):
+        """Bind server to address."""
+        super().__init__(address, Handler)
+        self.records = {}
+        self.media = {}
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self._random = Random(seed)
+        self._lock = Lock()
+
+    def delay(self):
+        """Wait `latency` seconds."""
+        if self.latency:
+            sleep(self.latency)
+
+    def fails(self):
+        """Return True when request should fail."""
+        if not self.failure_rate:
+            return False
+        with self._lock:
+            return self._random.random() < self.failure_rate
+
+
+def start(port=0, latency=0.0, failure_rate=0.0, seed=None):
+    """Run server in background thread.
+
+    Parameters
+    ----------
+    port : int, optional
+        port to listen on, default 0: pick any free port
+    latency : float, optional
+        seconds by which every request is delayed, default 0
+    failure_rate : float, optional
+        part of requests which fail with status 503, default 0
+    seed : int, optional
+        seed of generator choosing failed requests, default None
+
+    Returns
+    -------
+    Server
+        running server, its address is available in `server_address`
+    """
+    server = Server(('127.0.0.1', port), latency, failure_rate, seed)
+    Thread(target=server.serve_forever, daemon=True).start()
+    return server
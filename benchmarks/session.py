@@ -0,0 +1,48 @@
+"""#### Session benchmark
+
+Compare latency of `bookmeister.connection.Database` requests sent with new
+connection each time (like `requests.request` does) against requests sent
+through shared keep-alive pool. Local server is used so measured difference
+covers TCP handshake only; against real database TLS handshake is saved too.
+
+Run with `$ python -m benchmarks.session`.
+"""
+
+from statistics import median
+from time import perf_counter
+
+from benchmarks import server
+from bookmeister import connection
+from bookmeister.connection import Database
+
+
+def measure(database, repeat):
+    """Return list of search latencies in milliseconds."""
+    latencies = []
+    for _ in range(repeat):
+        start = perf_counter()
+        database.search({'ISBN': 9780340425626})
+        latencies.append((perf_counter() - start) * 1000)
+    return latencies
+
+
+def main(repeat=500):
+    """Print median latency for fresh connections and for pooled session."""
+    stand_in = server.start()
+    host, port = stand_in.server_address
+    database = Database()
+    database.url = f'http://{host}:{port}'
+
+    connection.configure_session(keep_alive=False)
+    closed = measure(database, repeat)
+    connection.configure_session()
+    pooled = measure(database, repeat)
+    stand_in.shutdown()
+
+    print(f'new connection per request: {median(closed):.3f} ms')
+    print(f'shared keep-alive session:  {median(pooled):.3f} ms')
+    print(f'speedup: {median(closed) / median(pooled):.2f}x')
+
+
+if __name__ == '__main__':
+    main()
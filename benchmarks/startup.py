@@ -0,0 +1,86 @@
+"""#### Startup benchmark
+
+Measure how long it takes until application window is shown and fail when it
+exceeds time budget. Application is started with `BOOKMEISTER_STARTUP`
+environment variable, so it closes as soon as window is drawn and each run
+takes whole time from start of process. Import of application modules is
+measured too, it does not need display.
+
+Window needs display, use e.g. `$ xvfb-run python -m benchmarks.startup` on
+server, without it only import is measured. Built application is measured
+when its path is passed with `--frozen`, e.g.
+`$ python -m benchmarks.startup --frozen dist/Bookmeister/Bookmeister`.
+Exit status is 1 when median time of any measured command exceeds its
+budget, so benchmark can guard releases.
+"""
+
+from argparse import ArgumentParser
+import os
+from statistics import median
+import subprocess
+import sys
+from time import perf_counter
+
+
+def has_display():
+    """Check if window can be created on this system."""
+    return sys.platform in ('win32', 'darwin') or bool(
+        os.environ.get('DISPLAY') or os.environ.get('WAYLAND_DISPLAY'))
+
+
+def measure(command, repeat):
+    """Return durations of `repeat` runs of command in seconds."""
+    environment = dict(os.environ, BOOKMEISTER_STARTUP='1')
+    durations = []
+    for _ in range(repeat):
+        start = perf_counter()
+        subprocess.run(command, env=environment, check=True,
+                       stdout=subprocess.DEVNULL)
+        durations.append(perf_counter() - start)
+    return durations
+
+
+def main(arguments=None):
+    """Measure startup of application and compare it with budgets.
+
+    Returns
+    -------
+    int
+        exit code, 0 when every median is within its budget else 1
+    """
+    parser = ArgumentParser(description='Measure time needed to show '
+                                        'application window.')
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='number of runs of each command')
+    parser.add_argument('--budget', type=float, default=1.0,
+                        help='seconds allowed to show window')
+    parser.add_argument('--import-budget', type=float, default=0.5,
+                        help='seconds allowed to import application')
+    parser.add_argument('--frozen', help='path of built application')
+    options = parser.parse_args(arguments)
+
+    commands = [('import', [sys.executable, '-c', 'import bookmeister.'
+                                                  '__main__'],
+                 options.import_budget)]
+    if has_display():
+        commands.append(('python -m bookmeister',
+                         [sys.executable, '-m', 'bookmeister'],
+                         options.budget))
+        if options.frozen:
+            commands.append(('frozen', [options.frozen], options.budget))
+    else:
+        print('No display, window is not measured.', file=sys.stderr)
+    exceeded = False
+    for name, command, budget in commands:
+        durations = measure(command, options.repeat)
+        result = median(durations)
+        status = 'ok' if result <= budget else 'OVER BUDGET'
+        exceeded = exceeded or result > budget
+        print(f'{name}: median {result * 1000:.0f} ms, '
+              f'max {max(durations) * 1000:.0f} ms, '
+              f'budget {budget * 1000:.0f} ms: {status}')
+    return 1 if exceeded else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,294 @@
+"""#### Benchmark suite
+
+Measure throughput and latency percentiles of every
+`bookmeister.connection.Database` method and of main GUI flows against local
+stand-in server with optional injected latency and failures. Results are
+written as JSON, so runs of different releases can be compared.
+
+GUI flows are driven with hidden window and notifications are not displayed.
+They need display to create window and are skipped without it, use e.g.
+`$ xvfb-run python -m benchmarks.suite` on server.
+
+Run with `$ python -m benchmarks.suite --output results.json` and compare
+results with `$ python -m benchmarks.suite --compare old.json new.json`.
+"""
+
+from argparse import ArgumentParser
+from datetime import datetime, timezone
+from json import dump, load
+import platform
+import sys
+from tempfile import NamedTemporaryFile
+from time import perf_counter, sleep
+from unittest import mock
+
+from benchmarks import server
+from benchmarks.replica import generate
+from bookmeister import __version__
+from bookmeister.connection import Database
+
+
+def isbn(number):
+    """Return correct ISBN-13 code created from number."""
+    digits = f'978{number % 10 ** 9:09d}'
+    control = (10 - sum(int(digit) * (3 if index % 2 else 1)
+                        for index, digit in enumerate(digits)) % 10) % 10
+    return f'{digits}{control}'
+
+
+def book(number):
+    """Return correct record values as typed in form."""
+    return {'Title': f'Benchmark {number}', 'Author': 'Mr Bench',
+            'Type': 'Test', 'Publisher': 'Tester', 'ISBN': isbn(number),
+            'Release': '2020', 'Language': 'EN', 'Pages': '320',
+            'Quantity': '5', 'Price': '12.50', 'Discount': '0'}
+
+
+def percentile(ordered, fraction):
+    """Return value below which fraction of sorted values lies.
+
+    Value is interpolated linearly between two closest measurements, the
+    same as `statistics.quantiles` with inclusive method, which is missing
+    in Python 3.7.
+    """
+    if not ordered:
+        return 0.0
+    position = (len(ordered) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (
+        position - lower)
+
+
+def summarize(latencies, failures, elapsed):
+    """Return statistics of measured operation, latencies in milliseconds."""
+    latencies = sorted(latency * 1000 for latency in latencies)
+    return {'count': len(latencies), 'failures': failures,
+            'throughput': len(latencies) / elapsed if elapsed else 0.0,
+            'mean': sum(latencies) / len(latencies) if latencies else 0.0,
+            'p50': percentile(latencies, 0.5),
+            'p95': percentile(latencies, 0.95),
+            'p99': percentile(latencies, 0.99)}
+
+
+def measure(operation, arguments, check=bool):
+    """Call operation once for each arguments tuple and summarize calls.
+
+    Parameters
+    ----------
+    operation : callable
+        measured function
+    arguments : iterable
+        tuples with arguments of consecutive calls
+    check : callable, optional
+        returns True when result of operation means success
+
+    Returns
+    -------
+    dict
+        statistics created by `summarize`
+    """
+    latencies, failures = [], 0
+    start = perf_counter()
+    for args in arguments:
+        begin = perf_counter()
+        try:
+            succeeded = check(operation(*args))
+        except Exception:
+            succeeded = False
+        latencies.append(perf_counter() - begin)
+        failures += not succeeded
+    return summarize(latencies, failures, perf_counter() - start)
+
+
+def database_methods(stand_in, count, repeat):
+    """Measure every `Database` method, return statistics by method name."""
+    database = Database()
+    database.url = 'http://{}:{}'.format(*stand_in.server_address)
+    records = generate(count)
+    stand_in.records.update((record['_id'], record) for record in records)
+    results = {}
+
+    results['add'] = measure(database.add, [
+        ({'ISBN': int(isbn(count + number)), 'Title': f'Added {number}'},)
+        for number in range(repeat)])
+    batches = [([{'ISBN': int(isbn(number)), 'Title': 'Batch'}] * 100,)
+               for number in range(max(repeat // 10, 1))]
+    results['add_many'] = measure(database.add_many, batches, all)
+    results['search'] = measure(database.search, [
+        ({'ISBN': records[number % count]['ISBN']},)
+        for number in range(repeat)], lambda found: isinstance(found, list))
+    results['iter_search'] = measure(
+        lambda: sum(1 for _ in database.iter_search({}, 100)),
+        [()] * max(repeat // 50, 1), lambda found: found >= count)
+    results['update'] = measure(database.update, [
+        (records[number % count]['_id'], {'Quantity': number})
+        for number in range(repeat)])
+    results['delete'] = measure(database.delete, [
+        (records[number]['_id'],) for number in range(min(repeat, count))])
+    with NamedTemporaryFile(suffix='.png') as image:
+        image.write(bytes(range(256)) * 200)
+        image.flush()
+        results['upload_image'] = measure(database.upload_image,
+                                          [(image.name,)] * repeat)
+    media = list(stand_in.media) or ['missing']
+    results['download_image'] = measure(database.download_image, [
+        (media[number % len(media)],) for number in range(repeat)])
+    return results
+
+
+def gui_flows(stand_in, repeat):
+    """Measure adding, searching and deleting record through hidden window.
+
+    Returns
+    -------
+    dict
+        statistics by flow name
+    None
+        when window cannot be created
+    """
+    import tkinter as tk
+    from bookmeister import gui
+
+    try:
+        window = gui.Gui('Bookstore Manager', '600x470')
+    except tk.TclError:
+        return None
+    window.withdraw()
+    buttons = next(child for child in window.winfo_children()
+                   if isinstance(child, gui.Buttons))
+    variables = window.form.variables
+    saved = mock.Mock()
+
+    def run(action):
+        action()
+        while window.worker.task is not None:
+            window.update()
+            sleep(0.001)
+
+    def add(number):
+        window.form.clear()
+        for key, value in book(number).items():
+            variables[key].set(value)
+        saved.reset_mock()
+        run(buttons.add)
+        return saved.called
+
+    def search(number):
+        window.form.clear()
+        variables['ISBN'].set(isbn(number))
+        run(buttons.search)
+        return bool(window.search.box.values)
+
+    def delete(number):
+        search(number)
+        run(buttons.delete)
+        return not window.search.box.values
+
+    numbers = range(10 ** 6, 10 ** 6 + repeat)
+    with mock.patch.object(Database, 'URL', 'http://{}:{}'.format(
+            *stand_in.server_address)), \
+            mock.patch('tkinter.messagebox.showinfo', saved), \
+            mock.patch('tkinter.messagebox.showerror'), \
+            mock.patch('tkinter.messagebox.showwarning'):
+        results = {'add': measure(add, [(number,) for number in numbers]),
+                   'search': measure(search,
+                                     [(number,) for number in numbers]),
+                   'delete': measure(delete,
+                                     [(number,) for number in numbers])}
+    window.worker.executor.shutdown()
+    window.destroy()
+    return results
+
+
+def compare(previous, current, threshold=0.1):
+    """Print changes between two results and return number of regressions.
+
+    Operation regressed when its 95th percentile latency grew or throughput
+    dropped by more than `threshold`.
+    """
+    regressions = 0
+    for section in ('database', 'gui'):
+        old, new = previous.get(section) or {}, current.get(section) or {}
+        for name in sorted(old.keys() & new.keys()):
+            p95 = new[name]['p95'] / max(old[name]['p95'], 1e-9)
+            throughput = (new[name]['throughput']
+                          / max(old[name]['throughput'], 1e-9))
+            regressed = p95 > 1 + threshold or throughput < 1 - threshold
+            regressions += regressed
+            flag = '  REGRESSION' if regressed else ''
+            print(f'{section}.{name:<14} p95 {old[name]["p95"]:9.2f} -> '
+                  f'{new[name]["p95"]:9.2f} ms ({p95 - 1:+.0%}), throughput '
+                  f'{throughput - 1:+.0%}{flag}')
+    return regressions
+
+
+def report(results):
+    """Print measured statistics as table."""
+    for section in ('database', 'gui'):
+        if results[section] is None:
+            print(f'{section}: skipped, no display')
+            continue
+        for name, stats in results[section].items():
+            print(f'{section}.{name:<14} {stats["throughput"]:9.1f} ops/s  '
+                  f'p50 {stats["p50"]:8.2f}  p95 {stats["p95"]:8.2f}  '
+                  f'p99 {stats["p99"]:8.2f} ms  failures '
+                  f'{stats["failures"]}/{stats["count"]}')
+
+
+def main(arguments=None):
+    """Run benchmarks or compare saved results.
+
+    Returns
+    -------
+    int
+        exit code, 1 when comparison found regressions else 0
+    """
+    parser = ArgumentParser(description='Measure bookmeister performance '
+                                        'against local stand-in server.')
+    parser.add_argument('--count', type=int, default=2000,
+                        help='number of records stored before measurements')
+    parser.add_argument('--repeat', type=int, default=200,
+                        help='number of calls of each operation')
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help='delay of each response in milliseconds')
+    parser.add_argument('--failure-rate', type=float, default=0.0,
+                        help='part of requests which fail, from 0 to 1')
+    parser.add_argument('--seed', type=int, default=2020,
+                        help='seed of generator choosing failed requests')
+    parser.add_argument('--no-gui', action='store_true',
+                        help='do not measure GUI flows')
+    parser.add_argument('--output', help='file where JSON results are saved')
+    parser.add_argument('--compare', nargs=2, metavar=('OLD', 'NEW'),
+                        help='compare two result files instead of running')
+    options = parser.parse_args(arguments)
+
+    if options.compare:
+        with open(options.compare[0]) as old, open(options.compare[1]) as new:
+            return 1 if compare(load(old), load(new)) else 0
+
+    stand_in = server.start(latency=options.latency / 1000,
+                            failure_rate=options.failure_rate,
+                            seed=options.seed)
+    results = {
+        'version': __version__,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'time': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'settings': {key: value for key, value in vars(options).items()
+                     if key not in ('output', 'compare')},
+        'database': database_methods(stand_in, options.count,
+                                     options.repeat),
+        'gui': None if options.no_gui else gui_flows(stand_in,
+                                                     options.repeat),
+    }
+    stand_in.shutdown()
+    report(results)
+    if options.output:
+        with open(options.output, 'w') as output:
+            dump(results, output, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
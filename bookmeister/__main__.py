@@ -2,6 +2,20 @@
 
 Contain `main` function which create application GUI and set its size. Module
 `sys` is needed to specify which platform is used and adjust application width.
+Search results are cached for short time, so repeated searches and checks of
+existing ISBN numbers do not need database requests. ISBN numbers of all
+records are loaded in background `threading.Thread` to skip checks of new
+numbers. Circuit breaker makes operations fail at once when database is
+down, so clerk does not wait for timeout after each click. Viewed covers
+are kept in user cache directory. When `BOOKMEISTER_METRICS` environment
+variable holds file path, durations of database operations are measured and
+saved there on exit with `atexit`, as JSON when path ends with '.json' else
+in Prometheus text format.
+
+Window is displayed first, cover cache and loading of ISBN numbers are set
+up in `finish_setup` when it is already drawn. When `BOOKMEISTER_STARTUP`
+environment variable is set application closes right after that, so
+`benchmarks.startup` can measure how long it takes to show window.
 
 
 #### License
@@ -14,15 +28,47 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
 
+from atexit import register
+from os import environ
 from sys import platform
+from threading import Thread
 
+from bookmeister.breaker import CircuitBreaker
+from bookmeister.cache import SearchCache
+from bookmeister.connection import Database
+from bookmeister.covers import CoverCache
 from bookmeister.gui import Gui
+from bookmeister.known import KnownIsbns
+from bookmeister.metrics import Metrics
 
 
 def main():
     """Set GUI width according to used platform and run it."""
+    Database.cache = SearchCache(ttl=30)
+    Database.isbns = KnownIsbns()
+    Database.breaker = CircuitBreaker()
+    if environ.get('BOOKMEISTER_METRICS'):
+        Database.metrics = Metrics()
+        register(Database.metrics.export, environ['BOOKMEISTER_METRICS'])
     width = '450' if platform == 'win32' else '600'
-    Gui('Bookstore Manager', f'{width}x470').mainloop()
+    gui = Gui('Bookstore Manager', f'{width}x470')
+    gui.after_idle(finish_setup, gui)
+    gui.mainloop()
+
+
+def finish_setup(gui):
+    """Prepare parts which are not needed to display window.
+
+    Called by event loop when window is drawn. Close application at once
+    when `BOOKMEISTER_STARTUP` environment variable is set.
+    """
+    try:
+        Database.covers = CoverCache()
+    except OSError:
+        pass
+    Thread(target=Database.isbns.load, args=(Database(),), daemon=True).start()
+    if environ.get('BOOKMEISTER_STARTUP'):
+        gui.destroy()
 
 
 if __name__ == '__main__':
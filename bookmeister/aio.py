@@ -0,0 +1,140 @@
+"""#### Aio
+
+Module with `AsyncDatabase` class which allows to use database from `asyncio`
+event loop. It has the same methods as `bookmeister.connection.Database` and
+returns the same values: True or expected data on success, False or None in
+case of error. Timeout of operation is treated like connection error.
+
+Blocking requests are sent from `concurrent.futures` thread pool through
+shared connection pool, so many coroutines can wait for results at once while
+number of operations performed at the same time is limited by semaphore.
+Cancelled coroutine stops waiting immediately, request already sent is
+finished in background and its result is dropped.
+
+
+#### License
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from bookmeister.connection import Database
+
+
+class AsyncDatabase:
+    """
+    A class containing coroutines needed for communication with database.
+
+    Can be used as asynchronous context manager which shuts down its threads
+    on exit.
+
+    ...
+
+    Attributes
+    ----------
+    database : Database
+        object performing requests
+    concurrency : int
+        maximum number of requests sent at the same time
+    timeout : float or None
+        default time in seconds after which operation is abandoned, None
+        means no limit
+    """
+
+    def __init__(self, concurrency=10, timeout=None):
+        """Prepare thread pool used to send requests.
+
+        Parameters
+        ----------
+        concurrency : int, optional
+            maximum number of requests sent at the same time, default 10
+        timeout : float or None, optional
+            default operation timeout in seconds, default None: no limit
+        """
+        self.database = Database()
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=concurrency)
+        self._semaphore = None
+
+    async def __aenter__(self):
+        """Return itself."""
+        return self
+
+    async def __aexit__(self, *_):
+        """Release threads."""
+        self.close()
+
+    def close(self):
+        """Shut down thread pool without waiting for unfinished requests."""
+        self._executor.shutdown(wait=False)
+
+    async def call(self, failure, method, *args, timeout=None):
+        """Run `Database` method in thread pool.
+
+        Semaphore is created on first call so it belongs to running loop.
+
+        Parameters
+        ----------
+        failure : bool or None
+            value returned when operation does not finish in time
+        method : str
+            name of `Database` method
+        *args
+            passed to `Database` method
+        timeout : float or None, optional
+            operation timeout, default None: use `self.timeout`
+
+        Returns
+        -------
+        object
+            value returned by `Database` method or `failure`
+
+        Raises
+        ------
+        asyncio.CancelledError
+            when waiting coroutine is cancelled
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        timeout = self.timeout if timeout is None else timeout
+        async with self._semaphore:
+            future = asyncio.get_running_loop().run_in_executor(
+                self._executor, getattr(self.database, method), *args)
+            try:
+                return await asyncio.wait_for(future, timeout)
+            except asyncio.TimeoutError:
+                return failure
+
+    async def add(self, values, timeout=None):
+        """Send values to database, see `Database.add`."""
+        return await self.call(False, 'add', values, timeout=timeout)
+
+    async def search(self, parameters, fields=None, timeout=None):
+        """Search for matching records, see `Database.search`."""
+        args = (parameters,) if fields is None else (parameters, fields)
+        return await self.call(None, 'search', *args, timeout=timeout)
+
+    async def fetch(self, record_id, timeout=None):
+        """Download whole record, see `Database.fetch`."""
+        return await self.call(None, 'fetch', record_id, timeout=timeout)
+
+    async def delete(self, record_id, timeout=None):
+        """Remove record from database, see `Database.delete`."""
+        return await self.call(False, 'delete', record_id, timeout=timeout)
+
+    async def update(self, record_id, values, timeout=None):
+        """Update record in database, see `Database.update`."""
+        return await self.call(False, 'update', record_id, values,
+                               timeout=timeout)
+
+    async def upload_image(self, path, timeout=None):
+        """Upload image to media archive, see `Database.upload_image`."""
+        return await self.call(None, 'upload_image', path, timeout=timeout)
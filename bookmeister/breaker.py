@@ -0,0 +1,114 @@
+"""#### Breaker
+
+Module with `CircuitBreaker` class which stops sending requests to database
+which is known to be down. After several failed requests in a row circuit is
+opened and every request fails immediately instead of waiting for timeout.
+After set time one trial request is let through, its success closes circuit
+and its failure opens it again. Assigned to
+`bookmeister.connection.Database.breaker` it is shared by all instances.
+Modules used: `threading` and `time`.
+
+
+#### License
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+from threading import Lock
+from time import monotonic
+
+CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half-open'
+"""States of circuit."""
+
+
+class CircuitBreaker:
+    """
+    Decide if request can be sent based on results of previous ones.
+
+    All methods are thread safe.
+
+    ...
+
+    Attributes
+    ----------
+    threshold : int
+        number of failures in a row after which circuit is opened
+    reset_after : float
+        number of seconds after which trial request is allowed
+    failures : int
+        number of failures in a row
+    opened : float or None
+        `time.monotonic` value when circuit was opened, None when it is
+        closed
+    rejected : int
+        number of requests which were not allowed
+    """
+
+    def __init__(self, threshold=5, reset_after=30.0):
+        """Create closed circuit.
+
+        Parameters
+        ----------
+        threshold : int, optional
+            number of failures in a row which open circuit, default 5
+        reset_after : float, optional
+            seconds after which trial request is allowed, default 30
+        """
+        self.threshold = threshold
+        self.reset_after = reset_after
+        self.failures = 0
+        self.opened = None
+        self.rejected = 0
+        self._trial = False
+        self._lock = Lock()
+
+    @property
+    def state(self):
+        """Return current state: 'closed', 'open' or 'half-open'."""
+        with self._lock:
+            if self.opened is None:
+                return CLOSED
+            if self._trial or monotonic() - self.opened >= self.reset_after:
+                return HALF_OPEN
+            return OPEN
+
+    def allow(self):
+        """Check if request can be sent.
+
+        When circuit is open and `reset_after` passed only one trial request
+        is allowed until its result is recorded.
+
+        Returns
+        -------
+        bool
+            True when request can be sent else False
+        """
+        with self._lock:
+            if self.opened is None:
+                return True
+            if (not self._trial
+                    and monotonic() - self.opened >= self.reset_after):
+                self._trial = True
+                return True
+            self.rejected += 1
+            return False
+
+    def success(self):
+        """Record successful request, close circuit."""
+        with self._lock:
+            self.failures = 0
+            self.opened = None
+            self._trial = False
+
+    def failure(self):
+        """Record failed request, open circuit when threshold is reached."""
+        with self._lock:
+            self.failures += 1
+            if self._trial or self.failures >= self.threshold:
+                self.opened = monotonic()
+                self._trial = False
@@ -0,0 +1,241 @@
+"""#### Cache
+
+Module with `SearchCache` class which keeps recent database search results in
+memory. Entries are identified by search parameters, expire after set time
+and the least recently used ones are removed when size limits are reached.
+Results are stored as received JSON text, so every hit returns new objects
+which can be modified safely. Entries which may be affected by added, updated
+or removed records are invalidated. Modules used: `collections`, `json`,
+`threading` and `time`.
+
+
+#### License
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+from collections import namedtuple, OrderedDict
+from json import dumps
+from threading import Lock
+from time import monotonic
+
+Entry = namedtuple('Entry', 'expires parameters text ids')
+"""Cached search result with its expiration time and ids of records."""
+
+
+def might_match(parameters, values):
+    """Check if record with `values` may be found with `parameters`.
+
+    Parameters which are not plain values, e.g. query operators, are assumed
+    to match.
+
+    Parameters
+    ----------
+    parameters : dict
+        search parameters
+    values : dict
+        names of record fields and their values
+
+    Returns
+    -------
+    bool
+        False when record surely does not match parameters else True
+    """
+    for key, value in parameters.items():
+        if isinstance(value, (dict, list)):
+            continue
+        if key not in values or values[key] != value:
+            return False
+    return True
+
+
+class SearchCache:
+    """
+    Store search results with time to live and least recently used eviction.
+
+    All methods are thread safe.
+
+    ...
+
+    Attributes
+    ----------
+    ttl : float
+        number of seconds after which entry expires
+    max_entries : int
+        maximum number of stored search results
+    max_bytes : int
+        maximum summary length of stored results
+    hits : int
+        number of searches answered from cache
+    misses : int
+        number of searches which needed database request
+    evictions : int
+        number of entries removed because of size limits
+    size : int
+        summary length of stored results
+    generation : int
+        number of performed invalidations, used to drop results of searches
+        which were sent before records were changed
+    """
+
+    def __init__(self, ttl=60, max_entries=256, max_bytes=4 * 1024 * 1024):
+        """Create empty cache.
+
+        Parameters
+        ----------
+        ttl : float, optional
+            number of seconds after which entry expires, default 60
+        max_entries : int, optional
+            maximum number of stored search results, default 256
+        max_bytes : int, optional
+            maximum summary length of stored results, default 4 MiB
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = self.misses = self.evictions = self.size = 0
+        self.generation = 0
+        self._entries = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self):
+        """Return number of stored entries."""
+        return len(self._entries)
+
+    @staticmethod
+    def key(parameters, fields=None):
+        """Return text identifying parameters regardless of keys order."""
+        if fields is None:
+            return dumps(parameters, sort_keys=True)
+        return dumps([parameters, sorted(fields)], sort_keys=True)
+
+    def get(self, parameters, fields=None):
+        """Return cached JSON text of search result or None.
+
+        Parameters
+        ----------
+        parameters : dict
+            search parameters
+        fields : iterable, optional
+            names of fields included in result, default None: all fields
+
+        Returns
+        -------
+        str
+            result received from database
+        None
+            when there is no valid entry for parameters
+        """
+        key = self.key(parameters, fields)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires < monotonic():
+                self._remove(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.text
+
+    def put(self, parameters, text, records, generation=None, fields=None):
+        """Store search result.
+
+        Parameters
+        ----------
+        parameters : dict
+            search parameters
+        text : str
+            result received from database
+        records : list
+            decoded result, used to remember ids of found records
+        generation : int, optional
+            value of `generation` read before search was sent, result is not
+            stored when records were changed in meantime
+        fields : iterable, optional
+            names of fields included in result, default None: all fields
+        """
+        if len(text) > self.max_bytes:
+            return
+        key = self.key(parameters, fields)
+        ids = frozenset(record.get('_id') for record in records
+                        if isinstance(record, dict))
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = Entry(monotonic() + self.ttl, parameters,
+                                       text, ids)
+            self.size += len(text)
+            while (len(self._entries) > self.max_entries
+                   or self.size > self.max_bytes):
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate_added(self, values):
+        """Remove entries whose results would contain new record.
+
+        Parameters
+        ----------
+        values : dict
+            names of fields and values of added record
+        """
+        with self._lock:
+            self.generation += 1
+            for key in [key for key, entry in self._entries.items()
+                        if might_match(entry.parameters, values)]:
+                self._remove(key)
+
+    def invalidate_changed(self, record_id, values=None):
+        """Remove entries affected by update or removal of record.
+
+        Entry is affected when it contains record or when its parameters use
+        changed fields, so updated record may be found with them now.
+
+        Parameters
+        ----------
+        record_id : str
+            key of modified or removed record
+        values : dict, optional
+            names of changed fields and their new values, default None:
+            record was removed
+        """
+        values = values or {}
+        with self._lock:
+            self.generation += 1
+            for key in [key for key, entry in self._entries.items()
+                        if record_id in entry.ids
+                        or self._uses_changed(entry.parameters, values)]:
+                self._remove(key)
+
+    def clear(self):
+        """Remove all entries."""
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+            self.size = 0
+
+    def stats(self):
+        """Return dictionary with cache counters and its current size."""
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses,
+                    'evictions': self.evictions,
+                    'entries': len(self._entries), 'bytes': self.size}
+
+    @staticmethod
+    def _uses_changed(parameters, values):
+        """Check if changed values match parameters which use their fields."""
+        used = {key: value for key, value in parameters.items()
+                if key in values}
+        return bool(used) and might_match(used, values)
+
+    def _remove(self, key):
+        """Remove entry, lock must be held by caller."""
+        self.size -= len(self._entries.pop(key).text)
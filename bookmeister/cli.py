@@ -0,0 +1,366 @@
+"""#### CLI
+
+Module with command line interface which lets scripts and scheduled jobs
+manage records without graphical interface. Subcommands add, search, update
+and delete records or upload cover with `bookmeister.connection.Database`.
+Values are validated with `bookmeister.record.Record` the same way as in
+application form. Each result is printed to standard output as one JSON
+object per line. When values are not passed as arguments, batch of JSON
+lines is read from standard input. Neither `tkinter` nor `PIL` is imported,
+the latter is loaded only to prepare uploaded cover, so command starts much
+faster than application. Modules used: `argparse`, `itertools`, `json` and
+`sys`.
+
+Examples:
+
+    $ bookmeister-cli search Author="Mr Test" --fields Title,ISBN
+    $ bookmeister-cli search --range Price=10..25 --sort Release:desc
+    $ bookmeister-cli add Title="Test me" Author="Mr Test" ...
+    $ bookmeister-cli update 5eb00ffce332cd260015d67c Price=12.50
+    $ bookmeister-cli delete < ids.txt
+    $ bookmeister-cli upload-cover 5eb00ffce332cd260015d67c cover.jpg
+
+
+#### License
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+from argparse import ArgumentParser
+from itertools import islice
+from json import dumps, loads
+import sys
+
+from requests.exceptions import RequestException
+
+from bookmeister.connection import Database
+from bookmeister.exporter import parse_filter
+from bookmeister.importer import check_repeated, parse_row, split_existing
+from bookmeister.query import Query
+
+
+def parse_pairs(texts):
+    """Return dictionary of 'Field=value' texts, values are kept as text.
+
+    Raises
+    ------
+    ValueError
+        when there is no '=' or field name is empty
+    """
+    values = {}
+    for text in texts:
+        key, separator, value = text.partition('=')
+        if not separator or not key.strip():
+            raise ValueError(f'Value must look like Field=value: {text}')
+        values[key.strip()] = value
+    return values
+
+
+def create_query(options):
+    """Return `Query` built from options of search subcommand.
+
+    Raises
+    ------
+    ValueError
+        when any condition, sort field or limit is not correct
+    """
+    query = Query(dict(map(parse_filter, options.values)))
+    for key, text in parse_pairs(options.prefix).items():
+        query.prefix(key, text)
+    for key, text in parse_pairs(options.range).items():
+        minimum, separator, maximum = text.partition('..')
+        if not separator:
+            raise ValueError(f'Range must look like Field=MIN..MAX: {text}')
+        query.between(key, minimum or None, maximum or None)
+    for text in options.sort:
+        field, _, direction = text.partition(':')
+        if direction not in ('', 'asc', 'desc'):
+            raise ValueError(f'Sort must look like FIELD or FIELD:desc: '
+                             f'{text}')
+        query.sort(field, direction == 'desc')
+    if options.limit is not None:
+        query.limit(options.limit)
+    return query
+
+
+def read_lines(source):
+    """Yield number and text of each not empty line of source."""
+    for number, line in enumerate(source, 1):
+        line = line.strip()
+        if line:
+            yield number, line
+
+
+def read_objects(source):
+    """Yield number and JSON object or `ValueError` for each line."""
+    for number, line in read_lines(source):
+        try:
+            row = loads(line)
+            if not isinstance(row, dict):
+                raise ValueError('Line must be JSON object.')
+        except ValueError as error:
+            row = error
+        yield number, row
+
+
+def report(output, **result):
+    """Print result as one line of JSON."""
+    print(dumps(result), file=output)
+
+
+def add(options, database, source, output):
+    """Add record from arguments or records from JSON lines of source.
+
+    Records whose ISBN numbers are already in database or repeated in
+    source are refused, like in `bookmeister.importer.import_file`.
+
+    Returns
+    -------
+    bool
+        True when every record was added else False
+    """
+    if options.values:
+        rows = [(None, parse_pairs(options.values))]
+    else:
+        rows = read_objects(source)
+    succeeded = True
+    batch = []
+    seen = {}
+
+    def send():
+        new, refused = split_existing(database, batch)
+        for number, message in refused:
+            report(output, line=number, added=False, error=message)
+        results = database.add_many([record for _, record in new],
+                                    options.batch_size) if new else []
+        for (number, record), added in zip(new, results):
+            report(output, line=number, ISBN=record['ISBN'], added=added)
+        batch.clear()
+        return all(results) and not refused
+
+    for number, row in rows:
+        try:
+            if isinstance(row, Exception):
+                raise row
+            record = parse_row(row)
+            check_repeated(seen, number, record)
+            batch.append((number, record))
+        except ValueError as error:
+            succeeded = False
+            report(output, line=number, added=False, error=str(error))
+        if len(batch) >= options.batch_size:
+            succeeded = send() and succeeded
+    if batch:
+        succeeded = send() and succeeded
+    return succeeded
+
+
+def search(options, database, source, output):
+    """Print records matching arguments one per line.
+
+    Conditions, sort order and limit are sent to database, so only printed
+    records are downloaded.
+
+    Returns
+    -------
+    bool
+        True when search was finished else False
+    """
+    query = create_query(options)
+    fields = None
+    if options.fields:
+        fields = [field.strip() for field in options.fields.split(',')
+                  if field.strip()]
+    try:
+        for page in database.iter_pages(query, options.batch_size, fields):
+            for record in page:
+                print(dumps(record), file=output)
+    except (RequestException, ValueError):
+        print('Could not download records from database.', file=sys.stderr)
+        return False
+    return True
+
+
+def update(options, database, source, output):
+    """Change record from arguments or records from JSON lines of source.
+
+    Lines need '_id' key with id of changed record.
+
+    Returns
+    -------
+    bool
+        True when every record was updated else False
+    """
+    if options.record_id:
+        rows = [(None, dict(parse_pairs(options.values),
+                            _id=options.record_id))]
+    else:
+        rows = read_objects(source)
+    succeeded = True
+    for number, row in rows:
+        record_id = None
+        try:
+            if isinstance(row, Exception):
+                raise row
+            record_id = row.pop('_id', None)
+            if not isinstance(record_id, str) or not row:
+                raise ValueError('Line needs "_id" and changed fields.')
+            updated = database.update(record_id, parse_row(row, False))
+            report(output, line=number, _id=record_id, updated=updated)
+        except ValueError as error:
+            updated = False
+            report(output, line=number, _id=record_id, updated=False,
+                   error=str(error))
+        succeeded = succeeded and updated
+    return succeeded
+
+
+def delete(options, database, source, output):
+    """Remove records with ids from arguments or lines of source.
+
+    Returns
+    -------
+    bool
+        True when every record was removed else False
+    """
+    record_ids = iter(options.record_ids
+                      or (line for _, line in read_lines(source)))
+    succeeded = True
+    batch = list(islice(record_ids, options.batch_size))
+    while batch:
+        for record_id, removed in zip(batch, database.delete_many(batch)):
+            report(output, _id=record_id, deleted=removed)
+            succeeded = succeeded and removed
+        batch = list(islice(record_ids, options.batch_size))
+    return succeeded
+
+
+def upload_cover(options, database, source, output):
+    """Upload image and assign it to record from arguments or JSON lines.
+
+    Lines need '_id' key with record id and 'path' key with image file.
+    Images are scaled down with `bookmeister.picture.prepare` first.
+
+    Returns
+    -------
+    bool
+        True when every cover was assigned else False
+    """
+    import PIL.Image
+    from bookmeister.picture import prepare
+
+    if options.record_id:
+        rows = [(None, {'_id': options.record_id, 'path': options.path})]
+    else:
+        rows = read_objects(source)
+    succeeded = True
+    for number, row in rows:
+        try:
+            if isinstance(row, Exception):
+                raise row
+            record_id, path = row.get('_id'), row.get('path')
+            if not isinstance(record_id, str) or not isinstance(path, str):
+                raise ValueError('Line needs "_id" and "path".')
+            image = prepare(path)
+        except (OSError, ValueError,
+                PIL.Image.DecompressionBombError) as error:
+            succeeded = False
+            report(output, line=number, updated=False, error=str(error))
+            continue
+        image_id = database.upload_image(image)
+        updated = image_id is not None and database.update(
+            record_id, {'Cover': image_id})
+        report(output, line=number, _id=record_id, Cover=image_id,
+               updated=updated)
+        succeeded = succeeded and updated
+    return succeeded
+
+
+def create_parser():
+    """Return parser of command line arguments with subcommands."""
+    parser = ArgumentParser(description='Manage books in database without '
+                                        'graphical interface. Results are '
+                                        'printed as JSON lines.')
+    parser.add_argument('--batch-size', type=int, default=100,
+                        help='number of records sent or downloaded in one '
+                             'request')
+    commands = parser.add_subparsers(dest='command', required=True)
+    command = commands.add_parser(
+        'add', help='add record, JSON lines are read from standard input '
+                    'when no values are passed')
+    command.add_argument('values', nargs='*', metavar='FIELD=VALUE')
+    command.set_defaults(run=add)
+    command = commands.add_parser('search', help='print matching records')
+    command.add_argument('values', nargs='*', metavar='FIELD=VALUE',
+                         help='value can be JSON, e.g. \'Price={"$lt": 10}\'')
+    command.add_argument('--fields', help='comma separated names of printed '
+                                          'fields')
+    command.add_argument('--prefix', action='append', default=[],
+                         metavar='FIELD=TEXT',
+                         help='text field starts with text, case is ignored')
+    command.add_argument('--range', action='append', default=[],
+                         metavar='FIELD=MIN..MAX',
+                         help='numeric field within range, one bound can be '
+                              'omitted, e.g. Price=..20')
+    command.add_argument('--sort', action='append', default=[],
+                         metavar='FIELD[:desc]',
+                         help='sort by field, descending with ":desc", can '
+                              'be repeated')
+    command.add_argument('--limit', type=int,
+                         help='maximum number of printed records')
+    command.set_defaults(run=search)
+    command = commands.add_parser(
+        'update', help='change record, JSON lines with "_id" are read from '
+                       'standard input when no id is passed')
+    command.add_argument('record_id', nargs='?')
+    command.add_argument('values', nargs='*', metavar='FIELD=VALUE')
+    command.set_defaults(run=update)
+    command = commands.add_parser(
+        'delete', help='remove records, ids are read from standard input '
+                       'when none is passed')
+    command.add_argument('record_ids', nargs='*', metavar='ID')
+    command.set_defaults(run=delete)
+    command = commands.add_parser(
+        'upload-cover', help='assign image to record, JSON lines with "_id" '
+                             'and "path" are read from standard input when '
+                             'no id is passed')
+    command.add_argument('record_id', nargs='?')
+    command.add_argument('path', nargs='?')
+    command.set_defaults(run=upload_cover)
+    return parser
+
+
+def main(arguments=None, source=None, output=None):
+    """Run subcommand passed in command line arguments.
+
+    Batches are read from `source` and results written to `output`,
+    standard input and output by default.
+
+    Returns
+    -------
+    int
+        exit code, 0 when every operation succeeded else 1
+    """
+    parser = create_parser()
+    options = parser.parse_args(arguments)
+    if options.command == 'update' and options.record_id and (
+            not options.values):
+        parser.error('update needs FIELD=VALUE after record id')
+    if options.command == 'upload-cover' and options.record_id and (
+            not options.path):
+        parser.error('upload-cover needs image path after record id')
+    try:
+        succeeded = options.run(options, Database(), source or sys.stdin,
+                                output or sys.stdout)
+    except ValueError as error:
+        parser.error(str(error))
+    return 0 if succeeded else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -6,6 +6,28 @@ perform those operations `requests` module is used. Every method confirms its
 result by returning True or expected data. In case of error False or None is
 returned. Values received or sent to database are converted with `json` module.
 
+Requests are sent through one pooled `requests.Session` shared by the whole
+process, so each `Database` instance reuses already opened keep-alive
+connections instead of doing new TCP and TLS handshake. Pool can be adjusted
+with `configure_session`. `threading` module guards its creation. Every
+request has timeout and deadline, idempotent ones are repeated after
+temporary failures with `random` delay. `bookmeister.breaker.CircuitBreaker`
+assigned to `Database.breaker` makes requests fail at once while database is
+down. Many records can be removed or updated at once, their requests are
+sent in parallel by `concurrent.futures.ThreadPoolExecutor`.
+
+Search results can be kept in `bookmeister.cache.SearchCache` assigned to
+`Database.cache`, it is shared by all instances and updated after each
+successful change of records. Local copy of collection kept by
+`bookmeister.replica.Replica` assigned to `Database.replica` answers searches
+without requests. ISBN numbers of added records are passed to
+`bookmeister.known.KnownIsbns` assigned to `Database.isbns`. Covers are
+downloaded once and kept by `bookmeister.covers.CoverCache` assigned to
+`Database.covers`. Durations, sizes and outcomes of operations are recorded
+in `bookmeister.metrics.Metrics` assigned to `Database.metrics`. Searches
+with ranges, prefixes, sort order and maximum number of results are built
+with `bookmeister.query.Query` and answered by database.
+
 
 #### License
 THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
@@ -17,9 +39,150 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
 
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from functools import partial, wraps
+from itertools import islice
+from io import BytesIO
 from json import dumps, loads
+from os import PathLike
+from random import uniform
+from threading import RLock
+from time import monotonic, perf_counter, sleep
 
 import requests
+from requests.adapters import HTTPAdapter
+
+from bookmeister.query import encode, Query
+
+POOL = {'pool_connections': 4, 'pool_maxsize': 10, 'pool_block': False}
+"""Default settings of connection pool used by `configure_session`."""
+
+IDEMPOTENT = frozenset(('GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'))
+"""HTTP methods of requests which can be safely repeated."""
+
+RETRY_STATUSES = frozenset((429, 502, 503, 504))
+"""Statuses of responses after which idempotent request is repeated."""
+
+_session = None
+_session_lock = RLock()
+
+
+def configure_session(pool_connections=POOL['pool_connections'],
+                      pool_maxsize=POOL['pool_maxsize'],
+                      pool_block=POOL['pool_block'], keep_alive=True):
+    """Create pooled session shared by every `Database` instance.
+
+    Previously used session is closed together with its connections.
+
+    Parameters
+    ----------
+    pool_connections : int, optional
+        number of hosts for which connection pools are cached
+    pool_maxsize : int, optional
+        maximum number of connections kept open to single host
+    pool_block : bool, optional
+        when True wait for free connection instead of opening extra one, so
+        `pool_maxsize` is hard limit of connections per host
+    keep_alive : bool, optional
+        when False every connection is closed after response is received
+
+    Returns
+    -------
+    requests.Session
+        session which will be used by `Database` methods
+    """
+    global _session
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_connections,
+                          pool_maxsize=pool_maxsize, pool_block=pool_block)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    if not keep_alive:
+        session.headers['Connection'] = 'close'
+    with _session_lock:
+        previous, _session = _session, session
+    if previous is not None:
+        previous.close()
+    return session
+
+
+def get_session():
+    """Return session shared by `Database` instances, create it if needed."""
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                return configure_session()
+    return _session
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """Raised when request is not sent because database is not available."""
+
+
+def limit_timeout(timeout, remaining):
+    """Return timeout shortened to `remaining` seconds.
+
+    Parameters
+    ----------
+    timeout : float or tuple or None
+        timeout accepted by `requests`, single value or pair of connect and
+        read timeouts
+    remaining : float
+        seconds left until deadline
+
+    Returns
+    -------
+    float or tuple
+        timeout of the same form not longer than `remaining`
+    """
+    if timeout is None:
+        return remaining
+    if isinstance(timeout, tuple):
+        return tuple(remaining if part is None else min(part, remaining)
+                     for part in timeout)
+    return min(timeout, remaining)
+
+
+def projection(fields):
+    """Return query part limiting fields of found records.
+
+    Parameters
+    ----------
+    fields : iterable or None
+        names of needed fields, '_id' is always included
+
+    Returns
+    -------
+    str
+        `h` parameter with `$fields` hint or empty string when fields are
+        None
+    """
+    if fields is None:
+        return ''
+    return '&h=' + encode({'$fields': {field: 1 for field in fields}})
+
+
+def measured(method):
+    """Record duration and outcome of `Database` method in its `metrics`.
+
+    Outcome is 'failure' when method returns False or None else 'success'.
+    """
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        metrics = self.metrics
+        if metrics is None:
+            return method(self, *args, **kwargs)
+        start = perf_counter()
+        result = method(self, *args, **kwargs)
+        outcome = 'failure' if result is None or result is False else (
+            'success')
+        metrics.observe('operation_seconds', perf_counter() - start,
+                        operation=method.__name__, outcome=outcome)
+        metrics.inc('operations_total', operation=method.__name__,
+                    outcome=outcome)
+        return result
+    return wrapper
 
 
 class Database:
@@ -30,17 +193,60 @@ class Database:
 
     Attributes
     ----------
+    URL : str
+        class attribute, address used by new instances
     url : str
         database address
     collection : str
         name of collection in database
     headers : dict
         dictionary containing information send with request to database
+    cache : SearchCache or None
+        class attribute, search results cache shared by all instances, None
+        when results are not cached
+    replica : Replica or None
+        class attribute, local copy of collection used to answer searches,
+        None when every search is sent to database
+    isbns : KnownIsbns or None
+        class attribute, numbers of records in database updated after
+        records are added, None when they are not collected
+    covers : CoverCache or None
+        class attribute, downloaded covers kept on disk, None when every
+        cover is downloaded
+    metrics : Metrics or None
+        class attribute, registry where duration and outcome of operations
+        and requests are recorded, None when nothing is measured
+    breaker : CircuitBreaker or None
+        class attribute, stops sending requests when database is down, None
+        when requests are always sent
+    timeout : float or tuple or None
+        class attribute, connect and read timeouts of single request in
+        seconds, None means no limit
+    deadline : float or None
+        class attribute, seconds in which request with all its retries has
+        to finish, None means no limit
+    retries : int
+        class attribute, number of times idempotent request is repeated
+    backoff : float
+        class attribute, maximum delay in seconds before first retry, it is
+        doubled for each next one
     """
 
+    URL = 'https://bookstore-5217.restdb.io'
+    cache = None
+    replica = None
+    isbns = None
+    covers = None
+    metrics = None
+    breaker = None
+    timeout = (3.05, 20.0)
+    deadline = 30.0
+    retries = 2
+    backoff = 0.25
+
     def __init__(self):
         """Initialize basic settings needed for communication with database."""
-        self.url = 'https://bookstore-5217.restdb.io'
+        self.url = self.URL
         self.collection = '/rest/books'
         self.headers = {
             'content-type': 'application/json',
@@ -48,6 +254,138 @@ class Database:
             'cache-control': 'no-cache',
         }
 
+    def request(self, method, path, operation='request', **kwargs):
+        """Send request to database through shared connection pool.
+
+        Request is abandoned after `timeout`. Idempotent requests which
+        failed because of connection problem, timeout or temporary server
+        error are repeated up to `retries` times after random delay growing
+        with each attempt. All attempts have to finish before `deadline`.
+
+        Parameters
+        ----------
+        method : str
+            HTTP method name, e.g. 'GET'
+        path : str
+            address part placed after `self.url`
+        operation : str, optional
+            name of operation used as metrics label, default 'request'
+        **kwargs
+            passed to `requests.Session.request`, `self.headers` and
+            `self.timeout` are used when they are not specified
+
+        Returns
+        -------
+        requests.Response
+            response received from database
+
+        Raises
+        ------
+        requests.exceptions.RequestException
+            when request failed or deadline passed
+        CircuitOpenError
+            when `breaker` does not allow to send request
+        """
+        kwargs.setdefault('headers', self.headers)
+        timeout = kwargs.pop('timeout', self.timeout)
+        retries = self.retries if method in IDEMPOTENT else 0
+        deadline = None if self.deadline is None else (
+            monotonic() + self.deadline)
+        for attempt in range(retries + 1):
+            kwargs['timeout'] = timeout
+            if deadline is not None:
+                remaining = deadline - monotonic()
+                if remaining <= 0:
+                    raise requests.exceptions.Timeout('Deadline exceeded.')
+                kwargs['timeout'] = limit_timeout(timeout, remaining)
+            last = attempt == retries
+            try:
+                response = self.send(method, path, operation, **kwargs)
+            except (requests.exceptions.ConnectionError,
+                    requests.exceptions.Timeout) as error:
+                if last or isinstance(error, CircuitOpenError):
+                    raise
+            else:
+                if last or response.status_code not in RETRY_STATUSES:
+                    return response
+            delay = uniform(0, self.backoff * 2 ** attempt)
+            if deadline is not None:
+                delay = min(delay, max(deadline - monotonic(), 0))
+            if self.metrics is not None:
+                self.metrics.inc('retries_total', operation=operation,
+                                 method=method)
+            sleep(delay)
+
+    def send(self, method, path, operation, **kwargs):
+        """Send single request, update `breaker` and `metrics`.
+
+        Connection errors, timeouts and server errors are counted as
+        failures by `breaker`. When `metrics` is set duration, status and
+        size of request are recorded.
+
+        Parameters
+        ----------
+        method : str
+            HTTP method name
+        path : str
+            address part placed after `self.url`
+        operation : str
+            name of operation used as metrics label
+        **kwargs
+            passed to `requests.Session.request`
+
+        Returns
+        -------
+        requests.Response
+            response received from database
+
+        Raises
+        ------
+        requests.exceptions.RequestException
+            when request failed
+        CircuitOpenError
+            when `breaker` does not allow to send request
+        """
+        breaker, metrics = self.breaker, self.metrics
+        labels = {'operation': operation, 'method': method}
+        if breaker is not None and not breaker.allow():
+            if metrics is not None:
+                metrics.inc('requests_total', status='CircuitOpenError',
+                            **labels)
+            raise CircuitOpenError('Database is not available.')
+        start = perf_counter()
+        try:
+            response = get_session().request(method, self.url + path,
+                                             **kwargs)
+        except requests.exceptions.RequestException as error:
+            if breaker is not None:
+                breaker.failure()
+            if metrics is not None:
+                metrics.observe('request_seconds', perf_counter() - start,
+                                **labels)
+                metrics.inc('requests_total', status=type(error).__name__,
+                            **labels)
+            raise
+        if breaker is not None:
+            if response.status_code >= 500:
+                breaker.failure()
+            else:
+                breaker.success()
+        if metrics is not None:
+            metrics.observe('request_seconds', perf_counter() - start,
+                            **labels)
+            metrics.observe('response_seconds',
+                            response.elapsed.total_seconds(), **labels)
+            metrics.inc('requests_total', status=str(response.status_code),
+                        **labels)
+            metrics.inc('sent_bytes_total', int(
+                response.request.headers.get('Content-Length') or 0),
+                **labels)
+            metrics.inc('received_bytes_total', len(response.content),
+                        **labels)
+        return response
+
+    @measured
     def add(self, values):
         """Send values to database.
 
@@ -62,24 +400,71 @@ class Database:
             True when record added to database else False
         """
         try:
-            response = requests.request(
-                'POST',
-                self.url + self.collection,
-                data=dumps(values),
-                headers=self.headers
-            )
-            return '_id' in response.text
-        except requests.exceptions.ConnectionError:
+            response = self.request('POST', self.collection, 'add',
+                                    data=dumps(values))
+            added = '_id' in response.text
+        except requests.exceptions.RequestException:
             return False
+        if added:
+            self.store_changed(response.text)
+            self.remember_added([values])
+        return added
+
+    @measured
+    def add_many(self, records, batch_size=100):
+        """Send many records to database, `batch_size` of them per request.
+
+        Records are taken from iterable lazily, so only one batch is kept in
+        memory at once.
+
+        Parameters
+        ----------
+        records : iterable
+            dictionaries with names of fields and their values to store
+        batch_size : int, optional
+            number of records sent in one request, default 100
+
+        Returns
+        -------
+        list
+            bool for each record, True when it was added to database else
+            False
+        """
+        results = []
+        records = iter(records)
+        batch = list(islice(records, batch_size))
+        while batch:
+            try:
+                response = self.request('POST', self.collection, 'add_many',
+                                        data=dumps(batch))
+                stored = loads(response.text)
+                added = isinstance(stored, list) and len(batch) == sum(
+                    '_id' in record for record in stored)
+            except (TypeError, ValueError,
+                    requests.exceptions.RequestException):
+                added = False
+            results.extend([added] * len(batch))
+            if added:
+                self.store_changed(response.text)
+                self.remember_added(batch)
+            batch = list(islice(records, batch_size))
+        return results
 
-    def search(self, parameters):
+    @measured
+    def search(self, parameters, fields=None):
         """Search for records matching `parameters` in database.
 
+        Query with sort order or maximum is always sent to database, it is
+        not answered by `replica` nor `cache`.
+
         Parameters
         ----------
-        parameters : dict
+        parameters : dict or Query
             dictionary with names of fields and values which will be searched
-            in database
+            in database or `bookmeister.query.Query`
+        fields : iterable, optional
+            names of fields included in found records besides '_id', default
+            None: all fields. Records found in `replica` are always whole
 
         Returns
         -------
@@ -88,40 +473,253 @@ class Database:
         None
             when connection error occurs
         """
-        query = f'?q={dumps(parameters)}'
+        if isinstance(parameters, Query) and parameters.plain:
+            parameters = parameters.parameters
+        if isinstance(parameters, Query):
+            query = parameters.url(fields)
+        else:
+            if self.replica is not None:
+                records = self.replica.search(parameters)
+                if records is not None:
+                    return records
+            if self.cache is not None:
+                text = self.cache.get(parameters, fields)
+                if text is not None:
+                    return loads(text)
+                generation = self.cache.generation
+            query = f'?q={encode(parameters)}' + projection(fields)
+        try:
+            response = self.request('GET', self.collection + query,
+                                    'search')
+            records = loads(response.text)
+        except (ValueError, requests.exceptions.RequestException):
+            return None
+        if (self.cache is not None and not isinstance(parameters, Query)
+                and isinstance(records, list)):
+            self.cache.put(parameters, response.text, records, generation,
+                           fields)
+        return records
+
+    def iter_pages(self, parameters, page_size=100, fields=None):
+        """Search for records matching `parameters` page by page.
+
+        Next page is requested only when previous one was consumed. Records
+        are sorted by id, so pages do not overlap. Records of `Query` are
+        sorted by its order first and no more than its maximum is
+        downloaded.
+
+        Parameters
+        ----------
+        parameters : dict or Query
+            dictionary with names of fields and values which will be searched
+            in database or `bookmeister.query.Query`
+        page_size : int, optional
+            maximum number of records in one page, default 100
+        fields : iterable, optional
+            names of fields included in records besides '_id', default None:
+            all fields
+
+        Yields
+        ------
+        list
+            records matching criteria from one page
+
+        Raises
+        ------
+        requests.exceptions.RequestException
+            when connection error occurs during iteration or database
+            responds with error status
+        ValueError
+            when page is not JSON list of records
+        """
+        skip = 0
+        while True:
+            size = page_size
+            if isinstance(parameters, Query):
+                if parameters.maximum is not None:
+                    size = min(page_size, parameters.maximum - skip)
+                    if size < 1:
+                        return
+                query = parameters.url(fields, skip, size)
+            else:
+                query = (f'?q={encode(parameters)}&sort=_id'
+                         f'&skip={skip}&max={page_size}{projection(fields)}')
+            response = self.request('GET', self.collection + query,
+                                    'iter_pages')
+            response.raise_for_status()
+            page = loads(response.text)
+            if not isinstance(page, list):
+                raise ValueError('Page of records is not a list.')
+            if page:
+                yield page
+            if len(page) < size:
+                return
+            skip += size
+
+    def iter_search(self, parameters, page_size=100):
+        """Yield records matching `parameters` one by one.
+
+        Records are downloaded lazily with `iter_pages`, so only one page is
+        kept in memory at once.
+
+        Parameters
+        ----------
+        parameters : dict or Query
+            dictionary with names of fields and values which will be searched
+            in database or `bookmeister.query.Query`
+        page_size : int, optional
+            number of records downloaded in one request, default 100
+
+        Yields
+        ------
+        dict
+            record matching criteria
+
+        Raises
+        ------
+        requests.exceptions.RequestException
+            when connection error occurs during iteration or database
+            responds with error status
+        ValueError
+            when page is not JSON list of records
+        """
+        for page in self.iter_pages(parameters, page_size):
+            yield from page
+
+    @measured
+    def fetch(self, record_id):
+        """Download whole record from database.
+
+        Parameters
+        ----------
+        record_id : str
+            key of record to download
+
+        Returns
+        -------
+        dict
+            record values
+        None
+            when connection error occurs or there is no such record
+        """
         try:
-            response = requests.request(
-                'GET',
-                self.url + self.collection + query,
-                headers=self.headers
-            )
-            return loads(response.text)
-        except requests.exceptions.ConnectionError:
+            response = self.request('GET', self.collection + '/' + record_id,
+                                    'fetch')
+            record = loads(response.text)
+        except (ValueError, requests.exceptions.RequestException):
             return None
+        if isinstance(record, dict) and record.get('_id') == record_id:
+            return record
+        return None
 
-    def delete(self, record_id):
+    @measured
+    def delete(self, record_id, isbn=None):
         """Remove record from database.
 
+        ISBN number of removed record is forgotten by `isbns`. When it is not
+        passed it is downloaded first, but only when `isbns` is set.
+
         Parameters
         ----------
         record_id : str
             key of record to remove
+        isbn : int or str, optional
+            ISBN number of removed record, default None: unknown
 
         Returns
         -------
         bool
             True when record removed from database else False
         """
+        if self.isbns is not None and not isbn:
+            isbn = self.find_isbn(record_id)
         try:
-            response = requests.request(
-                'DELETE',
-                self.url + self.collection + '/' + record_id,
-                headers=self.headers
-            )
-            return record_id in response.text
-        except requests.exceptions.ConnectionError:
+            response = self.request('DELETE',
+                                    self.collection + '/' + record_id,
+                                    'delete')
+            removed = record_id in response.text
+        except requests.exceptions.RequestException:
             return False
+        if removed:
+            if self.replica is not None:
+                self.replica.remove(record_id)
+            if self.cache is not None:
+                self.cache.invalidate_changed(record_id)
+            if self.isbns is not None and isbn:
+                self.isbns.discard(isbn)
+        return removed
+
+    def find_isbn(self, record_id):
+        """Return ISBN number of record or None when it cannot be found."""
+        query = f'?q={encode({"_id": record_id})}' + projection(('ISBN',))
+        try:
+            response = self.request('GET', self.collection + query,
+                                    'find_isbn')
+            return loads(response.text)[0].get('ISBN')
+        except (AttributeError, IndexError, KeyError, TypeError, ValueError,
+                requests.exceptions.RequestException):
+            return None
+
+    @measured
+    def delete_many(self, record_ids, workers=4, isbns=None):
+        """Remove many records, `workers` requests are sent at once.
+
+        Parameters
+        ----------
+        record_ids : iterable
+            keys of records to remove
+        workers : int, optional
+            maximum number of requests sent in parallel, default 4
+        isbns : iterable, optional
+            ISBN numbers of removed records in the same order, default None:
+            unknown
+
+        Returns
+        -------
+        list
+            bool for each record, True when it was removed else False
+        """
+        record_ids = list(record_ids)
+        if isbns is None:
+            isbns = [None] * len(record_ids)
+        return self.in_parallel(self.delete, workers, record_ids, isbns)
+
+    @measured
+    def update_many(self, record_ids, values, workers=4):
+        """Change the same fields of many records.
+
+        Records are updated one by one, `workers` requests are sent at once.
 
+        Parameters
+        ----------
+        record_ids : iterable
+            keys of records to update
+        values : dict
+            dictionary with names of fields and values to change in database
+        workers : int, optional
+            maximum number of requests sent in parallel, default 4
+
+        Returns
+        -------
+        list
+            bool for each record, True when it was modified else False
+        """
+        return self.in_parallel(partial(self.update, values=values), workers,
+                                record_ids)
+
+    @staticmethod
+    def in_parallel(operation, workers, record_ids, *arguments):
+        """Call operation for each record id in thread pool, keep order.
+
+        Items of additional iterables are passed with matching record ids.
+        """
+        record_ids = list(record_ids)
+        if not record_ids:
+            return []
+        with ThreadPoolExecutor(min(workers, len(record_ids))) as executor:
+            return list(executor.map(operation, record_ids, *arguments))
+
+    @measured
     def update(self, record_id, values):
         """Update record in database.
 
@@ -138,23 +736,63 @@ class Database:
             True when record modified in database else False
         """
         try:
-            response = requests.request(
-                'PATCH',
-                self.url + self.collection + '/' + record_id,
-                data=dumps(values),
-                headers=self.headers
-            )
-            return record_id in response.text
-        except requests.exceptions.ConnectionError:
+            response = self.request('PATCH',
+                                    self.collection + '/' + record_id,
+                                    'update', data=dumps(values))
+            updated = record_id in response.text
+        except requests.exceptions.RequestException:
             return False
+        if updated:
+            self.store_changed(response.text)
+            if self.cache is not None:
+                self.cache.invalidate_changed(record_id, values)
+            if self.isbns is not None and values.get('ISBN'):
+                self.isbns.add(values['ISBN'])
+        return updated
+
+    def remember_added(self, records):
+        """Update `cache` and `isbns` after records were added.
 
-    def upload_image(self, path):
+        Parameters
+        ----------
+        records : list
+            dictionaries with values of added records
+        """
+        for values in records:
+            if self.cache is not None:
+                self.cache.invalidate_added(values)
+            if self.isbns is not None and values.get('ISBN'):
+                self.isbns.add(values['ISBN'])
+
+    def store_changed(self, text):
+        """Save records returned by database after change in `replica`.
+
+        Parameters
+        ----------
+        text : str
+            database response with one record or list of them
+        """
+        if self.replica is None:
+            return
+        try:
+            records = loads(text)
+        except ValueError:
+            return
+        if isinstance(records, dict):
+            records = [records]
+        if isinstance(records, list):
+            self.replica.store(record for record in records
+                               if isinstance(record, dict) and '_id' in record)
+
+    @measured
+    def upload_image(self, image):
         """Upload image to database media archive.
 
         Parameters
         ----------
-        path : str
-            image path
+        image : str or file-like
+            image path or binary file, e.g. `io.BytesIO` returned by
+            `bookmeister.picture.prepare`
 
         Returns
         -------
@@ -166,12 +804,52 @@ class Database:
         headers = self.headers.copy()
         headers.pop('content-type', None)
         try:
-            response = requests.request(
-                'POST',
-                self.url + '/media',
-                files={'image': open(path, 'rb')},
-                headers=headers
-            )
-            return loads(response.text)["ids"][0]
-        except (TypeError, KeyError, requests.exceptions.ConnectionError):
+            if isinstance(image, (str, PathLike)):
+                opened = open(image, 'rb')
+            else:
+                opened = nullcontext(image)
+            with opened as file:
+                response = self.request('POST', '/media', 'upload_image',
+                                        files={'image': file},
+                                        headers=headers)
+            image_id = loads(response.text)["ids"][0]
+        except (TypeError, KeyError, ValueError,
+                requests.exceptions.RequestException):
+            return None
+        if self.covers is not None and isinstance(image, BytesIO):
+            self.covers.put(image_id, image.getvalue())
+        return image_id
+
+    @measured
+    def download_image(self, image_id):
+        """Download image from database media archive.
+
+        Image stored in `covers` is returned without request, downloaded
+        one is stored there.
+
+        Parameters
+        ----------
+        image_id : str
+            id of image in media archive
+
+        Returns
+        -------
+        bytes
+            encoded image
+        None
+            when connection error occurs or there is no such image
+        """
+        if self.covers is not None:
+            data = self.covers.get(image_id)
+            if data is not None:
+                return data
+        try:
+            response = self.request('GET', f'/media/{image_id}',
+                                    'download_image', headers=self.headers)
+        except requests.exceptions.RequestException:
+            return None
+        if response.status_code != 200 or not response.content:
             return None
+        if self.covers is not None:
+            self.covers.put(image_id, response.content)
+        return response.content
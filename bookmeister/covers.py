@@ -0,0 +1,164 @@
+"""#### Covers
+
+Module with `CoverCache` class which keeps downloaded book covers on disk.
+Every cover is saved in separate file named after its media id, ids never
+change content, so files do not expire. Size of directory is limited and the
+least recently viewed covers are removed first. Order of use is kept in
+modification time of files, so it survives restart of application. Assigned
+to `bookmeister.connection.Database.covers` it lets covers be viewed again
+without requests, also when there is no connection. Modules used: `os`,
+`pathlib`, `re` and `threading`.
+
+
+#### License
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import os
+from pathlib import Path
+import re
+from threading import Lock
+
+MEDIA_ID = re.compile(r'[\w-]+')
+"""Pattern of media ids which can be used as file names."""
+
+
+def default_directory():
+    """Return user cache directory of application covers."""
+    base = os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache'
+    return Path(base) / 'bookmeister' / 'covers'
+
+
+class CoverCache:
+    """
+    Store covers in directory with least recently used eviction.
+
+    All methods are thread safe.
+
+    ...
+
+    Attributes
+    ----------
+    directory : pathlib.Path
+        place where covers are saved
+    max_bytes : int
+        maximum summary size of stored covers
+    size : int
+        summary size of stored covers
+    hits : int
+        number of covers read from disk
+    misses : int
+        number of covers which were not stored
+    evictions : int
+        number of covers removed because of size limit
+    """
+
+    def __init__(self, directory=None, max_bytes=50 * 2 ** 20):
+        """Create directory when needed and find already stored covers.
+
+        Parameters
+        ----------
+        directory : str or pathlib.Path, optional
+            place where covers are saved, default `default_directory()`
+        max_bytes : int, optional
+            maximum summary size of stored covers, default 50 MiB
+        """
+        self.directory = Path(directory or default_directory())
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = self.misses = self.evictions = 0
+        self._lock = Lock()
+        files = []
+        for path in self.directory.iterdir():
+            if path.is_file() and MEDIA_ID.fullmatch(path.name):
+                status = path.stat()
+                files.append((status.st_mtime, path.name, status.st_size))
+        self._sizes = {name: size for _, name, size in sorted(files)}
+        self.size = sum(self._sizes.values())
+        self._evict()
+
+    def __contains__(self, media_id):
+        """Check if cover is stored."""
+        with self._lock:
+            return media_id in self._sizes
+
+    def __len__(self):
+        """Return number of stored covers."""
+        with self._lock:
+            return len(self._sizes)
+
+    def get(self, media_id):
+        """Return stored cover and mark it as recently used.
+
+        Parameters
+        ----------
+        media_id : str
+            id of image in database media archive
+
+        Returns
+        -------
+        bytes
+            encoded image
+        None
+            when cover is not stored
+        """
+        with self._lock:
+            if media_id not in self._sizes:
+                self.misses += 1
+                return None
+            path = self.directory / media_id
+            try:
+                data = path.read_bytes()
+                os.utime(path)
+            except OSError:
+                self.size -= self._sizes.pop(media_id)
+                self.misses += 1
+                return None
+            self._sizes[media_id] = self._sizes.pop(media_id)
+            self.hits += 1
+            return data
+
+    def put(self, media_id, data):
+        """Save cover, remove the least recently used ones above size limit.
+
+        Covers with ids which cannot be file names or larger than whole
+        cache are not saved.
+
+        Parameters
+        ----------
+        media_id : str
+            id of image in database media archive
+        data : bytes
+            encoded image
+        """
+        if (not isinstance(media_id, str) or not MEDIA_ID.fullmatch(media_id)
+                or len(data) > self.max_bytes):
+            return
+        path = self.directory / media_id
+        temporary = path.with_name(f'.{media_id}.tmp')
+        with self._lock:
+            try:
+                temporary.write_bytes(data)
+                os.replace(temporary, path)
+            except OSError:
+                return
+            self.size += len(data) - self._sizes.pop(media_id, 0)
+            self._sizes[media_id] = len(data)
+            self._evict()
+
+    def _evict(self):
+        """Remove the least recently used covers, lock must be held."""
+        while self.size > self.max_bytes:
+            media_id = next(iter(self._sizes))
+            self.size -= self._sizes.pop(media_id)
+            self.evictions += 1
+            try:
+                (self.directory / media_id).unlink()
+            except OSError:
+                pass
@@ -0,0 +1,194 @@
+"""#### Exporter
+
+Module with functions necessary to save records from database to CSV or
+JSONL file. Records are downloaded page by page with
+`Database.iter_pages` and every page is written before next one is
+requested, so memory usage does not depend on collection size. Only chosen
+fields are downloaded and records can be filtered the same way as in search.
+Files ending with '.gz' are compressed while written. Output is saved to
+temporary file and moved in place when export is finished, so broken
+connection does not leave partial file. Modules used: `argparse`, `csv`,
+`gzip`, `json`, `os`, `sys` and `time`.
+
+Use `$ bookmeister-export catalogue.csv.gz` or
+`$ python -m bookmeister.exporter catalogue.jsonl` to run it from terminal.
+
+
+#### License
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+from argparse import ArgumentParser
+import csv
+import gzip
+from json import dumps, loads
+import os
+import sys
+from time import perf_counter
+
+from requests.exceptions import RequestException
+
+from bookmeister.connection import Database
+from bookmeister.record import FIELDS
+
+COLUMNS = FIELDS + ('Hardcover',)
+"""Fields exported by default, the same which are read by importer."""
+
+
+def open_output(path, compressed=False):
+    """Return text file opened for writing, gzip compressed when needed."""
+    if compressed:
+        return gzip.open(path, 'wt', newline='', encoding='utf-8')
+    return open(path, 'w', newline='', encoding='utf-8')
+
+
+def is_jsonl(path):
+    """Check if records should be written as JSONL based on extension."""
+    if path.endswith('.gz'):
+        path = path[:-3]
+    return path.endswith(('.jsonl', '.json'))
+
+
+def parse_filter(text):
+    """Return field name and value from 'Field=value' text.
+
+    Value is decoded as JSON when possible, so numbers and operators like
+    `{"$lt": 10}` can be used, otherwise it is taken as text.
+
+    Raises
+    ------
+    ValueError
+        when there is no '=' or field name is empty
+    """
+    key, separator, value = text.partition('=')
+    if not separator or not key.strip():
+        raise ValueError(f'Filter must look like Field=value: {text}')
+    try:
+        value = loads(value)
+    except ValueError:
+        pass
+    return key.strip(), value
+
+
+def export_file(path, parameters=None, fields=COLUMNS, database=None,
+                page_size=100, progress=None):
+    """Write records matching `parameters` to CSV or JSONL file.
+
+    CSV file has header with `fields`, values missing in record are left
+    empty. JSONL file has one object with `fields` present in record per
+    line.
+
+    Parameters
+    ----------
+    path : str
+        path of written file, '.jsonl' or '.json' extension selects JSONL,
+        other CSV, additional '.gz' compresses it
+    parameters : dict, optional
+        names of fields and values which will be searched in database,
+        default None: all records
+    fields : iterable, optional
+        names of exported fields, default `COLUMNS`
+    database : Database, optional
+        object used to download records, default None: create new one
+    page_size : int, optional
+        number of records downloaded in one request, default 100
+    progress : callable, optional
+        called with number of written records after each page
+
+    Returns
+    -------
+    int
+        number of written records
+    None
+        when connection error occurs or response is not valid JSON, file is
+        not created then
+
+    Temporary file is removed whenever export is not finished, also when
+    other exception is raised.
+    """
+    database = database or Database()
+    fields = tuple(fields)
+    temporary = f'{path}.tmp'
+    written = 0
+    finished = False
+    try:
+        with open_output(temporary, path.endswith('.gz')) as output:
+            if is_jsonl(path):
+                def write(record):
+                    output.write(dumps({key: record[key] for key in fields
+                                        if key in record}) + '\n')
+            else:
+                writer = csv.DictWriter(output, fields, extrasaction='ignore')
+                writer.writeheader()
+                write = writer.writerow
+            for page in database.iter_pages(parameters or {}, page_size,
+                                            fields):
+                for record in page:
+                    write(record)
+                written += len(page)
+                if progress is not None:
+                    progress(written)
+        os.replace(temporary, path)
+        finished = True
+    except (RequestException, ValueError):
+        return None
+    finally:
+        if not finished and os.path.exists(temporary):
+            os.remove(temporary)
+    return written
+
+
+def main(arguments=None):
+    """Export records to file passed in command line arguments.
+
+    Returns
+    -------
+    int
+        exit code, 0 when export was finished else 1
+    """
+    parser = ArgumentParser(description='Save books from database to CSV or '
+                                        'JSONL file.')
+    parser.add_argument('path', help='written file, .csv or .jsonl, with '
+                                     'optional .gz')
+    parser.add_argument('--fields', help='comma separated names of exported '
+                                         'fields')
+    parser.add_argument('--where', action='append', default=[],
+                        metavar='FIELD=VALUE',
+                        help='export only records with field value, can be '
+                             'repeated')
+    parser.add_argument('--page-size', type=int, default=100,
+                        help='number of records downloaded in one request')
+    options = parser.parse_args(arguments)
+    try:
+        parameters = dict(map(parse_filter, options.where))
+    except ValueError as error:
+        parser.error(str(error))
+    fields = COLUMNS
+    if options.fields:
+        fields = [field.strip() for field in options.fields.split(',')
+                  if field.strip()]
+
+    def progress(written):
+        print(f'\r{written} records', end='', file=sys.stderr, flush=True)
+
+    start = perf_counter()
+    written = export_file(options.path, parameters, fields,
+                          page_size=options.page_size, progress=progress)
+    elapsed = perf_counter() - start
+    print(file=sys.stderr)
+    if written is None:
+        print('Could not download records from database.', file=sys.stderr)
+        return 1
+    print(f'Exported {written} records in {elapsed:.1f} s '
+          f'({written / max(elapsed, 0.001):.0f} rows/s).')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -3,10 +3,20 @@
 Module gathers all functions, classes and methods necessary to create GUI. Its
 parts are divided for separate blocks represented by classes `Search`, `Form`,
 `Buttons` and `Image` where each of them extends `tkinter.Frame`. `Searchbox`
-is extended `tkinter.Combobox` class to application needs. `Gui` connects each
-part and places them in main window which will be displayed. Modules used:
-`pathlib`, `sys`, `webbrowser`, `PIL` and `tkinter` with `filedialog`,
-`messagebox`, `ttk`.
+is extended `tkinter.Combobox` class to application needs, `ResultsTable` shows
+all found records in separate window and draws only visible rows, so it stays
+fast with thousands of them. `LiveSearch` searches while form is typed in.
+Searches download only fields shown in lists, whole record is downloaded when
+it is selected. `Worker` runs database operations in background thread, so
+window stays responsive while waiting for response. Covers are scaled down and
+compressed by `bookmeister.picture.prepare` before upload and displayed in
+application after download. `Gui` connects each part and places them in main
+window which will be displayed. Modules `PIL`, `webbrowser`,
+`tkinter.filedialog` and `bookmeister.picture` are imported when cover is
+handled for the first time, so they do not delay start of application.
+Modules used: `collections`, `concurrent.futures`, `functools`, `io`,
+`itertools`, `numbers`, `pathlib`, `queue`, `sys`, `threading`, `time`,
+`webbrowser`, `PIL` and `tkinter` with `filedialog`, `messagebox`, `ttk`.
 
 
 #### License
@@ -19,19 +29,24 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
 
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from io import BytesIO
+from itertools import islice
+from numbers import Number
 from pathlib import Path
+from queue import Queue
 import sys
+from threading import Event
+from time import monotonic
 import tkinter as tk
-from tkinter.filedialog import askopenfile
 import tkinter.messagebox as msg
 import tkinter.ttk as ttk
-import webbrowser
-
-import PIL
-import PIL.Image
 
 from bookmeister.connection import Database
-from bookmeister.record import FIELDS, Record
+from bookmeister.query import Query
+from bookmeister.record import BookRecord, FIELDS, Record, TEXT_FIELDS
 
 
 def show_no_connection():
@@ -40,6 +55,12 @@ def show_no_connection():
                            'with database problem. Try again later.')
 
 
+def show_busy():
+    """Display message about operation which is still performed."""
+    msg.showinfo('Busy', 'Other operation is still performed. Try again when '
+                         'it is finished.')
+
+
 def create_label(container, message, row, column):
     """Display text in set `tkinter` container.
 
@@ -72,6 +93,8 @@ class Gui(tk.Tk):
         used for communication with `Form` widget
     search : Search
         used for communication with `Search` widget
+    worker : Worker
+        used to run database operations without freezing window
     """
 
     def __init__(self, title, size):
@@ -89,6 +112,9 @@ class Gui(tk.Tk):
         self.geometry(size)
         self.resizable(False, False)
         self.iconphoto(False, tk.PhotoImage(file=self.get_icon()))
+        self.worker = Worker(self)
+        self.worker.grid(row=3, column=0, padx=12, sticky='W')
+        self.worker.grid_remove()
         self.form = Form(self)
         self.form.grid(row=1, column=0)
         self.search = Search(self)
@@ -134,6 +160,125 @@ class Gui(tk.Tk):
         return icon_path
 
 
+class Worker(tk.Frame):
+    """
+    Create busy indicator and run database operations. Extend `tk.Frame`.
+
+    Operation is sent to thread pool and its result is checked periodically
+    with `after`, then passed to callback in main loop. While operation is
+    performed registered widgets are disabled and progress bar with button
+    to stop waiting is shown. Form entries stay editable. Widget is hidden
+    when there is no operation in progress. Waiting can be stopped only for
+    operations which do not change database, because their thread keeps
+    running and its result is just ignored.
+
+    ...
+
+    Attributes
+    ----------
+    executor : ThreadPoolExecutor
+        threads performing operations
+    task : tuple or None
+        future of running operation and its callback
+    widgets : list
+        widgets disabled while operation is performed
+    stop : tk.Button
+        stops waiting for operation, disabled for operations which change
+        database
+    """
+
+    POLL = 50
+    """Time in milliseconds between checks if operation is finished."""
+
+    def __init__(self, menu):
+        """Create progress bar and stop button, hide them until needed.
+
+        Parameters
+        ----------
+        menu : Gui
+            container where `Worker` widget will be bound
+        """
+        super().__init__(menu)
+        self.executor = ThreadPoolExecutor(max_workers=4)
+        self.task = None
+        self.widgets = []
+        self.progress = ttk.Progressbar(self, mode='indeterminate', length=80)
+        self.progress.grid(row=0, column=0, padx=5)
+        self.stop = tk.Button(self, text='Stop waiting', width=11,
+                              command=self.cancel)
+        self.stop.grid(row=0, column=1)
+
+    def register(self, *widgets):
+        """Add widgets which are disabled during operation."""
+        self.widgets.extend(widgets)
+
+    def run(self, operation, callback, *args, writes=False):
+        """Perform operation in background and pass its result to callback.
+
+        Parameters
+        ----------
+        operation : callable
+            function performed in background thread
+        callback : callable
+            function called in main loop with result of operation
+        *args
+            passed to operation
+        writes : bool, optional
+            True when operation changes database, waiting for it cannot be
+            stopped then, so it is not sent twice, default False
+
+        Returns
+        -------
+        bool
+            False when other operation is still performed else True
+        """
+        if self.task is not None:
+            return False
+        self.task = self.executor.submit(operation, *args), callback
+        self.stop.configure(state='disabled' if writes else 'normal')
+        self.set_busy(True)
+        self.after(self.POLL, self.poll, self.task)
+        return True
+
+    def poll(self, task):
+        """Check if task is done and call its callback with result."""
+        if task is not self.task:
+            return
+        future, callback = task
+        if not future.done():
+            self.after(self.POLL, self.poll, task)
+            return
+        self.task = None
+        self.set_busy(False)
+        callback(future.result())
+
+    def cancel(self):
+        """Stop waiting for running operation and ignore its result.
+
+        Operation which already started is not interrupted.
+        """
+        if self.task is not None:
+            self.task[0].cancel()
+            self.task = None
+            self.set_busy(False)
+
+    def set_busy(self, busy):
+        """Show or hide busy indicator and disable or enable widgets."""
+        for widget in self.widgets:
+            if busy:
+                widget.previous_state = str(widget.cget('state'))
+                widget.configure(state='disabled')
+            else:
+                widget.configure(
+                    state=getattr(widget, 'previous_state', 'normal'))
+        if busy:
+            self.grid()
+            self.progress.start()
+        else:
+            self.progress.stop()
+            self.grid_remove()
+
+
 class Search(tk.Frame):
     """
     Create search widget. Extend `tk.Frame`.
@@ -144,6 +289,10 @@ class Search(tk.Frame):
     ----------
     box : Searchbox
         used for communication with `Searchbox`
+    live : LiveSearch
+        checkbutton turning on search while form is typed in
+    menu : Gui
+        used to reach `Worker` from window with search results
     """
 
     def __init__(self, menu):
@@ -156,9 +305,195 @@ class Search(tk.Frame):
             variables
         """
         super().__init__(menu)
+        self.menu = menu
         create_label(self, 'Search results:', 0, 0)
-        self.box = Searchbox(self, menu.form.variables)
+        self.box = Searchbox(self, menu.form.variables, menu.worker)
         self.box.grid(row=0, column=1)
+        button = tk.Button(self, text='All', width=3, command=self.show_table)
+        button.grid(row=0, column=2, padx=5)
+        menu.worker.register(self.box, button)
+        self.live = LiveSearch(self, menu)
+        self.live.grid(row=0, column=3)
+
+    def show_table(self):
+        """Open window with table of all search results or raise it."""
+        if self.box.table is not None:
+            self.box.table.master.lift()
+            return
+        window = tk.Toplevel(self)
+        window.title('Search results')
+        window.protocol('WM_DELETE_WINDOW', partial(self.close_table, window))
+        table = ResultsTable(window, self.box.select)
+        table.grid(row=0, column=0)
+        table.assign(self.box.values)
+        BatchEditor(window, table, self.menu).grid(row=1, column=0, pady=5)
+        self.box.table = table
+
+    def close_table(self, window):
+        """Close window with table of search results."""
+        self.box.table = None
+        window.destroy()
+
+
+class LiveSearch(tk.Checkbutton):
+    """
+    Search for records while form is typed in. Extend `tk.Checkbutton`.
+
+    When checkbutton is on, each change of form values starts search after
+    short delay, so request is not sent for every typed character. Texts are
+    searched by case insensitive prefix, other values which are not correct
+    yet are skipped. Results are downloaded page by page in background and
+    added to `Searchbox` as they arrive, without changing form. Newer search
+    stops older one and its results are ignored. Nothing is searched when
+    record is selected in `Searchbox`, so it can be edited.
+
+    ...
+
+    Attributes
+    ----------
+    menu : Gui
+        used for communication with `Form` and `Searchbox`
+    enabled : tk.BooleanVar
+        True when live search is turned on
+    pending : str or None
+        id of scheduled search
+    task : tuple or None
+        future, stop event and queue with pages of running search
+    """
+
+    DELAY = 300
+    """Time in milliseconds without changes after which search starts."""
+
+    MIN_LENGTH = 2
+    """Minimum length of text value used in search."""
+
+    PAGE_SIZE = 50
+    """Number of records downloaded in one request."""
+
+    LIMIT = 500
+    """Maximum number of records downloaded for one search."""
+
+    def __init__(self, frame, menu):
+        """Create checkbutton and watch form variables.
+
+        Parameters
+        ----------
+        frame : Search
+            container where `LiveSearch` will be bound
+        menu : Gui
+            used to access `Form`, `Searchbox` and `Worker`
+        """
+        self.enabled = tk.BooleanVar(frame)
+        super().__init__(frame, text='Live', variable=self.enabled,
+                         command=self.schedule)
+        self.menu = menu
+        self.pending = None
+        self.task = None
+        for variable in menu.form.variables.values():
+            variable.trace_add('write', self.schedule)
+
+    def schedule(self, *_):
+        """Start search after `DELAY` unless form is changed again."""
+        if self.pending is not None:
+            self.after_cancel(self.pending)
+            self.pending = None
+        if (self.enabled.get()
+                and self.menu.search.box.get_record() is None):
+            self.pending = self.after(self.DELAY, self.start)
+
+    def start(self):
+        """Stop previous search and start new one in background."""
+        self.pending = None
+        self.stop()
+        parameters = self.parameters(self.menu.form.get(True))
+        if not parameters:
+            return
+        stop, pages = Event(), Queue()
+        future = self.menu.worker.executor.submit(self.fetch, parameters,
+                                                  stop, pages)
+        self.task = future, stop, pages
+        self.after(Worker.POLL, self.poll, self.task, True)
+
+    def stop(self):
+        """Stop running search, results which arrive later are ignored."""
+        if self.task is not None:
+            self.task[1].set()
+            self.task[0].cancel()
+            self.task = None
+
+    def poll(self, task, first):
+        """Add received pages to `Searchbox` until search is finished.
+
+        Parameters
+        ----------
+        task : tuple
+            future, stop event and queue with pages of checked search
+        first : bool
+            True until first page is added, previous results are removed
+            then
+        """
+        if task is not self.task:
+            return
+        future, _, pages = task
+        done = future.done()
+        while not pages.empty():
+            if first:
+                self.menu.search.box.clear()
+                first = False
+            self.menu.search.box.extend_values(pages.get())
+        if not done:
+            self.after(Worker.POLL, self.poll, task, first)
+            return
+        self.task = None
+        if first and future.exception() is None:
+            self.menu.search.box.clear()
+
+    @classmethod
+    def parameters(cls, record):
+        """Return search parameters created from form values.
+
+        Parameters
+        ----------
+        record : Record
+            correct values from form
+
+        Returns
+        -------
+        dict
+            texts of `MIN_LENGTH` or more characters as case insensitive
+            prefixes, other values of `FIELDS` unchanged
+        """
+        query = Query()
+        for key, value in record.items():
+            if key in TEXT_FIELDS:
+                if len(value) >= cls.MIN_LENGTH:
+                    query.prefix(key, value)
+            elif key in FIELDS:
+                query.equal(key, value)
+        return query.parameters
+
+    @classmethod
+    def fetch(cls, parameters, stop, pages):
+        """Download pages of results until `LIMIT` or stop event is set.
+
+        Parameters
+        ----------
+        parameters : dict
+            search parameters
+        stop : threading.Event
+            set when results are not needed anymore
+        pages : queue.Queue
+            where downloaded pages are put
+        """
+        received = 0
+        for page in Database().iter_pages(parameters, cls.PAGE_SIZE,
+                                          Searchbox.SUMMARY):
+            if stop.is_set():
+                return
+            pages.put(page)
+            received += len(page)
+            if received >= cls.LIMIT:
+                return
 
 
 class Searchbox(ttk.Combobox):
@@ -170,14 +505,33 @@ class Searchbox(ttk.Combobox):
     Attributes
     ----------
     values : dict
-        has keys as displayed text in `Searchbox` and values as dictionaries
-        holding information about records
+        has keys as displayed text in `Searchbox` and values as `BookRecord`
+        objects holding information about records, sorted by keys
     variables : dict
         dictionary storing keys used in `Form` and corresponding to them
         `tk.StringVar`s, modifying its values change text seen in form
+    table : ResultsTable or None
+        table showing all records when its window is open
+    worker : Worker or None
+        downloads whole records which were found with `SUMMARY` fields only
+    hydrated : OrderedDict
+        recently downloaded whole records with their expiration time, keys
+        are record ids
     """
 
-    def __init__(self, frame, variables):
+    LISTED = 100
+    """Maximum number of records listed in dropdown."""
+
+    SUMMARY = ('ISBN', 'Title', 'Author', 'Release', 'Price')
+    """Fields needed to list records, only they are downloaded by search."""
+
+    HYDRATED = 64
+    """Maximum number of kept whole records."""
+
+    HYDRATED_TTL = 60
+    """Number of seconds after which whole record is downloaded again."""
+
+    def __init__(self, frame, variables, worker=None):
         """Configure searchbox.
 
         Parameters
@@ -186,10 +540,16 @@ class Searchbox(ttk.Combobox):
             container where `Searchbox` will be bound
         variables : dict
             dictionary with `Form` variables
+        worker : Worker, optional
+            used to download whole records, default None: only records
+            found with all fields fill the form
         """
         super().__init__(frame, width=50, state='readonly')
         self.values = {}
         self.variables = variables
+        self.table = None
+        self.worker = worker
+        self.hydrated = OrderedDict()
         self.bind('<<ComboboxSelected>>', self.do_on_select)
 
     def assign_values(self, values):
@@ -198,7 +558,9 @@ class Searchbox(ttk.Combobox):
         Clear previously loaded elements. For each record in passed values
         create text which is placed in searchbox. Store it as key in
         `self.values` dictionary with corresponding it record values
-        (dictionary). Then pick first record and fill form with its values.
+        (`BookRecord`). Only first `LISTED` texts are placed in dropdown, all
+        records are shown in `table` when it is open. Then pick first record
+        and fill form with its values.
 
         Parameters
         ----------
@@ -207,16 +569,39 @@ class Searchbox(ttk.Combobox):
         """
         self.clear()
         try:
-            for data in values:
-                title = f'{data["ISBN"]} "{data["Title"]}" by {data["Author"]}'
-                self.values[title] = data
-            self['values'] = sorted(list(self.values.keys()))
+            self.extend_values(values)
             self.current(0)
             self.do_on_select()
         except (TypeError, tk.TclError):
             msg.showwarning('No records',
                             'Could not find any results to set criteria.')
 
+    def extend_values(self, values):
+        """Add records to searchbox without selecting any of them.
+
+        Records are marked as partial, because searches download `SUMMARY`
+        fields only. Whole record replaces one when it is selected.
+
+        Parameters
+        ----------
+        values : list
+            list with database records, their data stored in dictionaries
+
+        Raises
+        ------
+        TypeError
+            when values are not list of records
+        """
+        records = {
+            f'{data["ISBN"]} "{data["Title"]}" by {data["Author"]}':
+                BookRecord(data, partial=True) for data in values}
+        records = sorted({**self.values, **records}.items())
+        self.values.clear()
+        self.values.update(records)
+        self['values'] = list(islice(self.values, self.LISTED))
+        if self.table is not None:
+            self.table.assign(self.values)
+
     def assign_image(self, image):
         """Store image data in `self.values`.
 
@@ -228,14 +613,83 @@ class Searchbox(ttk.Combobox):
         self.values[ttk.Combobox.get(self)]['Cover'] = image
 
     def do_on_select(self, *_):
-        """Fill form with values from selected record."""
+        """Fill form with values from selected record.
+
+        Record found with `SUMMARY` fields only is replaced by whole one
+        from `hydrated` or downloaded in background first, then form is
+        filled by `finish_hydrate`. Form stays empty until whole record is
+        known, so its values are never mixed with previous record.
+        """
+        label = ttk.Combobox.get(self)
+        record = self.values.get(label)
+        if record is not None and '_id' in record and record.partial:
+            whole = self.get_hydrated(record['_id'])
+            if whole is None:
+                self.empty()
+                if self.worker is None or not self.worker.run(
+                        Database().fetch, partial(self.finish_hydrate, label),
+                        record['_id']):
+                    msg.showinfo('Busy', 'Record could not be downloaded '
+                                         'now. Select it again when current '
+                                         'operation is finished.')
+                return
+            record = self.values[label] = whole
+        self.fill(record)
+
+    def finish_hydrate(self, label, data):
+        """Store downloaded whole record and fill form when it is selected.
+
+        Parameters
+        ----------
+        label : str
+            text of record in searchbox
+        data : dict or None
+            whole record or None when it could not be downloaded
+        """
+        if data is None:
+            if ttk.Combobox.get(self) == label:
+                self.empty()
+            show_no_connection()
+            return
+        record = BookRecord(data)
+        self.hydrated[record['_id']] = monotonic() + self.HYDRATED_TTL, record
+        while len(self.hydrated) > self.HYDRATED:
+            self.hydrated.popitem(last=False)
+        if label in self.values:
+            self.values[label] = record
+            if ttk.Combobox.get(self) == label:
+                self.fill(record)
+
+    def get_hydrated(self, record_id):
+        """Return kept whole record or None when it is missing or expired."""
+        expires, record = self.hydrated.get(record_id, (0, None))
+        if expires < monotonic():
+            self.hydrated.pop(record_id, None)
+            return None
+        self.hydrated.move_to_end(record_id)
+        return record
+
+    def fill(self, record):
+        """Set form variables to values of record."""
         for key in self.variables.keys():
             try:
-                self.variables[key].set(
-                    self.values[ttk.Combobox.get(self)][key])
-            except KeyError:  # pragma: no cover
+                self.variables[key].set(record[key])
+            except (KeyError, TypeError):  # pragma: no cover
                 pass
 
+    def empty(self):
+        """Set form variables to empty values."""
+        for variable in self.variables.values():
+            try:
+                variable.set('')
+            except tk.TclError:
+                variable.set(False)
+
+    def select(self, title):
+        """Show record with passed text in searchbox and fill form with it."""
+        self.set(title)
+        self.do_on_select()
+
     def get(self):
         """Return record id string when selected or None and display error."""
         try:
@@ -244,6 +698,10 @@ class Searchbox(ttk.Combobox):
             msg.showerror('Error', 'No record selected. To perform operation '
                                    'please select record first.')
 
+    def get_record(self):
+        """Return `BookRecord` with selected record values or None."""
+        return self.values.get(ttk.Combobox.get(self))
+
     def get_image(self):
         """Return image id when it exists else None."""
         try:
@@ -251,11 +709,357 @@ class Searchbox(ttk.Combobox):
         except KeyError:
             return None
 
+    def remove(self, titles):
+        """Remove records with passed texts, e.g. after they were deleted."""
+        for title in titles:
+            record = self.values.pop(title, None)
+            if record is not None:
+                self.hydrated.pop(record.get('_id'), None)
+        if ttk.Combobox.get(self) in titles:
+            self.set('')
+        self.extend_values([])
+
+    def change(self, titles, values):
+        """Set values in records with passed texts, e.g. after update.
+
+        Texts of changed records are created again, so they are unselected.
+
+        Parameters
+        ----------
+        titles : list
+            texts identifying changed records
+        values : dict
+            names of changed fields and their new values
+        """
+        changed = []
+        for title in titles:
+            record = self.values.pop(title, None)
+            if record is not None:
+                self.hydrated.pop(record.get('_id'), None)
+                changed.append({**record.to_dict(), **values})
+        if ttk.Combobox.get(self) in titles:
+            self.set('')
+        self.extend_values(changed)
+
     def clear(self):
         """Clear positions from searchbox."""
         self.values.clear()
         self.set('')
         self['values'] = []
+        if self.table is not None:
+            self.table.assign(self.values)
+
+
+class ResultsTable(tk.Frame):
+    """
+    Create table with search results. Extend `tk.Frame`.
+
+    `ttk.Treeview` holds only rows which are visible, they are replaced when
+    table is scrolled. Scrollbar position is computed from number of all
+    records. Clicking column heading sorts records by its values, keys used
+    for sorting are computed once per column. Many rows can be selected with
+    Shift or Control, selection is kept when they are scrolled out of view.
+    Single selected record is passed to `select`.
+
+    ...
+
+    Attributes
+    ----------
+    select : callable
+        called with text identifying record selected in table
+    records : dict
+        texts identifying records and `BookRecord` objects
+    rows : list
+        texts identifying records in displayed order
+    offset : int
+        position of first visible row
+    selected : set
+        texts identifying selected records
+    """
+
+    COLUMNS = ('ISBN', 'Title', 'Author', 'Release', 'Price')
+    """Record fields displayed in table."""
+
+    ROWS = 20
+    """Number of visible rows."""
+
+    MODIFIERS = 0x0001 | 0x0004
+    """Masks of Shift and Control keys in `state` of `tkinter.Event`."""
+
+    def __init__(self, window, select):
+        """Create table with headings and scrollbar.
+
+        Parameters
+        ----------
+        window : tk.Toplevel
+            container where `ResultsTable` will be bound
+        select : callable
+            called with text identifying selected record
+        """
+        super().__init__(window)
+        self.select = select
+        self.records = {}
+        self.rows = []
+        self.offset = 0
+        self.selected = set()
+        self._keys = {}
+        self._sorted = None
+        self.tree = ttk.Treeview(self, columns=self.COLUMNS, show='headings',
+                                 height=self.ROWS, selectmode='extended')
+        for column in self.COLUMNS:
+            self.tree.heading(column, text=column,
+                              command=partial(self.sort, column))
+            self.tree.column(column, width=300 if column == 'Title' else 110)
+        self.tree.grid(row=0, column=0)
+        self.scrollbar = ttk.Scrollbar(self, orient='vertical',
+                                       command=self.yview)
+        self.scrollbar.grid(row=0, column=1, sticky='NS')
+        self.summary = tk.Label(self)
+        self.summary.grid(row=1, column=0, sticky='W')
+        self.tree.bind('<<TreeviewSelect>>', self.on_select)
+        self.tree.bind('<Button-1>', self.on_click)
+        for sequence in ('<MouseWheel>', '<Button-4>', '<Button-5>'):
+            self.tree.bind(sequence, self.on_wheel)
+
+    def assign(self, records):
+        """Show records in their order and scroll to the top.
+
+        Parameters
+        ----------
+        records : dict
+            texts identifying records and `BookRecord` objects
+        """
+        self.records = records
+        self.rows = list(records)
+        self.offset = 0
+        self.selected = set()
+        self._keys = {}
+        self._sorted = None
+        self.render()
+
+    def sort(self, column):
+        """Sort records by column, reverse order when sorted by it already.
+
+        Numbers are placed before texts and missing values at the end.
+        """
+        keys = self._keys.get(column)
+        if keys is None:
+            keys = self._keys[column] = {
+                title: self.sort_key(record.get(column))
+                for title, record in self.records.items()}
+        descending = self._sorted == (column, False)
+        self.rows.sort(key=keys.__getitem__, reverse=descending)
+        self._sorted = column, descending
+        self.scroll_to(0)
+
+    @staticmethod
+    def sort_key(value):
+        """Return key allowing to compare values of different types."""
+        if value is None or value == '':
+            return 2, 0, ''
+        if isinstance(value, Number) and not isinstance(value, bool):
+            return 0, value, ''
+        return 1, 0, str(value).casefold()
+
+    def render(self):
+        """Replace rows of treeview with visible records."""
+        self.tree.delete(*self.tree.get_children())
+        visible = self.rows[self.offset:self.offset + self.ROWS]
+        for title in visible:
+            record = self.records[title]
+            self.tree.insert('', 'end', iid=title, values=[
+                record.get(column, '') for column in self.COLUMNS])
+        self.tree.selection_set([title for title in visible
+                                 if title in self.selected])
+        self.summary.configure(text=f'Selected: {len(self.selected)} of '
+                                    f'{len(self.rows)}')
+        total = len(self.rows)
+        if total:
+            self.scrollbar.set(self.offset / total,
+                               min(self.offset + self.ROWS, total) / total)
+        else:
+            self.scrollbar.set(0, 1)
+
+    def scroll_to(self, offset):
+        """Show rows starting from passed position."""
+        self.offset = max(0, min(offset, len(self.rows) - self.ROWS))
+        self.render()
+
+    def yview(self, action, amount, unit=None):
+        """Scroll table after scrollbar was moved or its arrow clicked."""
+        if action == 'moveto':
+            self.scroll_to(round(float(amount) * len(self.rows)))
+        else:
+            step = self.ROWS if unit == 'pages' else 1
+            self.scroll_to(self.offset + int(amount) * step)
+
+    def on_wheel(self, event):
+        """Scroll table with mouse wheel."""
+        up = event.num == 4 or event.delta > 0
+        self.scroll_to(self.offset + (-3 if up else 3))
+        return 'break'
+
+    def on_click(self, event):
+        """Forget selection when row is clicked without Shift or Control."""
+        if (not event.state & self.MODIFIERS
+                and self.tree.identify_region(event.x, event.y) == 'cell'):
+            self.selected = set()
+
+    def on_select(self, *_):
+        """Remember selected rows, pass text of single selected record."""
+        selected = (self.selected - set(self.tree.get_children())
+                    | set(self.tree.selection()))
+        if selected == self.selected:
+            return
+        self.selected = selected
+        self.summary.configure(text=f'Selected: {len(selected)} of '
+                                    f'{len(self.rows)}')
+        if len(selected) == 1:
+            self.select(next(iter(selected)))
+
+    def select_all(self):
+        """Select all records."""
+        self.selected = set(self.rows)
+        self.render()
+
+    def chosen(self):
+        """Return texts of selected records in displayed order."""
+        return [title for title in self.rows if title in self.selected]
+
+
+class BatchEditor(tk.Frame):
+    """
+    Change or remove records selected in `ResultsTable`. Extend `tk.Frame`.
+
+    Chosen field gets the same value in all selected records. Requests are
+    sent in background and summary of their results is displayed once.
+
+    ...
+
+    Attributes
+    ----------
+    table : ResultsTable
+        table where records are selected
+    menu : Gui
+        used to run operations with `Worker` and update `Searchbox`
+    field : ttk.Combobox
+        name of changed field
+    value : tk.Entry
+        new value of changed field
+    """
+
+    FIELDS = tuple(field for field in FIELDS if field != 'ISBN')
+    """Fields which can be changed in many records, ISBN must be unique."""
+
+    REPORTED = 10
+    """Maximum number of failed records named in summary."""
+
+    def __init__(self, window, table, menu):
+        """Create field chooser, value entry and buttons.
+
+        Parameters
+        ----------
+        window : tk.Toplevel
+            container where `BatchEditor` will be bound
+        table : ResultsTable
+            table where records are selected
+        menu : Gui
+            main window of application
+        """
+        super().__init__(window)
+        self.table = table
+        self.menu = menu
+        tk.Button(self, text='Select all', command=table.select_all).grid(
+            row=0, column=0, padx=5)
+        self.field = ttk.Combobox(self, values=self.FIELDS, width=10,
+                                  state='readonly')
+        self.field.current(self.FIELDS.index('Price'))
+        self.field.grid(row=0, column=1)
+        self.value = tk.Entry(self, width=20)
+        self.value.grid(row=0, column=2, padx=5)
+        for place, (text, command) in enumerate(
+                (('Set', self.revise), ('Delete', self.delete)), 3):
+            tk.Button(self, text=text, width=5, command=command).grid(
+                row=0, column=place, padx=5)
+
+    def selected(self):
+        """Return texts and ids of selected records or display error."""
+        titles = [title for title in self.table.chosen()
+                  if '_id' in self.table.records[title]]
+        if not titles:
+            msg.showerror('Error', 'No records selected. To perform '
+                                   'operation please select records first.')
+        return titles, [self.table.records[title]['_id'] for title in titles]
+
+    def isbns(self, titles):
+        """Return ISBN numbers of records, None when number is not known."""
+        return [self.table.records[title].get('ISBN') for title in titles]
+
+    def revise(self):
+        """Set chosen field of selected records to entered value.
+
+        Value is validated like in `Form`. After confirmation records are
+        updated in background, results are handled by `finish`.
+        """
+        titles, ids = self.selected()
+        if not titles:
+            return
+        field, values = self.field.get(), Record()
+        try:
+            values[field] = self.value.get()
+        except ValueError as error:
+            msg.showerror('Error', f'Wrong value for field "{field}". {error}')
+            return
+        values.cast()
+        if msg.askyesno('Update', f'Set {field} to "{values[field]}" in '
+                                  f'{len(ids)} records?') and (
+                not self.menu.worker.run(
+                    Database().update_many,
+                    partial(self.finish, titles, dict(values)),
+                    ids, dict(values), writes=True)):
+            show_busy()
+
+    def delete(self):
+        """Remove selected records after confirmation.
+
+        Records are removed in background, results are handled by `finish`.
+        """
+        titles, ids = self.selected()
+        if titles and msg.askyesno('Delete', f'Remove {len(ids)} records '
+                                             f'from database?') and (
+                not self.menu.worker.run(
+                    partial(Database().delete_many, isbns=self.isbns(titles)),
+                    partial(self.finish, titles, None), ids, writes=True)):
+            show_busy()
+
+    def finish(self, titles, values, results):
+        """Update `Searchbox` and display summary of operation.
+
+        Parameters
+        ----------
+        titles : list
+            texts identifying changed records
+        values : dict or None
+            values set in records, None when they were removed
+        results : list
+            bool for each record, True when operation succeeded
+        """
+        done = [title for title, result in zip(titles, results) if result]
+        failed = [title for title, result in zip(titles, results)
+                  if not result]
+        if values is None:
+            self.menu.search.box.remove(done)
+            text = f'Removed {len(done)} of {len(titles)} records.'
+        else:
+            self.menu.search.box.change(done, values)
+            text = f'Updated {len(done)} of {len(titles)} records.'
+        if not failed:
+            msg.showinfo('Done', text)
+            return
+        text += '\n\nFailed:\n' + '\n'.join(failed[:self.REPORTED])
+        if len(failed) > self.REPORTED:
+            text += f'\nand {len(failed) - self.REPORTED} more'
+        msg.showwarning('Done', text)
 
 
 class Form(tk.Frame):
@@ -370,51 +1174,111 @@ class Image(tk.Frame):
         used to bind `Image` widget and communication with other menu elements
     """
 
+    VIEW_SIZE = (400, 600)
+    """Maximum width and height of displayed cover."""
+
     def __init__(self, menu):
         """Create buttons for interaction with images."""
         super().__init__(menu)
         self.menu = menu
-        tk.Button(self, text='Add cover', width=8,
-                  command=self.add_image).grid(row=0, column=0, pady=15)
-        tk.Button(self, text='View cover', width=8,
-                  command=self.view_image).grid(row=0, column=1, sticky='W')
+        for place, (text, command) in enumerate(
+                (('Add cover', self.add_image),
+                 ('View cover', self.view_image))):
+            button = tk.Button(self, text=text, width=8, command=command)
+            button.grid(row=0, column=place, pady=15, sticky='W')
+            menu.worker.register(button)
 
     def add_image(self):
         """Update selected record image in database.
 
         When record is selected in `Searchbox` open window where user can pick
-        image file. Then convert image with `bookmeister.picture` module. If
-        it succeed add it to database else display error window.
+        image file. If it is valid image upload it in background else display
+        error window.
         """
+        from tkinter.filedialog import askopenfile
+
         selected = self.menu.search.box.get()
         if selected:
             path = askopenfile(initialdir=Path.home())
             if path:
                 if self.verify(path.name):
-                    image_id = Database().upload_image(path.name)
-                    if image_id:
-                        if Database().update(selected, {'Cover': image_id}):
-                            self.menu.search.box.assign_image(image_id)
-                            msg.showinfo('Done',
-                                         'Image successfully saved.')
-                        else:
-                            show_no_connection()
+                    self.menu.worker.run(self.upload, self.finish_upload,
+                                         selected, path.name, writes=True)
                 else:
                     msg.showerror('Error', 'Wrong image file format.')
 
+    def finish_upload(self, image_id):
+        """Assign uploaded image to selected record or display error."""
+        if image_id:
+            self.menu.search.box.assign_image(image_id)
+            msg.showinfo('Done', 'Image successfully saved.')
+        else:
+            show_no_connection()
+
     def view_image(self):
         """Display selected record image.
 
-        When record is selected in `Searchbox` open its image in browser. If
-        operation failed display error.
+        When record is selected in `Searchbox` download and decode its image
+        in background, result is handled by `finish_view`. If record has no
+        image display error.
         """
         if self.menu.search.box.get():
             picture = self.menu.search.box.get_image()
             if picture:
-                self.open_image(picture)
+                self.menu.worker.run(self.load, partial(
+                    self.finish_view, picture), picture)
             else:
                 msg.showerror('Error', 'There is no image uploaded yet.')
 
+    def finish_view(self, link, image):
+        """Show decoded image in new window or display error."""
+        import PIL.ImageTk
+
+        if image is None:
+            show_no_connection()
+            return
+        window = tk.Toplevel(self)
+        window.title('Cover')
+        photo = PIL.ImageTk.PhotoImage(image, master=window)
+        label = tk.Label(window, image=photo)
+        label.image = photo
+        label.grid(row=0, column=0)
+        tk.Button(window, text='Open in browser',
+                  command=partial(self.open_image, link)).grid(
+            row=1, column=0, pady=5)
+
+    @classmethod
+    def load(cls, link):
+        """Download image and scale it down to fit `VIEW_SIZE`.
+
+        Downloaded images are kept in `Database.covers`, so next view of the
+        same image does not need connection.
+
+        Parameters
+        ----------
+        link : str
+            identification number of image from database media archive
+
+        Returns
+        -------
+        PIL.Image.Image
+            decoded image ready to display
+        None
+            when image cannot be downloaded or decoded
+        """
+        import PIL.Image
+
+        data = Database().download_image(link)
+        if data is None:
+            return None
+        try:
+            image = PIL.Image.open(BytesIO(data))
+            image.draft('RGB', cls.VIEW_SIZE)
+            image.thumbnail(cls.VIEW_SIZE, PIL.Image.LANCZOS)
+            return image
+        except (OSError, ValueError, PIL.Image.DecompressionBombError):
+            return None
+
     @staticmethod
     def open_image(link):
         """Open image from database media archive in browser.
@@ -424,12 +1288,48 @@ class Image(tk.Frame):
         link : str
             identification number of image from database media archive
         """
+        import webbrowser
+
         url = Database().url + '/media/' + link
         webbrowser.open(url, new=True)
 
+    @staticmethod
+    def upload(record_id, path):
+        """Upload image to database and bind it with record.
+
+        Image is scaled down and compressed in memory before it is sent.
+
+        Parameters
+        ----------
+        record_id : str
+            key of record which image is uploaded
+        path : str
+            image path
+
+        Returns
+        -------
+        str
+            id of uploaded image
+        None
+            when image cannot be read, upload or record update failed
+        """
+        import PIL.Image
+        from bookmeister.picture import prepare
+
+        try:
+            picture = prepare(path)
+        except (OSError, ValueError, PIL.Image.DecompressionBombError):
+            return None
+        image_id = Database().upload_image(picture)
+        if image_id and Database().update(record_id, {'Cover': image_id}):
+            return image_id
+        return None
+
     @staticmethod
     def verify(path):
         """Return True if under set path there is valid image else False."""
+        import PIL.Image
+
         try:
             image = PIL.Image.open(path)
             image.verify()
@@ -457,15 +1357,16 @@ class Buttons(tk.Frame):
         self.menu = menu
         positions = ('add', 'search', 'revise', 'delete')
         for place, name in enumerate(positions):
-            tk.Button(self, text=name.capitalize(), width=5,
-                      command=getattr(self, name)).grid(row=0, column=place)
+            button = tk.Button(self, text=name.capitalize(), width=5,
+                               command=getattr(self, name))
+            button.grid(row=0, column=place)
+            menu.worker.register(button)
 
     def process_data(self, data, operation, *args):
         """Check data and perform passed database operation.
 
         Check if passed dictionary has all necessary keys. If yes send them
-        to database. Then clear `Form`, `Searchbox` and notify about success.
-        In case of error display proper message.
+        to database in background. Result is handled by `finish_save`.
 
         Parameters
         ----------
@@ -477,22 +1378,42 @@ class Buttons(tk.Frame):
             used to pass record id for update operation
         """
         if not set(FIELDS) - (data.keys()):
-            if operation(*args, data):
-                msg.showinfo('Done', 'Record successfully saved to database.')
-                self.menu.search.box.clear()
-                self.menu.form.clear()
-            else:
-                show_no_connection()
+            self.menu.worker.run(operation, self.finish_save, *args, data,
+                                 writes=True)
+
+    def finish_save(self, result):
+        """Clear `Form`, `Searchbox` and notify about success or error."""
+        if result:
+            msg.showinfo('Done', 'Record successfully saved to database.')
+            self.menu.search.box.clear()
+            self.menu.form.clear()
+        else:
+            show_no_connection()
 
     def add(self):
         """Add record to database.
 
-        Use `Form.get` to collect data. Then check database if record with set
-        ISBN number already exists. If not add it. In case of errors display
-        notification. If operation succeed information is displayed as well.
+        Use `Form.get` to collect data. Then check in background if record
+        with set ISBN number already exists. Result is handled by
+        `finish_add`.
         """
         data = self.menu.form.get()
-        exists = self.exist_check(data.get('ISBN', None))
+        self.menu.worker.run(self.exist_check, partial(self.finish_add, data),
+                             data.get('ISBN', None))
+
+    def finish_add(self, data, exists):
+        """Add record if it does not exist yet.
+
+        In case of errors display notification. If operation succeed
+        information is displayed as well.
+
+        Parameters
+        ----------
+        data : dict
+            contains values collected from form fields
+        exists : list or bool or None
+            result of `exist_check`
+        """
         if exists is None:
             show_no_connection()
         else:
@@ -506,53 +1427,92 @@ class Buttons(tk.Frame):
         """Search for record matching criteria in database.
 
         Use `Form.get` to collect values. Silent parameter is set to not
-        display notifications about empty fields. Place request results in
-        `Searchbox`.
+        display notifications about empty fields. Request is sent in
+        background and its results are handled by `finish_search`. Only
+        `Searchbox.SUMMARY` fields of found records are downloaded.
         """
         parameters = self.menu.form.get(True)
         if parameters:
-            result = Database().search(parameters)
-            if result is None:
-                show_no_connection()
-            else:
-                self.menu.search.box.assign_values(result)
+            self.menu.search.live.stop()
+            self.menu.worker.run(Database().search, self.finish_search,
+                                 parameters, Searchbox.SUMMARY)
+
+    def finish_search(self, result):
+        """Place request results in `Searchbox` or display error."""
+        if result is None:
+            show_no_connection()
+        else:
+            self.menu.search.box.assign_values(result)
+            if len(result) > Searchbox.LISTED:
+                self.menu.search.show_table()
 
     def revise(self):
         """Update record in database.
 
         Use `Form.get` to collect values. Check if record to update is selected
-         in `Searchbox` then send data.
+         in `Searchbox` and all values are correct. Then send in background
+        only values which differ from selected record, when nothing changed
+        request is not sent. Result is handled by `finish_save`.
         """
         data = self.menu.form.get()
         selected = self.menu.search.box.get()
-        if selected:
-            self.process_data(data, Database().update, selected)
+        if selected and not set(FIELDS) - data.keys():
+            try:
+                changes = data.changes(self.menu.search.box.get_record())
+            except ValueError:
+                msg.showerror('Error', 'Selected record is not downloaded '
+                                       'yet. Select it again and wait until '
+                                       'form is filled.')
+                return
+            if not changes:
+                msg.showinfo('No changes', 'Record has the same values as '
+                                           'in database.')
+                return
+            self.menu.search.box.hydrated.pop(selected, None)
+            self.menu.worker.run(Database().update, self.finish_save,
+                                 selected, changes, writes=True)
 
     def delete(self):
         """Remove record from database.
 
         Check if record is selected in `Searchbox` then removes it from
-        database. `Form` and `Searchbox` are cleared. Notification about
-        success is displayed. In case of errors information is shown as well.
+        database in background. Result is handled by `finish_delete`.
         """
         selected = self.menu.search.box.get()
         if selected:
-            if Database().delete(selected):
-                msg.showinfo('Done',
-                             'Record successfully removed from database.')
-                self.menu.search.box.clear()
-                self.menu.form.clear()
-            else:
-                show_no_connection()
+            record = self.menu.search.box.get_record()
+            isbn = record.get('ISBN') if record is not None else None
+            self.menu.worker.run(Database().delete, self.finish_delete,
+                                 selected, isbn, writes=True)
+
+    def finish_delete(self, result):
+        """Clear `Form` and `Searchbox` and notify about success or error.
+
+        Parameters
+        ----------
+        result : bool
+            result of `Database.delete`
+        """
+        if result:
+            msg.showinfo('Done', 'Record successfully removed from database.')
+            self.menu.search.box.clear()
+            self.menu.form.clear()
+        else:
+            show_no_connection()
 
     @staticmethod
-    def exist_check(number):
+    def exist_check(number, force=False):
         """Check if record with set ISBN is already in database.
 
+        When `Database.isbns` is loaded and number is surely not there no
+        request is sent.
+
         Parameters
         ----------
         number : str
             string number taken from ISBN field
+        force : bool, optional
+            when True always ask database, default False
 
         Returns
         -------
@@ -564,5 +1524,8 @@ class Buttons(tk.Frame):
             when passed number is empty string
         """
         if number:
+            if not force and Database.isbns is not None \
+                    and number not in Database.isbns:
+                return []
             return Database().search({'ISBN': number})
         return False
@@ -0,0 +1,266 @@
+"""#### Importer
+
+Module with functions necessary to load many records to database from CSV or
+JSONL file. File is read line by line and each row is validated with
+`bookmeister.record.Record` the same way as values from application form.
+Correct records are sent with `Database.add_many` in batches, so memory usage
+does not depend on file size. Before each batch is sent, one search checks
+which of its ISBN numbers are already in database, numbers repeated in file
+are refused as well. Rows which could not be stored are reported with their
+numbers. Modules used: `argparse`, `csv`, `json`, `sys` and `time`.
+
+Use `$ bookmeister-import catalogue.csv` or
+`$ python -m bookmeister.importer catalogue.csv` to run it from terminal.
+
+
+#### License
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+from argparse import ArgumentParser
+import csv
+from json import loads
+import sys
+from time import perf_counter
+
+from bookmeister.connection import Database
+from bookmeister.record import FIELDS, Record
+
+ACCEPTED = FIELDS + ('Hardcover', 'Cover')
+"""Fields which can be read from file, other columns are refused."""
+
+
+def read_rows(path):
+    """Yield rows from CSV or JSONL file one by one.
+
+    File type is recognized by extension, '.jsonl' and '.json' files are
+    expected to have one JSON object per line and their rows are yielded as
+    text, other are read as CSV with header.
+
+    Parameters
+    ----------
+    path : str
+        path of file to read
+
+    Yields
+    ------
+    tuple
+        number of row starting from 1 and dictionary with its values or
+        JSON text
+    """
+    with open(path, newline='', encoding='utf-8') as source:
+        if path.endswith(('.jsonl', '.json')):
+            rows = (line for line in source if line.strip())
+        else:
+            rows = csv.DictReader(source)
+        yield from enumerate(rows, 1)
+
+
+def parse_row(row, complete=True):
+    """Return `Record` created from row values.
+
+    JSON text is decoded first. Only `ACCEPTED` fields can be set. Values of
+    `FIELDS` are validated as text, 'Hardcover' is converted to bool. Then
+    `Record.cast` sets types expected in database.
+
+    Parameters
+    ----------
+    row : dict or str
+        names of fields and their values
+    complete : bool, optional
+        when True every field of `FIELDS` is required, default True
+
+    Returns
+    -------
+    Record
+        validated record ready to be sent to database
+
+    Raises
+    ------
+    ValueError
+        when row is not valid JSON object, CSV row has other number of
+        values than header, some fields are unknown, missing or have wrong
+        value
+    """
+    decoded = isinstance(row, str)
+    if decoded:
+        row = loads(row)
+        if not isinstance(row, dict):
+            raise ValueError('Row must be JSON object.')
+    if None in row:
+        raise ValueError('Row has more values than header.')
+    if None in row.values():
+        raise ValueError('Values cannot be null.' if decoded
+                         else 'Row has fewer values than header.')
+    unknown = row.keys() - set(ACCEPTED)
+    if unknown:
+        raise ValueError(f'Unknown fields: {", ".join(sorted(unknown))}.')
+    missing = set(FIELDS) - row.keys() if complete else ()
+    if missing:
+        raise ValueError(f'Missing fields: {", ".join(sorted(missing))}.')
+    record = Record()
+    for key, value in row.items():
+        if key == 'Hardcover':
+            value = str(value).strip().lower() in ('1', 'true', 'yes')
+        elif key in FIELDS:
+            value = str(value)
+        try:
+            record[key] = value
+        except ValueError as error:
+            raise ValueError(f'Wrong value for field "{key}". {error}')
+    record.cast()
+    return record
+
+
+def check_repeated(seen, number, record):
+    """Remember ISBN number of record and row where it was first found.
+
+    Parameters
+    ----------
+    seen : dict
+        ISBN numbers found so far mapped to numbers of their rows
+    number : int or None
+        number of row with record
+    record : Record
+        validated record
+
+    Raises
+    ------
+    ValueError
+        when the same ISBN number was found in earlier row
+    """
+    isbn = record['ISBN']
+    if isbn in seen:
+        raise ValueError(f'ISBN {isbn} is repeated, first found in row '
+                         f'{seen[isbn]}.')
+    seen[isbn] = number
+
+
+def split_existing(database, batch):
+    """Separate records whose ISBN numbers are already in database.
+
+    One search with `$in` operator is sent for whole batch and only 'ISBN'
+    field of found records is downloaded. Numbers surely missing according
+    to `Database.isbns` are not searched.
+
+    Parameters
+    ----------
+    database : Database
+        object used to search records
+    batch : list
+        tuples with number of row and validated `Record`
+
+    Returns
+    -------
+    tuple
+        list of new rows from batch and list of refused rows with number of
+        row and error message, all rows are refused in case of connection
+        error
+    """
+    isbns = [record['ISBN'] for _, record in batch
+             if database.isbns is None or record['ISBN'] in database.isbns]
+    existing = set()
+    if isbns:
+        records = database.search({'ISBN': {'$in': isbns}}, ('ISBN',))
+        if not isinstance(records, list):
+            return [], [(number, 'could not check if record exists in '
+                                 'database.') for number, _ in batch]
+        existing = {record.get('ISBN') for record in records
+                    if isinstance(record, dict)}
+    new, refused = [], []
+    for number, record in batch:
+        if record['ISBN'] in existing:
+            refused.append((number, f'record with ISBN {record["ISBN"]} '
+                                    f'already exists in database.'))
+        else:
+            new.append((number, record))
+    return new, refused
+
+
+def import_file(path, database=None, batch_size=100, errors=sys.stderr):
+    """Validate rows from file and store correct ones in database.
+
+    Parameters
+    ----------
+    path : str
+        path of CSV or JSONL file
+    database : Database, optional
+        object used to send records, default None: create new one
+    batch_size : int, optional
+        number of records sent in one request, default 100
+    errors : file, optional
+        stream where rows which could not be stored are reported
+
+    Returns
+    -------
+    tuple
+        number of stored and number of failed rows
+    """
+    database = database or Database()
+    stored = failed = 0
+    batch = []
+    seen = {}
+
+    def send():
+        nonlocal stored, failed
+        new, refused = split_existing(database, batch)
+        for number, message in refused:
+            failed += 1
+            print(f'Row {number}: {message}', file=errors)
+        results = database.add_many([record for _, record in new],
+                                    batch_size) if new else []
+        for (number, _), added in zip(new, results):
+            if added:
+                stored += 1
+            else:
+                failed += 1
+                print(f'Row {number}: could not save record to database.',
+                      file=errors)
+        batch.clear()
+
+    for number, row in read_rows(path):
+        try:
+            record = parse_row(row)
+            check_repeated(seen, number, record)
+            batch.append((number, record))
+        except ValueError as error:
+            failed += 1
+            print(f'Row {number}: {error}', file=errors)
+        if len(batch) >= batch_size:
+            send()
+    if batch:
+        send()
+    return stored, failed
+
+
+def main(arguments=None):
+    """Import file passed in command line arguments and print summary.
+
+    Returns
+    -------
+    int
+        exit code, 0 when every row was stored else 1
+    """
+    parser = ArgumentParser(description='Load books from CSV or JSONL file '
+                                        'to database.')
+    parser.add_argument('path', help='CSV or JSONL file with records')
+    parser.add_argument('--batch-size', type=int, default=100,
+                        help='number of records sent in one request')
+    options = parser.parse_args(arguments)
+
+    start = perf_counter()
+    stored, failed = import_file(options.path, batch_size=options.batch_size)
+    elapsed = perf_counter() - start
+    print(f'Stored {stored} records, {failed} failed in {elapsed:.1f} s '
+          f'({(stored + failed) / max(elapsed, 0.001):.0f} rows/s).')
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,247 @@
+"""#### Known
+
+Module with classes which remember ISBN numbers of all records in database,
+so checking if record exists does not need request when number is surely not
+there. `IsbnSet` stores numbers as sorted array of 64-bit integers,
+`BloomFilter` uses less memory for very large catalogues but can give false
+positive answers and cannot forget removed numbers. `KnownIsbns` loads
+numbers from database, picks one of them and keeps it current. Until it is
+loaded every number is reported as possibly known. Modules used: `array`,
+`bisect`, `hashlib`, `math` and `threading`.
+
+
+#### License
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+from array import array
+from bisect import bisect_left
+from hashlib import blake2b
+from math import ceil, log
+from threading import Lock
+
+
+class IsbnSet:
+    """
+    Store ISBN numbers in sorted array of unsigned 64-bit integers.
+
+    Numbers added or removed later are kept in small sets.
+
+    ...
+
+    Attributes
+    ----------
+    numbers : array
+        sorted numbers loaded at creation
+    """
+
+    def __init__(self, numbers=()):
+        """Sort and pack passed numbers."""
+        self.numbers = array('Q', sorted(numbers))
+        self._added = set()
+        self._removed = set()
+
+    def __contains__(self, isbn):
+        """Check if number is stored."""
+        if isbn in self._added:
+            return True
+        if isbn in self._removed:
+            return False
+        index = bisect_left(self.numbers, isbn)
+        return index < len(self.numbers) and self.numbers[index] == isbn
+
+    def __len__(self):
+        """Return number of stored numbers."""
+        return len(self.numbers) + len(self._added) - len(self._removed)
+
+    def add(self, isbn):
+        """Store number."""
+        if isbn in self:
+            return
+        if isbn in self._removed:
+            self._removed.discard(isbn)
+        else:
+            self._added.add(isbn)
+
+    def discard(self, isbn):
+        """Forget number if it is stored."""
+        if isbn not in self:
+            return
+        if isbn in self._added:
+            self._added.discard(isbn)
+        else:
+            self._removed.add(isbn)
+
+
+class BloomFilter:
+    """
+    Remember ISBN numbers in Bloom filter.
+
+    Answer False is always right, answer True is wrong with chance close to
+    `error_rate` when no more than `capacity` numbers are stored.
+
+    ...
+
+    Attributes
+    ----------
+    size : int
+        number of bits in filter
+    hashes : int
+        number of bits set for each number
+    bits : bytearray
+        filter content
+    """
+
+    def __init__(self, capacity, error_rate=0.01):
+        """Create empty filter.
+
+        Parameters
+        ----------
+        capacity : int
+            expected number of stored numbers
+        error_rate : float, optional
+            accepted chance of false positive answer, default 0.01
+        """
+        capacity = max(capacity, 1)
+        self.size = ceil(-capacity * log(error_rate) / log(2) ** 2)
+        self.hashes = max(1, round(self.size / capacity * log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def __contains__(self, isbn):
+        """Check if number may be stored."""
+        return all(self.bits[bit >> 3] & (1 << (bit & 7))
+                   for bit in self._positions(isbn))
+
+    def add(self, isbn):
+        """Store number."""
+        for bit in self._positions(isbn):
+            self.bits[bit >> 3] |= 1 << (bit & 7)
+
+    def discard(self, isbn):
+        """Do nothing, numbers cannot be removed from Bloom filter."""
+
+    def _positions(self, isbn):
+        """Yield positions of bits representing number."""
+        digest = blake2b(isbn.to_bytes(8, 'little'), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+        for number in range(self.hashes):
+            yield (first + number * second) % self.size
+
+
+class KnownIsbns:
+    """
+    Keep ISBN numbers of all records from database.
+
+    All methods are thread safe.
+
+    ...
+
+    Attributes
+    ----------
+    bloom_above : int
+        number of records above which `BloomFilter` is used instead of
+        `IsbnSet`
+    numbers : IsbnSet or BloomFilter or None
+        stored numbers, None until they are loaded
+    """
+
+    def __init__(self, bloom_above=1000000):
+        """Prepare empty container, numbers are not loaded yet.
+
+        Parameters
+        ----------
+        bloom_above : int, optional
+            number of records above which Bloom filter is used, default
+            1000000
+        """
+        self.bloom_above = bloom_above
+        self.numbers = None
+        self._pending = {}
+        self._lock = Lock()
+
+    def __contains__(self, isbn):
+        """Check if number may be in database.
+
+        Parameters
+        ----------
+        isbn : int or str
+            ISBN-13 number
+
+        Returns
+        -------
+        bool
+            False when number is surely not in database else True
+        """
+        with self._lock:
+            if self.numbers is None:
+                return True
+            return int(isbn) in self.numbers
+
+    def add(self, isbn):
+        """Remember number of record added to database."""
+        self._change(int(isbn), True)
+
+    def discard(self, isbn):
+        """Forget number of record removed from database."""
+        self._change(int(isbn), False)
+
+    def load(self, database, page_size=1000):
+        """Download numbers of all records from database.
+
+        Only 'ISBN' field of records is requested.
+
+        Changes made while numbers are downloaded are applied afterwards.
+
+        Parameters
+        ----------
+        database : Database
+            object used to download records
+        page_size : int, optional
+            number of records downloaded in one request, default 1000
+
+        Returns
+        -------
+        bool
+            True when numbers were loaded, False in case of connection error
+            or malformed page, numbers stay not loaded then
+        """
+        numbers = array('Q')
+        try:
+            for page in database.iter_pages({}, page_size, ('ISBN',)):
+                for record in page:
+                    if 'ISBN' in record:
+                        numbers.append(int(record['ISBN']))
+        except (OSError, TypeError, ValueError, OverflowError):
+            return False
+        if len(numbers) > self.bloom_above:
+            loaded = BloomFilter(2 * len(numbers))
+            for isbn in numbers:
+                loaded.add(isbn)
+        else:
+            loaded = IsbnSet(numbers)
+        with self._lock:
+            for isbn, added in self._pending.items():
+                if added:
+                    loaded.add(isbn)
+                else:
+                    loaded.discard(isbn)
+            self._pending.clear()
+            self.numbers = loaded
+        return True
+
+    def _change(self, isbn, added):
+        """Add or remove number, remember change until numbers are loaded."""
+        with self._lock:
+            if self.numbers is None:
+                self._pending[isbn] = added
+            elif added:
+                self.numbers.add(isbn)
+            else:
+                self.numbers.discard(isbn)
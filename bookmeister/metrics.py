@@ -0,0 +1,216 @@
+"""#### Metrics
+
+Module with `Metrics` registry collecting counters and latency histograms of
+database operations. Assigned to `bookmeister.connection.Database.metrics` it
+records for each operation and each request its wall time, number of sent and
+received bytes, HTTP status and outcome. When it is not assigned nothing is
+measured. Collected values can be exported as Prometheus text format or as
+JSON snapshot. Modules used: `bisect`, `json`, `os` and `threading`.
+
+Durations recorded by `Database`:
+
+- `operation_seconds` whole method call, including JSON handling, cache and
+  replica lookups
+- `request_seconds` single HTTP request, including connection, TLS handshake
+  and download of response body
+- `response_seconds` time from sending request until response headers were
+  parsed, as measured by `requests`
+
+
+#### License
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+from bisect import bisect_left
+from json import dumps
+import os
+from threading import Lock
+
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+"""Default upper bounds of histogram buckets in seconds."""
+
+
+class Histogram:
+    """
+    Count observed values in buckets.
+
+    ...
+
+    Attributes
+    ----------
+    buckets : tuple
+        sorted upper bounds of buckets, values above the last one are counted
+        in additional bucket
+    counts : list
+        number of values in each bucket, not cumulative
+    sum : float
+        sum of observed values
+    count : int
+        number of observed values
+    """
+
+    def __init__(self, buckets=BUCKETS):
+        """Create empty histogram."""
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        """Add value to histogram."""
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self):
+        """Return list of pairs with bucket bound and number of values."""
+        bounds = [*map(float, self.buckets), float('inf')]
+        total, pairs = 0, []
+        for bound, count in zip(bounds, self.counts):
+            total += count
+            pairs.append((bound, total))
+        return pairs
+
+
+class Metrics:
+    """
+    Registry of counters and histograms identified by name and labels.
+
+    All methods are thread safe.
+
+    ...
+
+    Attributes
+    ----------
+    prefix : str
+        added to names of exported metrics
+    buckets : tuple
+        upper bounds of buckets of created histograms
+    counters : dict
+        values of counters, keys are names with sorted label pairs
+    histograms : dict
+        `Histogram` objects, keys are names with sorted label pairs
+    """
+
+    def __init__(self, prefix='bookmeister', buckets=BUCKETS):
+        """Create empty registry.
+
+        Parameters
+        ----------
+        prefix : str, optional
+            added to names of exported metrics, default 'bookmeister'
+        buckets : tuple, optional
+            upper bounds of histogram buckets in seconds, default `BUCKETS`
+        """
+        self.prefix = prefix
+        self.buckets = buckets
+        self.counters = {}
+        self.histograms = {}
+        self._lock = Lock()
+
+    def inc(self, name, amount=1, **labels):
+        """Increase counter by amount."""
+        key = name, tuple(sorted(labels.items()))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    def observe(self, name, value, **labels):
+        """Add value to histogram."""
+        key = name, tuple(sorted(labels.items()))
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram(self.buckets)
+            histogram.observe(value)
+
+    def clear(self):
+        """Remove all collected values."""
+        with self._lock:
+            self.counters.clear()
+            self.histograms.clear()
+
+    def snapshot(self):
+        """Return dictionary with current values, ready for JSON encoding.
+
+        Returns
+        -------
+        dict
+            lists of counters and histograms with their names, labels and
+            values
+        """
+        with self._lock:
+            counters = [{'name': name, 'labels': dict(labels), 'value': value}
+                        for (name, labels), value
+                        in sorted(self.counters.items())]
+            histograms = [
+                {'name': name, 'labels': dict(labels),
+                 'buckets': list(histogram.buckets),
+                 'counts': list(histogram.counts), 'sum': histogram.sum,
+                 'count': histogram.count}
+                for (name, labels), histogram
+                in sorted(self.histograms.items())]
+        return {'counters': counters, 'histograms': histograms}
+
+    def to_json(self):
+        """Return snapshot encoded as JSON text."""
+        return dumps(self.snapshot(), indent=2)
+
+    def to_prometheus(self):
+        """Return current values in Prometheus text format."""
+        lines, typed = [], set()
+        with self._lock:
+            for (name, labels), value in sorted(self.counters.items()):
+                name = f'{self.prefix}_{name}'
+                if name not in typed:
+                    typed.add(name)
+                    lines.append(f'# TYPE {name} counter')
+                lines.append(f'{name}{_labels(labels)} {value}')
+            for (name, labels), histogram in sorted(self.histograms.items()):
+                name = f'{self.prefix}_{name}'
+                if name not in typed:
+                    typed.add(name)
+                    lines.append(f'# TYPE {name} histogram')
+                for bound, count in histogram.cumulative():
+                    bound = '+Inf' if bound == float('inf') else repr(bound)
+                    lines.append(f'{name}_bucket'
+                                 f'{_labels(labels + (("le", bound),))} '
+                                 f'{count}')
+                lines.append(f'{name}_sum{_labels(labels)} {histogram.sum}')
+                lines.append(f'{name}_count{_labels(labels)} '
+                             f'{histogram.count}')
+        return '\n'.join(lines) + '\n'
+
+    def export(self, path):
+        """Write values to file, JSON when path ends with '.json'.
+
+        Other files get Prometheus text format, e.g. for node exporter
+        textfile collector. File is replaced at once, so reader never sees
+        partially written content.
+
+        Parameters
+        ----------
+        path : str
+            path of written file
+        """
+        text = self.to_json() if path.endswith('.json') else (
+            self.to_prometheus())
+        temporary = f'{path}.tmp'
+        with open(temporary, 'w', encoding='utf-8') as output:
+            output.write(text)
+        os.replace(temporary, path)
+
+
+def _labels(pairs):
+    """Return labels in Prometheus format or empty string."""
+    if not pairs:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"')
+               .replace('\n', '\\n') for _, value in pairs)
+    return '{' + ','.join(f'{key}="{value}"' for (key, _), value
+                          in zip(pairs, escaped)) + '}'
@@ -0,0 +1,97 @@
+"""#### Picture
+
+Module with `prepare` function which makes book cover small before it is
+uploaded. Photos taken with phone have several megabytes, while cover viewed
+in browser needs only fraction of it. Image is rotated according to its EXIF
+orientation, scaled down to fit `MAX_SIZE`, stripped of metadata and encoded
+as progressive JPEG or WebP with `QUALITY`. Result is kept in memory, no
+temporary files are written. Modules used: `io` and `PIL`.
+
+
+#### License
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+from io import BytesIO
+
+import PIL.Image
+import PIL.ImageOps
+
+MAX_SIZE = (800, 1200)
+"""Maximum width and height of prepared image in pixels."""
+
+QUALITY = 80
+"""Quality of encoded image from 1 to 100."""
+
+FORMATS = {'JPEG': ('jpg', 'image/jpeg'), 'WEBP': ('webp', 'image/webp')}
+"""Supported formats mapped to file extension and media type."""
+
+
+def prepare(source, max_size=MAX_SIZE, quality=QUALITY, image_format='JPEG'):
+    """Return image scaled down and encoded in memory.
+
+    Image smaller than `max_size` keeps its dimensions. Transparent areas
+    are filled with white when format does not support them.
+
+    Parameters
+    ----------
+    source : str or file-like
+        path or opened binary file with image in any format read by `PIL`
+    max_size : tuple, optional
+        maximum width and height, default `MAX_SIZE`
+    quality : int, optional
+        quality of encoded image from 1 to 100, default `QUALITY`
+    image_format : str, optional
+        'JPEG' or 'WEBP', default 'JPEG'
+
+    Returns
+    -------
+    io.BytesIO
+        encoded image at its beginning, `name` attribute holds file name
+        with proper extension
+
+    Raises
+    ------
+    ValueError
+        when format is not supported
+    OSError
+        when image cannot be read, e.g. `PIL.UnidentifiedImageError`
+    """
+    image_format = image_format.upper()
+    if image_format not in FORMATS:
+        raise ValueError(f'Unsupported image format: {image_format}.')
+    with PIL.Image.open(source) as image:
+        image.draft('RGB', max_size)
+        image = PIL.ImageOps.exif_transpose(image)
+        image.thumbnail(max_size, PIL.Image.LANCZOS)
+        image = flatten(image, image_format == 'WEBP')
+    output = BytesIO()
+    if image_format == 'JPEG':
+        image.save(output, 'JPEG', quality=quality, optimize=True,
+                   progressive=True)
+    else:
+        image.save(output, 'WEBP', quality=quality, method=4)
+    output.name = 'cover.' + FORMATS[image_format][0]
+    output.seek(0)
+    return output
+
+
+def flatten(image, alpha):
+    """Return copy of image without metadata in RGB or RGBA mode."""
+    if image.mode in ('RGBA', 'LA') or 'transparency' in image.info:
+        image = image.convert('RGBA')
+        if not alpha:
+            background = PIL.Image.new('RGB', image.size, 'white')
+            background.paste(image, mask=image.getchannel('A'))
+            image = background
+    elif image.mode != 'RGB':
+        image = image.convert('RGB')
+    clean = PIL.Image.new(image.mode, image.size)
+    clean.paste(image)
+    return clean
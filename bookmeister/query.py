@@ -0,0 +1,215 @@
+"""#### Query
+
+Module with `Query` class which builds searches answered entirely by
+database. Besides exact values it supports ranges of numeric fields, case
+insensitive prefixes of text fields, sort order and maximum number of
+results, so only needed records are downloaded instead of filtering broad
+results in application. Query is passed to `Database.search` or
+`Database.iter_pages` in place of dictionary with parameters. Values placed
+in URL are escaped with `encode`, so characters like '&', '#' or '+' reach
+database unchanged. Modules used: `json`, `re` and `urllib`.
+
+Example:
+
+    Query().prefix('Author', 'tolk').between('Price', 10, 25.5).sort(
+        'Release', descending=True).limit(20)
+
+
+#### License
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+from json import dumps
+from re import escape
+from urllib.parse import quote
+
+from bookmeister.record import KEYS, NUMBER_FIELDS, TEXT_FIELDS
+
+RANGE_FIELDS = NUMBER_FIELDS + ('Price',)
+"""Numeric fields which can be searched by range."""
+
+
+def encode(value):
+    """Return value as JSON escaped to be placed in query part of URL."""
+    return quote(dumps(value), safe='')
+
+
+class Query:
+    """
+    Collect search conditions, sort order and maximum number of results.
+
+    Methods adding conditions return the same object, so calls can be
+    chained.
+
+    ...
+
+    Attributes
+    ----------
+    parameters : dict
+        names of fields and values or operators sent as `q` parameter
+    order : dict
+        names of fields and sort directions, 1 ascending and -1 descending
+    maximum : int or None
+        maximum number of results, None when all are needed
+    """
+
+    def __init__(self, parameters=None):
+        """Create query, optionally with exact values of fields.
+
+        Parameters
+        ----------
+        parameters : dict, optional
+            names of fields and values or operators, default None: no
+            conditions
+        """
+        self.parameters = dict(parameters or {})
+        self.order = {}
+        self.maximum = None
+
+    def __repr__(self):
+        """Return representation with all parts of query."""
+        return (f'Query({self.parameters!r}, order={self.order!r}, '
+                f'maximum={self.maximum!r})')
+
+    def __eq__(self, other):
+        """Compare queries by all their parts."""
+        if not isinstance(other, Query):
+            return NotImplemented
+        return (self.parameters == other.parameters
+                and list(self.order.items()) == list(other.order.items())
+                and self.maximum == other.maximum)
+
+    @property
+    def plain(self):
+        """Return True when query has no sort order and maximum."""
+        return not self.order and self.maximum is None
+
+    def equal(self, field, value):
+        """Match records which field has exactly passed value."""
+        self.parameters[field] = value
+        return self
+
+    def between(self, field, minimum=None, maximum=None):
+        """Match records which numeric field is within inclusive range.
+
+        Parameters
+        ----------
+        field : str
+            one of `RANGE_FIELDS`
+        minimum : int, float or str, optional
+            the lowest accepted value, default None: no lower bound
+        maximum : int, float or str, optional
+            the highest accepted value, default None: no upper bound
+
+        Raises
+        ------
+        ValueError
+            when field cannot be searched by range, bound is not a number,
+            both bounds are missing or minimum is greater than maximum
+        """
+        if field not in RANGE_FIELDS:
+            raise ValueError(f'Field "{field}" cannot be searched by range.')
+        cast = float if field == 'Price' else int
+        bounds = {}
+        for operator, value in (('$gte', minimum), ('$lte', maximum)):
+            if value is not None:
+                try:
+                    bounds[operator] = cast(value)
+                except (TypeError, ValueError):
+                    raise ValueError(f'Range of field "{field}" needs '
+                                     f'numbers.')
+        if not bounds:
+            raise ValueError(f'Range of field "{field}" needs minimum or '
+                             f'maximum.')
+        if len(bounds) == 2 and bounds['$gte'] > bounds['$lte']:
+            raise ValueError(f'Minimum of field "{field}" is greater than '
+                             f'maximum.')
+        self.parameters[field] = bounds
+        return self
+
+    def prefix(self, field, text):
+        """Match records which text field starts with text, ignoring case.
+
+        Raises
+        ------
+        ValueError
+            when field is not one of `TEXT_FIELDS` or text is empty
+        """
+        if field not in TEXT_FIELDS:
+            raise ValueError(f'Field "{field}" cannot be searched by prefix.')
+        if not text:
+            raise ValueError(f'Prefix of field "{field}" cannot be empty.')
+        self.parameters[field] = {'$regex': f'^{escape(text)}',
+                                  '$options': 'i'}
+        return self
+
+    def sort(self, field, descending=False):
+        """Sort results by field, next calls add less important fields.
+
+        Raises
+        ------
+        ValueError
+            when field is not known record key
+        """
+        if field not in KEYS:
+            raise ValueError(f'Records cannot be sorted by "{field}".')
+        self.order.pop(field, None)
+        self.order[field] = -1 if descending else 1
+        return self
+
+    def limit(self, count):
+        """Return at most count records.
+
+        Raises
+        ------
+        ValueError
+            when count is not positive integer
+        """
+        if isinstance(count, bool) or not isinstance(count, int) or (
+                count < 1):
+            raise ValueError('Limit must be positive integer.')
+        self.maximum = count
+        return self
+
+    def url(self, fields=None, skip=0, count=None):
+        """Return query part of URL sending this query to database.
+
+        Parameters
+        ----------
+        fields : iterable, optional
+            names of fields included in records besides '_id', default
+            None: all fields
+        skip : int, optional
+            number of matching records which are omitted, default 0
+        count : int, optional
+            size of requested page, default None: whole result. Records of
+            pages are additionally sorted by id, so pages do not overlap
+
+        Returns
+        -------
+        str
+            `q` parameter with optional `h`, `skip` and `max` ones
+        """
+        hints = {}
+        order = dict(self.order)
+        if count is not None:
+            order.setdefault('_id', 1)
+        if order:
+            hints['$orderby'] = order
+        if fields is not None:
+            hints['$fields'] = {field: 1 for field in fields}
+        text = f'?q={encode(self.parameters)}'
+        if hints:
+            text += f'&h={encode(hints)}'
+        if skip:
+            text += f'&skip={skip}'
+        sizes = [size for size in (count, self.maximum) if size is not None]
+        if sizes:
+            text += f'&max={min(sizes)}'
+        return text
@@ -7,6 +7,9 @@ proper validation function with expected database key. All database fields are
 added to `FIELDS`. `datetime` module is used to acquire current year during
 validation.
 
+Large collections of records can be kept in `BookRecord` objects, which use
+slots instead of dictionary.
+
 
 #### License
 THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
@@ -22,6 +25,19 @@ from datetime import datetime
 
 FIELDS = ('Title', 'Author', 'Type', 'Publisher', 'ISBN', 'Release',
           'Language', 'Pages', 'Quantity', 'Price', 'Discount')
+TEXT_FIELDS = ('Title', 'Author', 'Type', 'Publisher')
+NUMBER_FIELDS = ('Release', 'Pages', 'Quantity', 'Discount')
+KEYS = ('_id',) + FIELDS + ('Hardcover', 'Cover', '_changed')
+_SLOTS = frozenset(KEYS)
+
+
+def number_range(key):
+    """Return minimum and maximum value accepted for integer field."""
+    if key == 'Release':
+        return 1800, datetime.now().year + 1
+    if key == 'Discount':
+        return 0, 99
+    return 0, 9999
 
 
 def check_length(text, minimum=1, maximum=100):
@@ -159,15 +175,10 @@ class Record(dict):
     @staticmethod
     def check(key, value):
         """Map functions which check field value with expected key."""
-        if key in ('Title', 'Author', 'Type', 'Publisher'):
+        if key in TEXT_FIELDS:
             check_length(value)
-        elif key in ('Release', 'Pages', 'Quantity', 'Discount'):
-            args = []
-            if key == 'Release':
-                args.extend((1800, datetime.now().year + 1))
-            if key == 'Discount':
-                args.extend((0, 99))
-            check_number(value, *args)
+        elif key in NUMBER_FIELDS:
+            check_number(value, *number_range(key))
         else:
             {'ISBN': check_isbn,
              'Language': check_lang_code,
@@ -185,3 +196,146 @@ class Record(dict):
                 self[field] = int(self[field])
             except (KeyError, ValueError):
                 pass
+
+    def changes(self, original):
+        """Return values which differ from original record.
+
+        Parameters
+        ----------
+        original : dict or BookRecord or None
+            values of record stored in database, None when they are unknown
+
+        Returns
+        -------
+        dict
+            names of changed fields and their new values, all of them when
+            original is None
+
+        Raises
+        ------
+        ValueError
+            when original is `BookRecord` downloaded with some fields only,
+            so changes cannot be trusted
+        """
+        if original is None:
+            return dict(self)
+        if getattr(original, 'partial', False):
+            raise ValueError('Original record was downloaded partially.')
+        return {key: value for key, value in self.items()
+                if key not in original or original[key] != value}
+
+
+class BookRecord:
+    """
+    Store record in compact object with slots instead of dictionary.
+
+    It is meant for large collections of records, e.g. search results,
+    where it needs several times less memory than `Record`. Fields from
+    `KEYS` are kept in slots, other ones in `extra` dictionary created only
+    when needed. Values set with `record[key] = value` are validated and
+    `cast` works the same as in `Record`. Creating object from dictionary
+    does not validate values, like creating `Record` from it.
+
+    ...
+
+    Attributes
+    ----------
+    extra : dict or None
+        fields which are not in `KEYS`, None when there are no such fields
+    partial : bool
+        True when record was downloaded with some of its fields only
+    """
+
+    __slots__ = KEYS + ('extra', 'partial')
+
+    check = staticmethod(Record.check)
+    cast = Record.cast
+    __hash__ = None
+
+    def __init__(self, data=None, partial=False):
+        """Copy values from dictionary received from database.
+
+        Parameters
+        ----------
+        data : dict, optional
+            names of fields and their values, default None: empty record
+        partial : bool, optional
+            True when data has only some fields of record, default False
+        """
+        self.extra = None
+        self.partial = partial
+        for key, value in (data or {}).items():
+            self._set(key, value)
+
+    def __getitem__(self, key):
+        """Return value of field or raise KeyError when it is not set."""
+        try:
+            if key in _SLOTS:
+                return getattr(self, key)
+            if self.extra is not None:
+                return self.extra[key]
+        except AttributeError:
+            pass
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        """Set value of field, validate it when key is in `FIELDS`."""
+        if key in FIELDS and isinstance(value, str):
+            self.check(key, value)
+        self._set(key, value)
+
+    def __contains__(self, key):
+        """Check if field is set."""
+        try:
+            self[key]
+        except KeyError:
+            return False
+        return True
+
+    def __iter__(self):
+        """Iterate over names of set fields."""
+        return iter(self.keys())
+
+    def __len__(self):
+        """Return number of set fields."""
+        return len(self.keys())
+
+    def __eq__(self, other):
+        """Compare fields with other record or dictionary."""
+        if isinstance(other, (BookRecord, dict)):
+            return self.to_dict() == dict(other)
+        return NotImplemented
+
+    def __repr__(self):
+        """Return representation with values of set fields."""
+        return f'{type(self).__name__}({self.to_dict()!r})'
+
+    def get(self, key, default=None):
+        """Return value of field or `default` when it is not set."""
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self):
+        """Return list with names of set fields."""
+        keys = [key for key in KEYS if hasattr(self, key)]
+        if self.extra is not None:
+            keys.extend(self.extra)
+        return keys
+
+    def to_dict(self):
+        """Return dictionary with all set fields, e.g. to send to database."""
+        data = {key: getattr(self, key) for key in KEYS if hasattr(self, key)}
+        if self.extra is not None:
+            data.update(self.extra)
+        return data
+
+    def _set(self, key, value):
+        """Store value in slot or in `extra` dictionary."""
+        if key in _SLOTS:
+            setattr(self, key, value)
+        elif self.extra is None:
+            self.extra = {key: value}
+        else:
+            self.extra[key] = value
@@ -0,0 +1,214 @@
+"""#### Replica
+
+Module with `Replica` class which keeps local copy of books collection in
+SQLite database. First synchronization downloads all records, next ones only
+records changed since the newest change already stored. Records removed by
+other users are found only during full synchronization. ISBN, Title, Author
+and id are stored in indexed columns, whole records as JSON text. Assigned to
+`bookmeister.connection.Database.replica` it answers searches locally.
+Modules used: `json`, `sqlite3` and `threading`.
+
+
+#### License
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+from json import dumps, loads
+import sqlite3
+from threading import Lock
+
+COLUMNS = {'_id': 'id', 'ISBN': 'isbn', 'Title': 'title', 'Author': 'author'}
+"""Record fields stored in indexed columns mapped to names of columns."""
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS books (
+    id TEXT PRIMARY KEY,
+    isbn INTEGER,
+    title TEXT,
+    author TEXT,
+    changed TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS books_isbn ON books (isbn);
+CREATE INDEX IF NOT EXISTS books_title ON books (title);
+CREATE INDEX IF NOT EXISTS books_author ON books (author);
+CREATE TABLE IF NOT EXISTS sync (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+'''
+
+
+class Replica:
+    """
+    Store copy of books collection in SQLite database.
+
+    All methods are thread safe.
+
+    ...
+
+    Attributes
+    ----------
+    connection : sqlite3.Connection
+        connection with local database
+    """
+
+    def __init__(self, path=':memory:'):
+        """Open local database and create its tables when needed.
+
+        Parameters
+        ----------
+        path : str, optional
+            database file path, default ':memory:': keep it in memory only
+        """
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.executescript(SCHEMA)
+        self._lock = Lock()
+
+    def __len__(self):
+        """Return number of stored records."""
+        with self._lock:
+            return self.connection.execute(
+                'SELECT COUNT(*) FROM books').fetchone()[0]
+
+    @property
+    def last_change(self):
+        """Return time of the newest stored change or None before sync."""
+        with self._lock:
+            row = self.connection.execute(
+                "SELECT value FROM sync WHERE key = 'changed'").fetchone()
+        return row[0] if row else None
+
+    def sync(self, database, full=False, page_size=500):
+        """Download records changed since last synchronization.
+
+        Pages are saved as soon as they are received, so local searches are
+        not blocked while waiting for database. Changes are committed when
+        all pages are downloaded.
+
+        Parameters
+        ----------
+        database : Database
+            object used to download records
+        full : bool, optional
+            when True download all records and remove ones which are not in
+            database anymore, default False: full synchronization is done
+            only when replica is empty
+        page_size : int, optional
+            number of records downloaded in one request, default 500
+
+        Returns
+        -------
+        int
+            number of downloaded records
+
+        Raises
+        ------
+        requests.exceptions.RequestException
+            when connection error occurs or database responds with error
+            status, stored records are not changed
+        ValueError
+            when page is not JSON list of records, stored records are not
+            changed
+        """
+        last_change = None if full else self.last_change
+        parameters = {}
+        if last_change is not None:
+            parameters = {'_changed': {'$gte': {'$date': last_change}}}
+        received = 0
+        newest = last_change or ''
+        try:
+            with self._lock:
+                self.connection.execute(
+                    'CREATE TEMP TABLE IF NOT EXISTS seen (id TEXT)')
+                self.connection.execute('DELETE FROM seen')
+            for page in database.iter_pages(parameters, page_size):
+                with self._lock:
+                    self._store(page)
+                    self.connection.executemany(
+                        'INSERT INTO seen VALUES (?)',
+                        ((record['_id'],) for record in page))
+                received += len(page)
+                newest = max([newest] + [record.get('_changed') or ''
+                                         for record in page])
+            with self._lock, self.connection:
+                if last_change is None:
+                    self.connection.execute(
+                        'DELETE FROM books WHERE id NOT IN '
+                        '(SELECT id FROM seen)')
+                self.connection.execute(
+                    "INSERT OR REPLACE INTO sync VALUES ('changed', ?)",
+                    (newest or None,))
+        except Exception:
+            with self._lock:
+                self.connection.rollback()
+            raise
+        return received
+
+    def store(self, records):
+        """Save records added or updated by this application.
+
+        Time of their change is not used as start of next synchronization,
+        so changes made by other users in meantime are not skipped.
+        """
+        with self._lock, self.connection:
+            self._store(records)
+
+    def remove(self, record_id):
+        """Remove record deleted by this application."""
+        with self._lock, self.connection:
+            self.connection.execute('DELETE FROM books WHERE id = ?',
+                                    (record_id,))
+
+    def search(self, parameters):
+        """Find records matching `parameters` in local database.
+
+        Indexed fields are compared by SQLite, other ones after decoding
+        records.
+
+        Parameters
+        ----------
+        parameters : dict
+            dictionary with names of fields and values which will be searched
+
+        Returns
+        -------
+        list
+            list with records matching criteria
+        None
+            when replica was not synchronized yet or parameters contain query
+            operators which can be answered only by database
+        """
+        if self.last_change is None or any(
+                isinstance(value, (dict, list))
+                for value in parameters.values()):
+            return None
+        indexed = [(COLUMNS[key], value) for key, value in parameters.items()
+                   if key in COLUMNS]
+        other = {key: value for key, value in parameters.items()
+                 if key not in COLUMNS}
+        query = 'SELECT data FROM books'
+        if indexed:
+            query += ' WHERE ' + ' AND '.join(
+                f'{column} = ?' for column, _ in indexed)
+        with self._lock:
+            rows = self.connection.execute(
+                query + ' ORDER BY id', [value for _, value in indexed])
+            records = [loads(data) for data, in rows]
+        return [record for record in records
+                if all(record.get(key) == value
+                       for key, value in other.items())]
+
+    def _store(self, records):
+        """Insert or replace records, lock must be held by caller."""
+        self.connection.executemany(
+            'INSERT OR REPLACE INTO books VALUES (?, ?, ?, ?, ?, ?)',
+            ((record['_id'], record.get('ISBN'), record.get('Title'),
+              record.get('Author'), record.get('_changed'), dumps(record))
+             for record in records))
@@ -0,0 +1,311 @@
+"""#### Uploader
+
+Module with functions necessary to attach many covers at once. Images are
+taken from directory where each file is named after ISBN number of its book,
+e.g. `9780340425626.jpg`. They are verified and prepared with
+`bookmeister.picture.prepare` in separate processes, so all processor cores
+are used, then uploaded by limited number of threads. Records are found with
+one search for many ISBN numbers. Progress is saved in state file after each
+batch, so interrupted run can be started again and finished covers are not
+sent twice. Modules used: `argparse`, `concurrent.futures`, `io`, `json`,
+`os`, `pathlib`, `sys` and `time`.
+
+Use `$ bookmeister-covers covers/` or
+`$ python -m bookmeister.uploader covers/` to run it from terminal.
+
+
+#### License
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from io import BytesIO
+from json import dump, load
+import os
+from pathlib import Path
+import sys
+from time import perf_counter
+
+import PIL.Image
+
+from bookmeister.connection import Database
+from bookmeister.picture import prepare
+from bookmeister.record import check_isbn
+
+SUFFIXES = frozenset(('.jpg', '.jpeg', '.png', '.webp', '.gif', '.bmp',
+                      '.tif', '.tiff'))
+"""Extensions of files recognized as images."""
+
+STATE = '.bookmeister-covers.json'
+"""Name of state file saved in directory with images by default."""
+
+
+def find_images(directory):
+    """Return images named after correct ISBN numbers.
+
+    Dashes and spaces in names are ignored, e.g. `978-0-340-42562-6.png`.
+
+    Parameters
+    ----------
+    directory : str or pathlib.Path
+        directory with images
+
+    Returns
+    -------
+    dict
+        ISBN numbers as text mapped to paths of images
+    list
+        paths of images which names are not correct ISBN numbers
+    """
+    images, unknown = {}, []
+    for path in sorted(Path(directory).iterdir()):
+        if not path.is_file() or path.suffix.lower() not in SUFFIXES:
+            continue
+        isbn = path.stem.replace('-', '').replace(' ', '')
+        try:
+            check_isbn(isbn)
+        except ValueError:
+            unknown.append(path)
+            continue
+        images[isbn] = path
+    return images, unknown
+
+
+def prepare_file(path):
+    """Return prepared image content or None when file is not valid image.
+
+    Called in separate process, so it gets path and returns bytes.
+    """
+    try:
+        return prepare(path).getvalue()
+    except (OSError, ValueError, PIL.Image.DecompressionBombError):
+        return None
+
+
+def resolve(database, isbns, chunk_size=100):
+    """Find ids of records with passed ISBN numbers.
+
+    One search with `$in` operator is sent for each `chunk_size` numbers,
+    only 'ISBN' field of found records is downloaded.
+
+    Parameters
+    ----------
+    database : Database
+        object used to search records
+    isbns : iterable
+        ISBN numbers as text
+    chunk_size : int, optional
+        number of ISBN numbers searched in one request, default 100
+
+    Returns
+    -------
+    dict
+        ISBN numbers as text mapped to record ids, numbers without record
+        are skipped
+    None
+        when connection error occurs
+    """
+    isbns = sorted(isbns)
+    ids = {}
+    for start in range(0, len(isbns), chunk_size):
+        chunk = [int(isbn) for isbn in isbns[start:start + chunk_size]]
+        records = database.search({'ISBN': {'$in': chunk}}, ('ISBN',))
+        if not isinstance(records, list):
+            return None
+        for record in records:
+            if isinstance(record, dict) and '_id' in record:
+                ids[str(record.get('ISBN'))] = record['_id']
+    return ids
+
+
+def load_state(path):
+    """Return saved state or empty one when file does not exist."""
+    try:
+        with open(path, encoding='utf-8') as source:
+            state = load(source)
+    except (OSError, ValueError):
+        state = {}
+    return {'uploaded': state.get('uploaded', {}),
+            'done': set(state.get('done', []))}
+
+
+def save_state(path, state):
+    """Write state to file, replace previous one at once."""
+    temporary = f'{path}.tmp'
+    with open(temporary, 'w', encoding='utf-8') as output:
+        dump({'uploaded': state['uploaded'],
+              'done': sorted(state['done'])}, output)
+    os.replace(temporary, path)
+
+
+def attach(database, record_id, data, image_id=None):
+    """Upload image if it was not uploaded yet and assign it to record.
+
+    Parameters
+    ----------
+    database : Database
+        object used to send requests
+    record_id : str
+        key of record which cover is changed
+    data : bytes or None
+        prepared image, not needed when `image_id` is passed
+    image_id : str, optional
+        id of image uploaded in previous run, default None: upload data
+
+    Returns
+    -------
+    tuple
+        id of uploaded image or None and True when record was updated else
+        False
+    """
+    if image_id is None:
+        picture = BytesIO(data)
+        picture.name = 'cover.jpg'
+        image_id = database.upload_image(picture)
+        if image_id is None:
+            return None, False
+    return image_id, database.update(record_id, {'Cover': image_id})
+
+
+def upload_covers(directory, database=None, processes=None, threads=4,
+                  batch_size=50, state_path=None, progress=None,
+                  errors=sys.stderr):
+    """Prepare, upload and assign covers from directory.
+
+    Images are handled in batches of `batch_size`. Each batch is prepared in
+    process pool, every prepared image is passed at once to thread pool
+    which uploads it and updates record. Images uploaded in previous run
+    are not prepared again, only assigned to their records. State is saved
+    when whole batch is finished.
+
+    Parameters
+    ----------
+    directory : str or pathlib.Path
+        directory with images named after ISBN numbers
+    database : Database, optional
+        object used to send requests, default None: create new one
+    processes : int, optional
+        number of processes preparing images, default None: number of
+        processors, 0 prepares them in current process
+    threads : int, optional
+        number of threads sending requests, default 4
+    batch_size : int, optional
+        number of images handled before state is saved, default 50
+    state_path : str, optional
+        file where progress is saved, default `STATE` in directory
+    progress : callable, optional
+        called with number of handled and all images after each batch
+    errors : file, optional
+        stream where images which could not be attached are reported
+
+    Returns
+    -------
+    tuple
+        number of attached and number of failed images
+    """
+    database = database or Database()
+    state_path = state_path or os.path.join(directory, STATE)
+    state = load_state(state_path)
+    images, unknown = find_images(directory)
+    for path in unknown:
+        print(f'{path.name}: name is not correct ISBN-13 number.',
+              file=errors)
+    pending = {isbn: path for isbn, path in images.items()
+               if isbn not in state['done']}
+    ids = resolve(database, pending)
+    if ids is None:
+        print('Could not search records in database.', file=errors)
+        return 0, len(unknown) + len(pending)
+    failed = len(unknown)
+    for isbn in sorted(pending.keys() - ids.keys()):
+        print(f'{pending.pop(isbn).name}: no record with this ISBN number.',
+              file=errors)
+        failed += 1
+    attached, handled, total = 0, 0, len(pending)
+    isbns = sorted(pending)
+    prepared_in = ProcessPoolExecutor(processes) if processes != 0 else None
+    with ThreadPoolExecutor(threads) as sender:
+        try:
+            for start in range(0, total, batch_size):
+                batch = isbns[start:start + batch_size]
+                paths = [pending[isbn] for isbn in batch
+                         if isbn not in state['uploaded']]
+                prepared = iter(prepared_in.map(prepare_file, paths)
+                                if prepared_in else map(prepare_file, paths))
+                tasks = []
+                for isbn in batch:
+                    image_id = state['uploaded'].get(isbn)
+                    data = next(prepared) if image_id is None else None
+                    if image_id is None and data is None:
+                        print(f'{pending[isbn].name}: wrong image file '
+                              f'format.', file=errors)
+                        failed += 1
+                        continue
+                    tasks.append((isbn, sender.submit(
+                        attach, database, ids[isbn], data, image_id)))
+                for isbn, task in tasks:
+                    image_id, updated = task.result()
+                    if image_id is not None:
+                        state['uploaded'][isbn] = image_id
+                    if updated:
+                        state['done'].add(isbn)
+                        attached += 1
+                    else:
+                        print(f'{pending[isbn].name}: could not save cover '
+                              f'to database.', file=errors)
+                        failed += 1
+                save_state(state_path, state)
+                handled += len(batch)
+                if progress is not None:
+                    progress(handled, total)
+        finally:
+            if prepared_in is not None:
+                prepared_in.shutdown()
+    return attached, failed
+
+
+def main(arguments=None):
+    """Attach covers from directory passed in command line arguments.
+
+    Returns
+    -------
+    int
+        exit code, 0 when every image was attached else 1
+    """
+    parser = ArgumentParser(description='Attach covers from directory of '
+                                        'images named after ISBN numbers.')
+    parser.add_argument('directory', help='directory with images')
+    parser.add_argument('--processes', type=int,
+                        help='number of processes preparing images')
+    parser.add_argument('--threads', type=int, default=4,
+                        help='number of threads sending requests')
+    parser.add_argument('--batch-size', type=int, default=50,
+                        help='number of images handled before progress is '
+                             'saved')
+    parser.add_argument('--state', help='file where progress is saved')
+    options = parser.parse_args(arguments)
+
+    def progress(handled, total):
+        print(f'\r{handled}/{total} images', end='', file=sys.stderr,
+              flush=True)
+
+    start = perf_counter()
+    attached, failed = upload_covers(
+        options.directory, processes=options.processes,
+        threads=options.threads, batch_size=options.batch_size,
+        state_path=options.state, progress=progress)
+    print(file=sys.stderr)
+    print(f'Attached {attached} covers, {failed} failed in '
+          f'{perf_counter() - start:.1f} s.')
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,10 +1,14 @@
-from sys import platform
+from sys import argv, platform
 from pathlib import Path
 from PyInstaller import __main__ as Install
 
+# Directory build starts faster, one file is unpacked to temporary directory
+# on every launch. Use `$ python build.py --onefile` to get single file.
+mode = '--onefile' if '--onefile' in argv[1:] else '--onedir'
+
 Install.run([
     '--name=Bookmeister',
-    '--onefile',
+    mode,
     '--windowed',
     f'--add-data={Path("bookmeister/bookmeister.png")}{";" if platform == "win32" else ":"}.',
     f'--icon={Path("data/bookmeister.ico")}',
@@ -42,5 +42,11 @@ setup(
         'gui_scripts': [
             'bookmeister = bookmeister.__main__:main'
         ],
+        'console_scripts': [
+            'bookmeister-cli = bookmeister.cli:main',
+            'bookmeister-import = bookmeister.importer:main',
+            'bookmeister-covers = bookmeister.uploader:main',
+            'bookmeister-export = bookmeister.exporter:main',
+        ],
     },
 )
@@ -0,0 +1,76 @@
+import asyncio
+from time import sleep
+import pytest
+
+from bookmeister.aio import AsyncDatabase
+
+
+@pytest.mark.parametrize('method,args,value', (
+        ('add', ({'Publisher': 'Tester'},), True),
+        ('search', ({'Publisher': 'Tester'},), [{'Publisher': 'Tester'}]),
+        ('search', ({'Publisher': 'Tester'}, ('Title',)), [{'Title': 'T'}]),
+        ('fetch', ('5eb00ffce332cd260015d67c',), {'Title': 'Test me'}),
+        ('update', ('5eb00ffce332cd260015d67c', {'Type': 'Tested'}), True),
+        ('delete', ('5eb00ffce332cd260015d67c',), True),
+        ('upload_image', ('/home/user',), '5fc00c0d'),
+))
+def test_database_action(method, args, value, mocker):
+    mocked = mocker.patch(f'bookmeister.connection.Database.{method}')
+    mocked.return_value = value
+    database = AsyncDatabase()
+    assert asyncio.run(getattr(database, method)(*args)) == value
+    mocked.assert_called_once_with(*args)
+    database.close()
+
+
+@pytest.mark.parametrize('method,args,expected', (
+        ('add', ({'Publisher': 'Tester'},), False),
+        ('search', ({'Publisher': 'Tester'},), None),
+        ('fetch', ('5eb00ffce332cd260015d67c',), None),
+        ('update', ('5eb00ffce332cd260015d67c', {'Type': 'Tested'}), False),
+        ('delete', ('5eb00ffce332cd260015d67c',), False),
+        ('upload_image', ('/home/user',), None),
+))
+def test_timeout(method, args, expected, mocker):
+    mocked = mocker.patch(f'bookmeister.connection.Database.{method}')
+    mocked.side_effect = lambda *_: sleep(0.2)
+    database = AsyncDatabase(timeout=0.01)
+    assert asyncio.run(getattr(database, method)(*args)) is expected
+    database.close()
+
+
+def test_concurrency_limit(mocker):
+    running = []
+    peak = []
+
+    def search(_):
+        running.append(1)
+        peak.append(len(running))
+        sleep(0.01)
+        running.pop()
+        return []
+
+    mocker.patch('bookmeister.connection.Database.search', side_effect=search)
+
+    async def fan_out():
+        async with AsyncDatabase(concurrency=3) as database:
+            return await asyncio.gather(
+                *(database.search({'Pages': i}) for i in range(30)))
+
+    assert asyncio.run(fan_out()) == [[]] * 30
+    assert max(peak) <= 3
+
+
+def test_cancel(mocker):
+    mocker.patch('bookmeister.connection.Database.search',
+                 side_effect=lambda _: sleep(0.2))
+
+    async def cancelled():
+        async with AsyncDatabase() as database:
+            task = asyncio.ensure_future(database.search({}))
+            await asyncio.sleep(0.01)
+            task.cancel()
+            await task
+
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(cancelled())
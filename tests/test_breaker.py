@@ -0,0 +1,65 @@
+import pytest
+
+from bookmeister import breaker
+
+
+@pytest.fixture
+def circuit():
+    return breaker.CircuitBreaker(threshold=3, reset_after=30)
+
+
+def open_circuit(circuit, mocker, now=100):
+    mocker.patch('bookmeister.breaker.monotonic', return_value=now)
+    for _ in range(circuit.threshold):
+        circuit.failure()
+
+
+def test_closed_allows_requests(circuit):
+    circuit.failure()
+    circuit.failure()
+    assert circuit.state == breaker.CLOSED
+    assert circuit.allow()
+
+
+def test_success_resets_failures(circuit):
+    circuit.failure()
+    circuit.failure()
+    circuit.success()
+    circuit.failure()
+    assert circuit.state == breaker.CLOSED
+    assert circuit.failures == 1
+
+
+def test_opened_after_threshold(circuit, mocker):
+    open_circuit(circuit, mocker)
+    assert circuit.state == breaker.OPEN
+    assert not circuit.allow()
+    assert circuit.rejected == 1
+
+
+def test_single_trial_after_reset_time(circuit, mocker):
+    open_circuit(circuit, mocker)
+    mocker.patch('bookmeister.breaker.monotonic', return_value=130)
+    assert circuit.state == breaker.HALF_OPEN
+    assert circuit.allow()
+    assert not circuit.allow()
+    assert circuit.state == breaker.HALF_OPEN
+
+
+def test_trial_success_closes(circuit, mocker):
+    open_circuit(circuit, mocker)
+    mocker.patch('bookmeister.breaker.monotonic', return_value=130)
+    circuit.allow()
+    circuit.success()
+    assert circuit.state == breaker.CLOSED
+    assert circuit.allow()
+
+
+def test_trial_failure_opens_again(circuit, mocker):
+    open_circuit(circuit, mocker)
+    mocker.patch('bookmeister.breaker.monotonic', return_value=130)
+    circuit.allow()
+    circuit.failure()
+    assert circuit.state == breaker.OPEN
+    assert circuit.opened == 130
+    assert not circuit.allow()
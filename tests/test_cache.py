@@ -0,0 +1,109 @@
+import pytest
+
+from bookmeister import cache
+
+RESULT = '[{"_id": "5eb00ffce332cd260015d67c", "Title": "Test me"}]'
+RECORDS = [{'_id': '5eb00ffce332cd260015d67c', 'Title': 'Test me'}]
+
+
+@pytest.fixture
+def tested():
+    search_cache = cache.SearchCache()
+    search_cache.put({'Title': 'Test me', 'Type': 'Test'}, RESULT, RECORDS)
+    return search_cache
+
+
+@pytest.mark.parametrize('parameters,values,expected', (
+        ({'Title': 'Test me'}, {'Title': 'Test me', 'Pages': 10}, True),
+        ({}, {'Title': 'Test me'}, True),
+        ({'Price': {'$gt': 10}}, {'Title': 'Test me'}, True),
+        ({'Title': 'Test me'}, {'Title': 'Tested'}, False),
+        ({'Title': 'Test me'}, {'Pages': 10}, False),
+))
+def test_might_match(parameters, values, expected):
+    assert cache.might_match(parameters, values) == expected
+
+
+def test_key_includes_fields():
+    key = cache.SearchCache.key
+    assert key({'Title': 'Test me'}) != key({'Title': 'Test me'}, ['ISBN'])
+    assert key({'Title': 'Test me'}, ('Title', 'ISBN')) == key(
+        {'Title': 'Test me'}, ['ISBN', 'Title'])
+
+
+def test_fields_stored_separately(tested):
+    assert tested.get({'Title': 'Test me', 'Type': 'Test'}, ['ISBN']) is None
+    tested.put({'Title': 'Test me', 'Type': 'Test'}, '[]', [],
+               fields=['ISBN'])
+    assert tested.get({'Title': 'Test me', 'Type': 'Test'}, ['ISBN']) == '[]'
+    assert tested.get({'Title': 'Test me', 'Type': 'Test'}) == RESULT
+
+
+def test_hit_regardless_of_keys_order(tested):
+    assert tested.get({'Type': 'Test', 'Title': 'Test me'}) == RESULT
+    assert tested.stats()['hits'] == 1
+
+
+def test_miss(tested):
+    assert tested.get({'Title': 'Test'}) is None
+    assert tested.stats()['misses'] == 1
+
+
+def test_expired(tested, mocker):
+    mocker.patch('bookmeister.cache.monotonic', return_value=10 ** 9)
+    assert tested.get({'Title': 'Test me', 'Type': 'Test'}) is None
+    assert len(tested) == 0
+
+
+def test_least_recently_used_evicted():
+    tested = cache.SearchCache(max_entries=2)
+    for pages in range(3):
+        tested.put({'Pages': pages}, '[]', [])
+        tested.get({'Pages': 0})
+    assert tested.get({'Pages': 0}) == '[]'
+    assert tested.get({'Pages': 1}) is None
+    assert tested.stats()['evictions'] == 1
+
+
+def test_bytes_limit():
+    tested = cache.SearchCache(max_bytes=len(RESULT) + 1)
+    tested.put({'Pages': 1}, RESULT, RECORDS)
+    tested.put({'Pages': 2}, '[]', [])
+    assert len(tested) == 1
+    assert tested.size == 2
+    tested.put({'Pages': 3}, RESULT * 2, RECORDS)
+    assert tested.get({'Pages': 3}) is None
+
+
+def test_stale_result_not_stored(tested):
+    generation = tested.generation
+    tested.invalidate_added({'Title': 'Tested'})
+    tested.put({'Pages': 1}, '[]', [], generation)
+    assert tested.get({'Pages': 1}) is None
+
+
+@pytest.mark.parametrize('values,expected', (
+        ({'Title': 'Test me', 'Type': 'Test', 'Pages': 10}, 0),
+        ({'Title': 'Test me', 'Type': 'Novel'}, 1),
+))
+def test_invalidate_added(tested, values, expected):
+    tested.invalidate_added(values)
+    assert len(tested) == expected
+
+
+@pytest.mark.parametrize('record_id,values,expected', (
+        ('5eb00ffce332cd260015d67c', None, 0),
+        ('5eb00ffce332cd260015d67c', {'Pages': 10}, 0),
+        ('5eb00ffce3', None, 1),
+        ('5eb00ffce3', {'Pages': 10}, 1),
+        ('5eb00ffce3', {'Title': 'Tested'}, 1),
+        ('5eb00ffce3', {'Title': 'Test me'}, 0),
+))
+def test_invalidate_changed(tested, record_id, values, expected):
+    tested.invalidate_changed(record_id, values)
+    assert len(tested) == expected
+
+
+def test_clear(tested):
+    tested.clear()
+    assert tested.stats()['entries'] == tested.stats()['bytes'] == 0
@@ -0,0 +1,224 @@
+from io import StringIO
+from json import dumps, loads
+import subprocess
+import sys
+import pytest
+from requests.exceptions import ConnectionError
+
+from bookmeister import cli
+
+RECORD = {
+    'Title': 'Test me',
+    'Author': 'Mr Test',
+    'Type': 'Test',
+    'Publisher': 'Tester',
+    'ISBN': '9780340425626',
+    'Release': '2020',
+    'Language': 'EN',
+    'Pages': '999',
+    'Quantity': '123',
+    'Price': '5.75',
+    'Discount': '5',
+    'Hardcover': 'false',
+}
+
+RECORD_ID = '5eb00ffce332cd260015d67c'
+
+
+def run(arguments, lines=()):
+    output = StringIO()
+    code = cli.main(arguments, StringIO(''.join(f'{line}\n'
+                                                for line in lines)), output)
+    return code, [loads(line) for line in output.getvalue().splitlines()]
+
+
+def test_import_without_gui():
+    code = ('import sys, bookmeister.cli; '
+            'print(sorted({"tkinter", "PIL", "bookmeister.gui"} '
+            '& set(sys.modules)))')
+    result = subprocess.run([sys.executable, '-c', code], check=True,
+                            capture_output=True, text=True)
+    assert result.stdout.strip() == '[]'
+
+
+def test_parse_pairs():
+    assert cli.parse_pairs(['Title=Test=me', ' Price =5.70']) == {
+        'Title': 'Test=me', 'Price': '5.70'}
+
+
+@pytest.mark.parametrize('text', ('Title', '=Test me'))
+def test_parse_pairs_error(text):
+    with pytest.raises(ValueError, match='Field=value'):
+        cli.parse_pairs([text])
+
+
+def test_read_objects():
+    rows = list(cli.read_objects(['{"Title": "Test me"}\n', '\n', '[1]\n',
+                                  '{"Title"\n']))
+    assert rows[0] == (1, {'Title': 'Test me'})
+    assert [number for number, _ in rows] == [1, 3, 4]
+    assert all(isinstance(row, ValueError) for _, row in rows[1:])
+
+
+@pytest.fixture
+def search(mocker):
+    return mocker.patch('bookmeister.connection.Database.search',
+                        return_value=[])
+
+
+def test_add_arguments(search, mocker):
+    mocked = mocker.patch('bookmeister.connection.Database.add_many')
+    mocked.return_value = [True]
+    code, results = run(['add'] + [f'{key}={value}'
+                                   for key, value in RECORD.items()])
+    assert code == 0
+    assert results == [{'line': None, 'ISBN': 9780340425626, 'added': True}]
+    assert mocked.call_args[0][0][0]['Price'] == 5.75
+
+
+def test_add_stdin_batches(search, mocker):
+    mocked = mocker.patch('bookmeister.connection.Database.add_many')
+    mocked.side_effect = lambda records, _: [True] * len(records)
+    lines = [dumps(dict(RECORD, ISBN=isbn)) for isbn in (
+        '9780340425626', '9780340425619', '9780340425602')] + [
+        dumps(dict(RECORD, Price='5.7.5')), '{"Title"']
+    code, results = run(['--batch-size', '2', 'add'], lines)
+    assert code == 1
+    assert mocked.call_count == search.call_count == 2
+    assert [result['line'] for result in results] == [1, 2, 4, 5, 3]
+    assert [result['added'] for result in results] == [True] * 2 + [
+        False] * 2 + [True]
+    assert 'Price' in results[2]['error']
+
+
+def test_add_existing_and_repeated(search, mocker):
+    mocked = mocker.patch('bookmeister.connection.Database.add_many')
+    mocked.side_effect = lambda records, _: [True] * len(records)
+    search.return_value = [{'_id': RECORD_ID, 'ISBN': 9780340425619}]
+    lines = [dumps(dict(RECORD, ISBN=isbn)) for isbn in (
+        '9780340425626', '9780340425619', '9780340425626')]
+    code, results = run(['add'], lines)
+    assert code == 1
+    assert len(mocked.call_args[0][0]) == 1
+    assert [result['line'] for result in results] == [3, 2, 1]
+    assert 'repeated' in results[0]['error']
+    assert 'already exists' in results[1]['error']
+
+
+def test_search(mocker):
+    mocked = mocker.patch('bookmeister.connection.Database.iter_pages')
+    mocked.return_value = iter([[{'_id': '1'}, {'_id': '2'}], [{'_id': '3'}]])
+    code, results = run(['search', 'Release=2020', 'Price={"$lt": 10}',
+                         '--fields', 'Title, ISBN'])
+    assert code == 0
+    mocked.assert_called_once_with(
+        cli.Query({'Release': 2020, 'Price': {'$lt': 10}}), 100,
+        ['Title', 'ISBN'])
+    assert results == [{'_id': '1'}, {'_id': '2'}, {'_id': '3'}]
+
+
+def test_search_query(mocker):
+    mocked = mocker.patch('bookmeister.connection.Database.iter_pages')
+    mocked.return_value = iter([])
+    assert run(['--batch-size', '10', 'search', 'Type=Test',
+                '--prefix', 'Author=mr t', '--range', 'Price=..20',
+                '--range', 'Release=2000..', '--sort', 'Release:desc',
+                '--sort', 'Title', '--limit', '5']) == (0, [])
+    query = cli.Query({'Type': 'Test'}).prefix('Author', 'mr t').between(
+        'Price', None, 20).between('Release', 2000).sort(
+        'Release', True).sort('Title').limit(5)
+    mocked.assert_called_once_with(query, 10, None)
+
+
+@pytest.mark.parametrize('arguments', (
+        ['--range', 'Price=10'],
+        ['--range', 'Title=a..b'],
+        ['--prefix', 'ISBN=978'],
+        ['--sort', 'Price:up'],
+        ['--limit', '0'],
+))
+def test_search_wrong_query(arguments, mocker):
+    mocked = mocker.patch('bookmeister.connection.Database.iter_pages')
+    with pytest.raises(SystemExit):
+        run(['search'] + arguments)
+    mocked.assert_not_called()
+
+
+def test_search_connection_error(mocker, capsys):
+    mocker.patch('bookmeister.connection.Database.iter_pages',
+                 side_effect=ConnectionError)
+    assert run(['search'])[0] == 1
+    assert 'Could not download' in capsys.readouterr().err
+
+
+def test_update_arguments(mocker):
+    mocked = mocker.patch('bookmeister.connection.Database.update')
+    mocked.return_value = True
+    code, results = run(['update', RECORD_ID, 'Price=12.50',
+                         'Hardcover=yes'])
+    assert code == 0
+    mocked.assert_called_once_with(RECORD_ID, {'Price': 12.5,
+                                               'Hardcover': True})
+    assert results == [{'line': None, '_id': RECORD_ID, 'updated': True}]
+
+
+def test_update_stdin(mocker):
+    mocked = mocker.patch('bookmeister.connection.Database.update')
+    mocked.return_value = True
+    lines = [dumps({'_id': RECORD_ID, 'Pages': '100'}),
+             dumps({'_id': RECORD_ID, 'Pages': '-1'}),
+             dumps({'Pages': '100'})]
+    code, results = run(['update'], lines)
+    assert code == 1
+    mocked.assert_called_once_with(RECORD_ID, {'Pages': 100})
+    assert [result['updated'] for result in results] == [True, False, False]
+    assert 'Pages' in results[1]['error']
+    assert '"_id"' in results[2]['error']
+
+
+def test_delete(mocker):
+    mocked = mocker.patch('bookmeister.connection.Database.delete_many')
+    mocked.side_effect = lambda ids: [record_id != '2' for record_id in ids]
+    code, results = run(['--batch-size', '2', 'delete'], ['1', '', '2', '3'])
+    assert code == 1
+    assert mocked.call_args_list == [mocker.call(['1', '2']),
+                                     mocker.call(['3'])]
+    assert results == [{'_id': '1', 'deleted': True},
+                       {'_id': '2', 'deleted': False},
+                       {'_id': '3', 'deleted': True}]
+
+
+def test_upload_cover(mocker):
+    mocker.patch('bookmeister.picture.prepare')
+    upload = mocker.patch('bookmeister.connection.Database.upload_image')
+    upload.return_value = '5fc00c0d'
+    update = mocker.patch('bookmeister.connection.Database.update')
+    update.return_value = True
+    code, results = run(['upload-cover', RECORD_ID, 'cover.jpg'])
+    assert code == 0
+    update.assert_called_once_with(RECORD_ID, {'Cover': '5fc00c0d'})
+    assert results[0]['Cover'] == '5fc00c0d'
+
+
+def test_upload_cover_stdin_errors(mocker):
+    mocker.patch('bookmeister.picture.prepare', side_effect=OSError('Broken'))
+    upload = mocker.patch('bookmeister.connection.Database.upload_image')
+    code, results = run(['upload-cover'], [
+        dumps({'_id': RECORD_ID, 'path': 'cover.jpg'}),
+        dumps({'_id': RECORD_ID})])
+    assert code == 1
+    upload.assert_not_called()
+    assert [result['error'] for result in results] == [
+        'Broken', 'Line needs "_id" and "path".']
+
+
+@pytest.mark.parametrize('arguments', (
+        [],
+        ['update', RECORD_ID],
+        ['upload-cover', RECORD_ID],
+        ['add', 'Title'],
+        ['search', 'Title'],
+))
+def test_main_wrong_arguments(arguments):
+    with pytest.raises(SystemExit):
+        run(arguments)
@@ -1,8 +1,18 @@
+from io import BytesIO
 from json import loads
 import pytest
-from requests.exceptions import ConnectionError
+from requests.exceptions import ConnectionError, HTTPError, Timeout
+from unittest.mock import MagicMock
+from urllib.parse import unquote
 
+from bookmeister import connection
+from bookmeister.breaker import CircuitBreaker
+from bookmeister.cache import SearchCache
 from bookmeister.connection import Database
+from bookmeister.covers import CoverCache
+from bookmeister.metrics import Metrics
+from bookmeister.query import Query
+from bookmeister.replica import Replica
 
 
 @pytest.fixture(params=(
@@ -11,17 +21,53 @@ from bookmeister.connection import Database
         ('delete', ('5eb00ffce332cd260015d67c',)),
 ))
 def database(value, request, mocker):
-    mocked = mocker.patch('requests.request')
+    mocked = mocker.patch('requests.Session.request')
     mocked.return_value.text = value
     return getattr(Database(), request.param[0])(*request.param[1])
 
 
+def test_session_is_shared():
+    session = connection.configure_session()
+    assert connection.get_session() is session
+    assert connection.get_session() is connection.get_session()
+
+
+def test_session_created_on_first_use(mocker):
+    mocker.patch.object(connection, '_session', None)
+    session = connection.get_session()
+    assert session is connection.get_session()
+
+
+def test_session_replaced_by_configuration(mocker):
+    previous = connection.get_session()
+    mocked = mocker.patch.object(previous, 'close')
+    session = connection.configure_session(pool_maxsize=2, keep_alive=False)
+    mocked.assert_called_once()
+    assert session.headers['Connection'] == 'close'
+    assert session.get_adapter('https://test')._pool_maxsize == 2
+    connection.configure_session()
+
+
+def test_request_uses_shared_session(mocker):
+    mocked = mocker.patch('requests.Session.request')
+    database = Database()
+    database.request('GET', database.collection)
+    mocked.assert_called_once_with('GET', database.url + database.collection,
+                                   headers=database.headers,
+                                   timeout=Database.timeout)
+
+
 def test_initialization():
     database = Database()
     assert isinstance(database.url, str)
     assert isinstance(database.headers, dict)
 
 
+def test_initialization_uses_class_url(mocker):
+    mocker.patch.object(Database, 'URL', 'http://127.0.0.1:8000')
+    assert Database().url == 'http://127.0.0.1:8000'
+
+
 @pytest.mark.parametrize('value,expected', (
         ('[{"_id": "5eb00ffce332cd260015d67c"}]', True),
         ('', False),
@@ -38,11 +84,47 @@ def test_database_action(value, expected, database):
         '[]',
 ))
 def test_database_search(value, mocker):
-    mocked = mocker.patch('requests.request')
+    mocked = mocker.patch('requests.Session.request')
     mocked.return_value.text = value
     assert Database().search({'Publisher': 'Tester'}) == loads(value)
 
 
+def test_projection():
+    assert connection.projection(None) == ''
+    assert unquote(connection.projection(('ISBN', 'Title'))) == (
+        '&h={"$fields": {"ISBN": 1, "Title": 1}}')
+
+
+def test_database_search_fields(mocker):
+    mocked = mocker.patch('requests.Session.request')
+    mocked.return_value.text = '[{"_id": "1", "Title": "Test me."}]'
+    assert Database().search({'Publisher': 'Tester'}, ('Title',)) == [
+        {'_id': '1', 'Title': 'Test me.'}]
+    assert unquote(mocked.call_args[0][1]).endswith(
+        '?q={"Publisher": "Tester"}&h={"$fields": {"Title": 1}}')
+
+
+@pytest.mark.parametrize('value,expected', (
+        ('{"_id": "5eb00ffce332cd260015d67c", "Title": "Test me"}',
+         {'_id': '5eb00ffce332cd260015d67c', 'Title': 'Test me'}),
+        ('{"_id": "5eb00ffce332"}', None),
+        ('[]', None),
+        ('Response 404', None),
+))
+def test_database_fetch(value, expected, mocker):
+    mocked = mocker.patch('requests.Session.request')
+    mocked.return_value.text = value
+    assert Database().fetch('5eb00ffce332cd260015d67c') == expected
+    assert mocked.call_args[0] == (
+        'GET', Database.URL + '/rest/books/5eb00ffce332cd260015d67c')
+
+
+def test_database_fetch_no_connection(mocker):
+    mocker.patch('bookmeister.connection.sleep')
+    mocker.patch('requests.Session.request', side_effect=ConnectionError)
+    assert Database().fetch('5eb00ffce332cd260015d67c') is None
+
+
 @pytest.mark.parametrize('method,args', (
         ('add', ({'Publisher': 'Tester'},)),
         ('search', ({'Title': 'Test me.', 'Type': 'Test'},)),
@@ -50,7 +132,8 @@ def test_database_search(value, mocker):
         ('delete', ('5eb00ffce332cd260015d67c',)),
 ))
 def test_no_connection(method, args, mocker):
-    mocked = mocker.patch('requests.request')
+    mocker.patch('bookmeister.connection.sleep')
+    mocked = mocker.patch('requests.Session.request')
     mocked.side_effect = ConnectionError
     assert not getattr(Database(), method)(*args)
 
@@ -62,7 +145,524 @@ def test_no_connection(method, args, mocker):
 ))
 def test_database_upload_image(message, result, mocker):
     mocker.patch('builtins.open')
-    mocked = mocker.patch('requests.request')
+    mocked = mocker.patch('requests.Session.request')
     mocked.return_value.text = message
     assert Database().upload_image('/home/user') == result
 
+
+@pytest.mark.parametrize('method,args', (
+        ('delete_many', ()),
+        ('update_many', ({'Price': 12.5},)),
+))
+def test_database_many(method, args, mocker):
+    ids = [f'5eb00ffce332cd260015d6{number:02}' for number in range(10)]
+
+    def respond(_, url, **kwargs):
+        record_id = url.rsplit('/', 1)[1]
+        text = f'{{"_id": "{record_id}"}}'
+        if record_id == ids[3]:
+            text = 'Not found'
+        return MagicMock(text=text, status_code=200)
+
+    mocked = mocker.patch('requests.Session.request', side_effect=respond)
+    results = getattr(Database(), method)(ids, *args, workers=3)
+    assert results == [number != 3 for number in range(10)]
+    assert mocked.call_count == 10
+    if args:
+        assert all(call[1]['data'] == '{"Price": 12.5}'
+                   for call in mocked.call_args_list)
+
+
+def test_database_many_empty(mocker):
+    mocked = mocker.patch('requests.Session.request')
+    assert Database().delete_many([]) == []
+    assert Database().update_many(iter([]), {'Price': 12.5}) == []
+    mocked.assert_not_called()
+
+
+def test_database_upload_file_object(mocker):
+    mocked = mocker.patch('requests.Session.request')
+    mocked.return_value.text = '{"ids":["5fc00c0d"]}'
+    picture = BytesIO(b'image')
+    assert Database().upload_image(picture) == '5fc00c0d'
+    assert mocked.call_args[1]['files'] == {'image': picture}
+    assert not picture.closed
+
+
+def test_database_upload_stores_cover(mocker, tmp_path):
+    mocker.patch.object(Database, 'covers', CoverCache(tmp_path))
+    mocked = mocker.patch('requests.Session.request')
+    mocked.return_value.text = '{"ids":["5fc00c0d"]}'
+    Database().upload_image(BytesIO(b'image'))
+    assert Database.covers.get('5fc00c0d') == b'image'
+
+
+def test_database_download_image(mocker, tmp_path):
+    mocker.patch.object(Database, 'covers', CoverCache(tmp_path))
+    mocked = mocker.patch('requests.Session.request')
+    mocked.return_value.status_code = 200
+    mocked.return_value.content = b'image'
+    assert Database().download_image('5fc00c0d') == b'image'
+    assert Database().download_image('5fc00c0d') == b'image'
+    mocked.assert_called_once()
+    assert mocked.call_args[0] == (
+        'GET', Database.URL + '/media/5fc00c0d')
+
+
+@pytest.mark.parametrize('status,content', ((404, b'Not found'), (200, b'')))
+def test_database_download_missing_image(status, content, mocker):
+    mocked = mocker.patch('requests.Session.request')
+    mocked.return_value.status_code = status
+    mocked.return_value.content = content
+    assert Database().download_image('5fc00c0d') is None
+
+
+def test_database_download_image_no_connection(mocker):
+    mocker.patch('bookmeister.connection.sleep')
+    mocked = mocker.patch('requests.Session.request')
+    mocked.side_effect = ConnectionError
+    assert Database().download_image('5fc00c0d') is None
+
+
+
+@pytest.mark.parametrize('value,expected', (
+        ('[{"_id": "5eb00ffce332cd260015d67c"}, {"_id": "5eb00ffce332"}]',
+         [True, True]),
+        ('[{"_id": "5eb00ffce332cd260015d67c"}]', [False, False]),
+        ('{"_id": "5eb00ffce332cd260015d67c"}', [False, False]),
+        ('Response 500', [False, False]),
+))
+def test_database_add_many(value, expected, mocker):
+    mocked = mocker.patch('requests.Session.request')
+    mocked.return_value.text = value
+    records = [{'Publisher': 'Tester'}, {'Publisher': 'Tested'}]
+    assert Database().add_many(records) == expected
+    assert loads(mocked.call_args[1]['data']) == records
+
+
+def test_database_add_many_in_batches(mocker):
+    mocked = mocker.patch('requests.Session.request')
+    mocked.side_effect = lambda *_, data, **__: mocker.Mock(
+        text=data.replace('"Pages"', '"_id"'))
+    records = ({'Pages': number} for number in range(5))
+    assert Database().add_many(records, batch_size=2) == [True] * 5
+    assert mocked.call_count == 3
+
+
+def test_database_add_many_no_connection(mocker):
+    mocked = mocker.patch('requests.Session.request')
+    mocked.side_effect = ConnectionError
+    assert Database().add_many([{'Publisher': 'Tester'}]) == [False]
+
+
+def test_database_iter_search(mocker):
+    pages = ('[{"_id": "1"}, {"_id": "2"}]', '[{"_id": "3"}, {"_id": "4"}]',
+             '[{"_id": "5"}]')
+    mocked = mocker.patch('requests.Session.request')
+    mocked.side_effect = [mocker.Mock(text=page) for page in pages]
+    records = Database().iter_search({'Publisher': 'Tester'}, page_size=2)
+    assert next(records) == {'_id': '1'}
+    assert mocked.call_count == 1
+    assert [record['_id'] for record in records] == ['2', '3', '4', '5']
+    assert mocked.call_count == 3
+    assert mocked.call_args[0][1].endswith('&sort=_id&skip=4&max=2')
+
+
+def test_database_iter_pages_fields(mocker):
+    mocked = mocker.patch('requests.Session.request')
+    mocked.return_value.text = '[{"_id": "1", "ISBN": 1}]'
+    assert list(Database().iter_pages({}, 2, ('ISBN',))) == [
+        [{'_id': '1', 'ISBN': 1}]]
+    assert unquote(mocked.call_args[0][1]).endswith(
+        '&max=2&h={"$fields": {"ISBN": 1}}')
+
+
+def test_database_iter_pages_last_page_full(mocker):
+    pages = ('[{"_id": "1"}, {"_id": "2"}]', '[]')
+    mocked = mocker.patch('requests.Session.request')
+    mocked.side_effect = [mocker.Mock(text=page) for page in pages]
+    pages = list(Database().iter_pages({'Publisher': 'Tester'}, page_size=2))
+    assert pages == [[{'_id': '1'}, {'_id': '2'}]]
+
+
+def test_database_iter_pages_error_status(mocker):
+    pages = ('[{"_id": "1"}, {"_id": "2"}]', '{"message": "Bad query"}')
+    mocked = mocker.patch('requests.Session.request')
+    responses = [MagicMock(text=page, status_code=status)
+                 for page, status in zip(pages, (200, 400))]
+    responses[1].raise_for_status.side_effect = HTTPError
+    mocked.side_effect = responses
+    pages = Database().iter_pages({}, page_size=2)
+    assert next(pages) == [{'_id': '1'}, {'_id': '2'}]
+    with pytest.raises(HTTPError):
+        next(pages)
+
+
+def test_database_iter_search_not_list(mocker):
+    pages = ('[{"_id": "1"}, {"_id": "2"}]', '{"message": "Bad query"}')
+    mocked = mocker.patch('requests.Session.request')
+    mocked.side_effect = [mocker.Mock(text=page) for page in pages]
+    records = Database().iter_search({}, page_size=2)
+    with pytest.raises(ValueError, match='not a list'):
+        list(records)
+
+
+def test_database_search_query(mocker):
+    mocker.patch.object(Database, 'cache', SearchCache())
+    mocked = mocker.patch('requests.Session.request')
+    mocked.return_value.text = '[{"_id": "1", "Price": 12.5}]'
+    query = Query().between('Price', 10, 20).sort('Price').limit(1)
+    for _ in range(2):
+        assert Database().search(query, ('Price',)) == [
+            {'_id': '1', 'Price': 12.5}]
+    assert mocked.call_count == 2
+    assert mocked.call_args[0][1].endswith(query.url(('Price',)))
+
+
+def test_database_search_plain_query(cached):
+    assert Database().search(Query({'Publisher': 'Tester'})) == [
+        {'_id': '5eb00ffce332cd260015d67c'}]
+    assert cached.call_count == 1
+
+
+def test_database_iter_pages_query(mocker):
+    pages = ('[{"_id": "1"}, {"_id": "2"}]', '[{"_id": "3"}]')
+    mocked = mocker.patch('requests.Session.request')
+    mocked.side_effect = [mocker.Mock(text=page) for page in pages]
+    query = Query().sort('Price', True).limit(3)
+    assert list(Database().iter_search(query, page_size=2)) == [
+        {'_id': '1'}, {'_id': '2'}, {'_id': '3'}]
+    assert [unquote(call[0][1]).rsplit('&', 2)[1:]
+            for call in mocked.call_args_list
+            ] == [['h={"$orderby": {"Price": -1, "_id": 1}}', 'max=2'],
+                  ['skip=2', 'max=1']]
+
+
+def test_database_iter_pages_query_limit_reached(mocker):
+    mocked = mocker.patch('requests.Session.request')
+    mocked.return_value.text = '[{"_id": "1"}, {"_id": "2"}]'
+    assert len(list(Database().iter_search(Query().limit(4), 2))) == 4
+    assert mocked.call_count == 2
+
+
+def test_database_iter_search_no_connection(mocker):
+    mocked = mocker.patch('requests.Session.request')
+    mocked.side_effect = ConnectionError
+    with pytest.raises(ConnectionError):
+        list(Database().iter_search({'Publisher': 'Tester'}))
+
+
+@pytest.fixture
+def cached(mocker):
+    search_cache = SearchCache()
+    mocker.patch.object(Database, 'cache', search_cache)
+    mocked = mocker.patch('requests.Session.request')
+    mocked.return_value.text = '[{"_id": "5eb00ffce332cd260015d67c"}]'
+    Database().search({'Publisher': 'Tester'})
+    return mocked
+
+
+def test_database_search_cached(cached):
+    assert Database().search({'Publisher': 'Tester'}) == [
+        {'_id': '5eb00ffce332cd260015d67c'}]
+    assert cached.call_count == 1
+    assert Database.cache.stats()['hits'] == 1
+
+
+def test_database_search_cached_by_fields(cached):
+    Database().search({'Publisher': 'Tester'}, ('Title',))
+    Database().search({'Publisher': 'Tester'}, ['Title'])
+    assert cached.call_count == 2
+
+
+@pytest.mark.parametrize('method,args', (
+        ('add', ({'Publisher': 'Tester'},)),
+        ('add_many', ([{'Publisher': 'Tester'}],)),
+        ('update', ('5eb00ffce332cd260015d67c', {'Type': 'Tested'})),
+        ('delete', ('5eb00ffce332cd260015d67c',)),
+))
+def test_database_change_invalidates_cache(method, args, cached):
+    getattr(Database(), method)(*args)
+    Database().search({'Publisher': 'Tester'})
+    assert cached.call_count == 3
+
+
+@pytest.fixture
+def replica(mocker):
+    local = Replica()
+    local.store([{'_id': '5eb00ffce332cd260015d67c', 'Title': 'Test me'}])
+    local.connection.execute("INSERT INTO sync VALUES ('changed', '2020')")
+    mocker.patch.object(Database, 'replica', local)
+    return local
+
+
+def test_database_search_replica(replica, mocker):
+    mocked = mocker.patch('requests.Session.request')
+    assert Database().search({'Title': 'Test me'}) == [
+        {'_id': '5eb00ffce332cd260015d67c', 'Title': 'Test me'}]
+    mocked.assert_not_called()
+
+
+@pytest.mark.parametrize('method,args,value,expected', (
+        ('add', ({'Title': 'Test me'},), '{"_id": "1", "Title": "Test me"}',
+         2),
+        ('add_many', ([{'Title': 'Test me'}],),
+         '[{"_id": "1", "Title": "Test me"}]', 2),
+        ('update', ('5eb00ffce332cd260015d67c', {'Title': 'Tested'}),
+         '{"_id": "5eb00ffce332cd260015d67c", "Title": "Tested"}', 0),
+        ('delete', ('5eb00ffce332cd260015d67c',),
+         '{"result": ["5eb00ffce332cd260015d67c"]}', 0),
+))
+def test_database_change_updates_replica(method, args, value, expected,
+                                         replica, mocker):
+    mocked = mocker.patch('requests.Session.request')
+    mocked.return_value.text = value
+    assert getattr(Database(), method)(*args)
+    assert len(replica.search({'Title': 'Test me'})) == expected
+
+
+@pytest.mark.parametrize('method,args', (
+        ('add', ({'ISBN': 9780340425626},)),
+        ('add_many', ([{'ISBN': 9780340425626}],)),
+))
+def test_database_add_remembers_isbn(method, args, mocker):
+    isbns = mocker.patch.object(Database, 'isbns')
+    mocked = mocker.patch('requests.Session.request')
+    mocked.return_value.text = '[{"_id": "5eb00ffce332cd260015d67c"}]'
+    getattr(Database(), method)(*args)
+    isbns.add.assert_called_once_with(9780340425626)
+
+
+def test_database_update_remembers_isbn(mocker):
+    isbns = mocker.patch.object(Database, 'isbns')
+    mocked = mocker.patch('requests.Session.request')
+    mocked.return_value.text = '{"_id": "5eb00ffce332cd260015d67c"}'
+    assert Database().update('5eb00ffce332cd260015d67c',
+                             {'ISBN': 9788324631766})
+    isbns.add.assert_called_once_with(9788324631766)
+
+
+def test_database_delete_forgets_isbn(mocker):
+    isbns = mocker.patch.object(Database, 'isbns')
+    mocked = mocker.patch('requests.Session.request')
+    mocked.return_value.text = '{"result": ["5eb00ffce332cd260015d67c"]}'
+    assert Database().delete('5eb00ffce332cd260015d67c', 9780340425626)
+    assert mocked.call_count == 1
+    isbns.discard.assert_called_once_with(9780340425626)
+
+
+def test_database_delete_finds_isbn(mocker):
+    isbns = mocker.patch.object(Database, 'isbns')
+    mocked = mocker.patch('requests.Session.request')
+    mocked.side_effect = [
+        MagicMock(text='[{"_id": "5eb00ffce332cd260015d67c", '
+                       '"ISBN": 9780340425626}]'),
+        MagicMock(text='{"result": ["5eb00ffce332cd260015d67c"]}')]
+    assert Database().delete('5eb00ffce332cd260015d67c')
+    assert unquote(mocked.call_args_list[0][0][1]).endswith(
+        '?q={"_id": "5eb00ffce332cd260015d67c"}&h={"$fields": {"ISBN": 1}}')
+    isbns.discard.assert_called_once_with(9780340425626)
+
+
+def test_database_delete_without_isbns(mocker):
+    mocked = mocker.patch('requests.Session.request')
+    mocked.return_value.text = '{"result": ["5eb00ffce332cd260015d67c"]}'
+    assert Database().delete('5eb00ffce332cd260015d67c')
+    assert mocked.call_count == 1
+
+
+@pytest.mark.parametrize('text', ('[]', 'Not found', '[{"_id": "1"}]'))
+def test_database_find_isbn_unknown(text, mocker):
+    mocked = mocker.patch('requests.Session.request')
+    mocked.return_value.text = text
+    assert Database().find_isbn('1') is None
+
+
+def test_database_delete_many_forgets_isbns(mocker):
+    isbns = mocker.patch.object(Database, 'isbns')
+    mocked = mocker.patch('requests.Session.request')
+    mocked.return_value.text = '{"result": ["1", "2"]}'
+    assert Database().delete_many(['1', '2'], isbns=[11, 12]) == [True, True]
+    assert sorted(call[0][0] for call in isbns.discard.call_args_list) == [
+        11, 12]
+
+
+@pytest.fixture
+def metrics(mocker):
+    registry = Metrics()
+    mocker.patch.object(Database, 'metrics', registry)
+    return registry
+
+
+def counters(registry):
+    return {(counter['name'], tuple(counter['labels'].values())):
+            counter['value'] for counter in registry.snapshot()['counters']}
+
+
+def test_metrics_record_operation_and_request(metrics, mocker):
+    mocked = mocker.patch('requests.Session.request')
+    mocked.return_value.text = '[]'
+    mocked.return_value.content = b'[]'
+    mocked.return_value.status_code = 200
+    mocked.return_value.elapsed.total_seconds.return_value = 0.25
+    mocked.return_value.request.headers = {}
+    assert Database().search({'Title': 'Test me'}) == []
+    assert counters(metrics) == {
+        ('operations_total', ('search', 'success')): 1,
+        ('received_bytes_total', ('GET', 'search')): 2,
+        ('requests_total', ('GET', 'search', '200')): 1,
+        ('sent_bytes_total', ('GET', 'search')): 0,
+    }
+    histograms = {histogram['name']: histogram
+                  for histogram in metrics.snapshot()['histograms']}
+    assert histograms['response_seconds']['sum'] == 0.25
+    assert histograms['request_seconds']['count'] == 1
+    assert histograms['operation_seconds']['labels'] == {
+        'operation': 'search', 'outcome': 'success'}
+
+
+def test_metrics_record_sent_bytes(metrics, mocker):
+    mocked = mocker.patch('requests.Session.request')
+    mocked.return_value.text = '{"_id": "1"}'
+    mocked.return_value.content = b'{"_id": "1"}'
+    mocked.return_value.status_code = 201
+    mocked.return_value.elapsed.total_seconds.return_value = 0.25
+    mocked.return_value.request.headers = {'Content-Length': '21'}
+    assert Database().add({'Title': 'Test me'})
+    assert counters(metrics)[('sent_bytes_total', ('POST', 'add'))] == 21
+
+
+def test_metrics_record_connection_error(metrics, mocker):
+    mocker.patch('bookmeister.connection.sleep')
+    mocker.patch('requests.Session.request', side_effect=ConnectionError)
+    assert not Database().delete('5eb00ffce332cd260015d67c')
+    assert counters(metrics) == {
+        ('operations_total', ('delete', 'failure')): 1,
+        ('requests_total', ('DELETE', 'delete', 'ConnectionError')): 3,
+        ('retries_total', ('DELETE', 'delete')): 2,
+    }
+
+
+def test_metrics_disabled(mocker):
+    mocked = mocker.patch('requests.Session.request')
+    mocked.return_value.text = '[]'
+    mocked.return_value.content = None
+    assert Database().search({'Title': 'Test me'}) == []
+
+
+def response(status=200, text='[]'):
+    return MagicMock(status_code=status, text=text)
+
+
+@pytest.mark.parametrize('timeout,remaining,expected', (
+        ((3.05, 20.0), 10, (3.05, 10)),
+        ((3.05, None), 2, (2, 2)),
+        (5, 2, 2),
+        (None, 2, 2),
+))
+def test_limit_timeout(timeout, remaining, expected):
+    assert connection.limit_timeout(timeout, remaining) == expected
+
+
+@pytest.mark.parametrize('method,calls', (
+        ('GET', 3),
+        ('DELETE', 3),
+        ('POST', 1),
+        ('PATCH', 1),
+))
+def test_request_retries_idempotent(method, calls, mocker):
+    mocked_sleep = mocker.patch('bookmeister.connection.sleep')
+    mocked = mocker.patch('requests.Session.request',
+                          side_effect=ConnectionError)
+    with pytest.raises(ConnectionError):
+        Database().request(method, '/rest/books')
+    assert mocked.call_count == calls
+    assert mocked_sleep.call_count == calls - 1
+    for attempt, call in enumerate(mocked_sleep.call_args_list):
+        assert 0 <= call[0][0] <= Database.backoff * 2 ** attempt
+
+
+def test_request_retries_server_error(mocker):
+    mocker.patch('bookmeister.connection.sleep')
+    mocked = mocker.patch('requests.Session.request', side_effect=[
+        response(503), response(502), response(200)])
+    assert Database().request('GET', '/rest/books').status_code == 200
+    assert mocked.call_count == 3
+
+
+def test_request_returns_last_server_error(mocker):
+    mocker.patch('bookmeister.connection.sleep')
+    mocker.patch('requests.Session.request', return_value=response(503))
+    assert Database().request('GET', '/rest/books').status_code == 503
+
+
+def test_request_timeout_limited_by_deadline(mocker):
+    mocker.patch('bookmeister.connection.monotonic', side_effect=[0, 25])
+    mocked = mocker.patch('requests.Session.request')
+    Database().request('GET', '/rest/books')
+    assert mocked.call_args[1]['timeout'] == (3.05, 5.0)
+
+
+def test_request_deadline_exceeded(mocker):
+    mocker.patch('bookmeister.connection.sleep')
+    mocker.patch('bookmeister.connection.monotonic',
+                 side_effect=[0, 1, 2, 31])
+    mocked = mocker.patch('requests.Session.request',
+                          side_effect=ConnectionError)
+    with pytest.raises(Timeout):
+        Database().request('GET', '/rest/books')
+    assert mocked.call_count == 1
+
+
+def test_request_without_deadline(mocker):
+    mocker.patch.object(Database, 'deadline', None)
+    mocked = mocker.patch('requests.Session.request')
+    Database().request('GET', '/rest/books', timeout=1)
+    assert mocked.call_args[1]['timeout'] == 1
+
+
+def test_timeout_returns_failure(mocker):
+    mocker.patch('bookmeister.connection.sleep')
+    mocker.patch('requests.Session.request', side_effect=Timeout)
+    assert Database().search({'Title': 'Test me'}) is None
+    assert Database().update('5eb00ffce332cd260015d67c', {}) is False
+
+
+def test_invalid_response_returns_failure(mocker):
+    mocker.patch('requests.Session.request',
+                 return_value=response(502, '<html>Bad gateway</html>'))
+    mocker.patch('bookmeister.connection.sleep')
+    assert Database().search({'Title': 'Test me'}) is None
+
+
+@pytest.fixture
+def breaker(mocker):
+    circuit = CircuitBreaker(threshold=2, reset_after=30)
+    mocker.patch.object(Database, 'breaker', circuit)
+    mocker.patch('bookmeister.connection.sleep')
+    return circuit
+
+
+def test_breaker_opens_and_fails_fast(breaker, mocker):
+    mocked = mocker.patch('requests.Session.request',
+                          side_effect=ConnectionError)
+    assert Database().search({'Title': 'Test me'}) is None
+    assert mocked.call_count == 2
+    assert breaker.state == 'open'
+    assert Database().add({'Title': 'Test me'}) is False
+    assert mocked.call_count == 2
+    assert breaker.rejected == 2
+
+
+def test_breaker_counts_server_errors(breaker, mocker):
+    mocker.patch('requests.Session.request', return_value=response(500))
+    Database().add({'Title': 'Test me'})
+    Database().add({'Title': 'Test me'})
+    assert breaker.state == 'open'
+
+
+def test_breaker_closed_by_success(breaker, mocker):
+    mocker.patch('requests.Session.request', side_effect=[
+        ConnectionError, response(404, '{}')])
+    Database().search({'Title': 'Test me'})
+    assert breaker.state == 'closed' and breaker.failures == 0
@@ -0,0 +1,79 @@
+import os
+
+import pytest
+
+from bookmeister import covers
+
+
+@pytest.fixture
+def tested(tmp_path):
+    return covers.CoverCache(tmp_path, max_bytes=10)
+
+
+def test_default_directory(mocker, tmp_path):
+    mocker.patch.dict('os.environ', {'XDG_CACHE_HOME': str(tmp_path)})
+    assert covers.default_directory() == tmp_path / 'bookmeister' / 'covers'
+
+
+def test_put_and_get(tested):
+    tested.put('5fc00c0d', b'cover')
+    assert '5fc00c0d' in tested
+    assert tested.get('5fc00c0d') == b'cover'
+    assert (tested.directory / '5fc00c0d').read_bytes() == b'cover'
+    assert (tested.hits, tested.misses, tested.size) == (1, 0, 5)
+
+
+def test_get_missing(tested):
+    assert tested.get('5fc00c0d') is None
+    assert tested.misses == 1
+
+
+def test_replace_keeps_size(tested):
+    tested.put('5fc00c0d', b'cover')
+    tested.put('5fc00c0d', b'new')
+    assert tested.size == 3
+    assert len(tested) == 1
+
+
+def test_least_recently_used_removed(tested):
+    tested.put('first', b'1234')
+    tested.put('second', b'1234')
+    tested.get('first')
+    tested.put('third', b'1234')
+    assert 'second' not in tested
+    assert not (tested.directory / 'second').exists()
+    assert tested.get('first') == b'1234'
+    assert tested.evictions == 1
+    assert tested.size == 8
+
+
+@pytest.mark.parametrize('media_id,data', (
+        ('../escape', b'cover'),
+        ('', b'cover'),
+        (None, b'cover'),
+        ('5fc00c0d', b'too large cover'),
+))
+def test_not_stored(tested, media_id, data):
+    tested.put(media_id, data)
+    assert len(tested) == 0
+    assert tested.size == 0
+
+
+def test_removed_file_is_forgotten(tested):
+    tested.put('5fc00c0d', b'cover')
+    (tested.directory / '5fc00c0d').unlink()
+    assert tested.get('5fc00c0d') is None
+    assert '5fc00c0d' not in tested
+    assert tested.size == 0
+
+
+def test_stored_covers_found_in_order_of_use(tmp_path):
+    for number, name in enumerate(('newer', 'older', 'oldest')):
+        (tmp_path / name).write_bytes(b'1234')
+        os.utime(tmp_path / name, (1000 - number, 1000 - number))
+    (tmp_path / '.newer.tmp').write_bytes(b'1234')
+    tested = covers.CoverCache(tmp_path, max_bytes=10)
+    assert len(tested) == 2
+    assert 'oldest' not in tested
+    assert not (tmp_path / 'oldest').exists()
+    assert tested.size == 8
@@ -137,6 +137,12 @@ class TestDatabase:
             assert result == []
 
 
+def run_in_foreground(menu):
+    menu.worker.run.side_effect = \
+        lambda operation, callback, *args: callback(operation(*args))
+    return menu
+
+
 @pytest.fixture
 def app(record, mocker):
     mocker.patch('bookmeister.gui.tk.Frame.__init__', return_value=None)
@@ -144,6 +150,7 @@ def app(record, mocker):
 
     mocked = mocker.Mock()
     mocked.form.get.return_value = record
+    run_in_foreground(mocked)
 
     return Buttons(mocked)
 
@@ -187,7 +194,7 @@ class TestDatabaseFromApp:
         title = 'Title successfully changed. Test passed.'
         record['Title'] = title
 
-        mocked = mocker.patch.object(app, 'menu')
+        mocked = run_in_foreground(mocker.patch.object(app, 'menu'))
         mocked.form.get.return_value = record
         mocked.search.box.get.return_value = result_spy.spy_return[0]['_id']
 
@@ -205,7 +212,7 @@ class TestDatabaseFromApp:
         result_spy = mocker.spy(Database, 'search')
         app.search()
 
-        mocked = mocker.patch.object(app, 'menu')
+        mocked = run_in_foreground(mocker.patch.object(app, 'menu'))
         mocked.search.box.get.return_value = result_spy.spy_return[0]['_id']
 
         mocked_window = mocker.patch('bookmeister.gui.msg.showinfo')
@@ -0,0 +1,120 @@
+import csv
+import gzip
+from json import loads
+import pytest
+from requests.exceptions import ConnectionError
+
+from bookmeister import exporter
+from bookmeister.connection import Database
+
+PAGES = (
+    [{'_id': '1', 'Title': 'Test me', 'ISBN': 9780340425626, 'Price': 5.75},
+     {'_id': '2', 'Title': 'Test, "me"\nagain', 'ISBN': 9780340425626}],
+    [{'_id': '3', 'Title': 'Last', 'Hardcover': True}],
+)
+
+
+@pytest.fixture
+def pages(mocker):
+    mocked = mocker.patch('bookmeister.connection.Database.iter_pages')
+    mocked.return_value = iter(PAGES)
+    return mocked
+
+
+def read(path):
+    with (gzip.open(path, 'rt', newline='', encoding='utf-8')
+          if path.endswith('.gz')
+          else open(path, newline='', encoding='utf-8')) as source:
+        if '.jsonl' in path:
+            return [loads(line) for line in source]
+        return list(csv.DictReader(source))
+
+
+@pytest.mark.parametrize('name', ('books.csv', 'books.csv.gz'))
+def test_export_file_csv(name, pages, tmp_path):
+    path = str(tmp_path / name)
+    fields = ('Title', 'ISBN', 'Price')
+    assert exporter.export_file(path, fields=fields, page_size=2) == 3
+    pages.assert_called_once_with({}, 2, fields)
+    assert read(path) == [
+        {'Title': 'Test me', 'ISBN': '9780340425626', 'Price': '5.75'},
+        {'Title': 'Test, "me"\nagain', 'ISBN': '9780340425626', 'Price': ''},
+        {'Title': 'Last', 'ISBN': '', 'Price': ''},
+    ]
+    assert list(tmp_path.iterdir()) == [tmp_path / name]
+
+
+@pytest.mark.parametrize('name', ('books.jsonl', 'books.jsonl.gz'))
+def test_export_file_jsonl(name, pages, tmp_path):
+    path = str(tmp_path / name)
+    calls = []
+    assert exporter.export_file(path, {'Price': {'$lt': 10}},
+                                progress=calls.append) == 3
+    pages.assert_called_once_with({'Price': {'$lt': 10}}, 100,
+                                  exporter.COLUMNS)
+    assert read(path) == [
+        {'Title': 'Test me', 'ISBN': 9780340425626, 'Price': 5.75},
+        {'Title': 'Test, "me"\nagain', 'ISBN': 9780340425626},
+        {'Title': 'Last', 'Hardcover': True},
+    ]
+    assert calls == [2, 3]
+
+
+def test_export_file_connection_error(tmp_path, mocker):
+    def broken(*_):
+        yield PAGES[0]
+        raise ConnectionError
+
+    mocker.patch('bookmeister.connection.Database.iter_pages', broken)
+    path = tmp_path / 'books.csv'
+    path.write_text('previous')
+    assert exporter.export_file(str(path), database=Database()) is None
+    assert path.read_text() == 'previous'
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_export_file_other_error(tmp_path, mocker):
+    mocked = mocker.patch('bookmeister.connection.Database.iter_pages')
+    mocked.return_value = iter([PAGES[0], ['message']])
+    path = tmp_path / 'books.csv'
+    with pytest.raises(AttributeError):
+        exporter.export_file(str(path), database=Database())
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.parametrize('text,expected', (
+        ('Author=Mr Test', ('Author', 'Mr Test')),
+        ('Release=2020', ('Release', 2020)),
+        (' Price ={"$lt": 10}', ('Price', {'$lt': 10})),
+        ('Title=', ('Title', '')),
+))
+def test_parse_filter(text, expected):
+    assert exporter.parse_filter(text) == expected
+
+
+@pytest.mark.parametrize('text', ('Author', '=Mr Test'))
+def test_parse_filter_error(text):
+    with pytest.raises(ValueError, match='Field=value'):
+        exporter.parse_filter(text)
+
+
+def test_main(tmp_path, mocker, capsys):
+    mocked = mocker.patch('bookmeister.exporter.export_file')
+    mocked.return_value = 3
+    path = str(tmp_path / 'books.csv')
+    assert exporter.main([path, '--fields', 'Title, ISBN', '--where',
+                          'Release=2020', '--page-size', '50']) == 0
+    mocked.assert_called_once_with(path, {'Release': 2020}, ['Title', 'ISBN'],
+                                   page_size=50, progress=mocker.ANY)
+    assert 'Exported 3 records' in capsys.readouterr().out
+
+
+def test_main_error(tmp_path, mocker, capsys):
+    mocker.patch('bookmeister.exporter.export_file', return_value=None)
+    assert exporter.main([str(tmp_path / 'books.csv')]) == 1
+    assert 'Could not download' in capsys.readouterr().err
+
+
+def test_main_wrong_filter(tmp_path):
+    with pytest.raises(SystemExit):
+        exporter.main([str(tmp_path / 'books.csv'), '--where', 'Release'])
@@ -65,9 +65,11 @@ def test_gui_init_frames(frame, mocker):
 def test_search_frame_init(mocker):
     mocked_label = mocker.patch('tkinter.Label')
     mocked_box = mocker.patch('bookmeister.gui.Searchbox')
+    mocked_live = mocker.patch('bookmeister.gui.LiveSearch')
     gui.Search(mocker.MagicMock())
     mocked_label.assert_called_once()
     mocked_box.assert_called_once()
+    mocked_live.assert_called_once()
 
 
 def test_searchbox_frame_init(mocker):
@@ -80,7 +82,9 @@ def test_searchbox_frame_init(mocker):
 
 def test_searchbox_assign_no_values(mocker):
     mocked = mocker.patch('tkinter.messagebox.showwarning')
-    gui.Searchbox.assign_values(mocker.MagicMock(), None)
+    mock = mocker.MagicMock()
+    mock.extend_values.side_effect = TypeError
+    gui.Searchbox.assign_values(mock, None)
     mocked.assert_called_once()
 
 
@@ -88,8 +92,286 @@ def test_searchbox_assign_values(mocker):
     mock = mocker.MagicMock()
     gui.Searchbox.assign_values(mock, [RECORD])
     mock.clear.assert_called_once()
-    mock.values.__setitem__.assert_called_once_with(
-        '9780340425626 "Test me" by Mr Test', RECORD)
+    mock.extend_values.assert_called_once_with([RECORD])
+    mock.current.assert_called_once_with(0)
+    mock.do_on_select.assert_called_once()
+
+
+def test_searchbox_extend_values(mocker):
+    mock = mocker.MagicMock()
+    mock.values = {}
+    mock.LISTED = 100
+    gui.Searchbox.extend_values(mock, [RECORD])
+    assert mock.values == {'9780340425626 "Test me" by Mr Test': RECORD}
+    assert mock.values['9780340425626 "Test me" by Mr Test'].partial
+    mock.__setitem__.assert_called_once_with(
+        'values', ['9780340425626 "Test me" by Mr Test'])
+    mock.table.assign.assert_called_once_with(mock.values)
+    mock.current.assert_not_called()
+
+
+def test_searchbox_extend_values_lists_first_records(mocker):
+    mock = mocker.MagicMock()
+    mock.values = {}
+    mock.LISTED = 2
+    mock.table = None
+    records = [dict(RECORD, ISBN=number) for number in (3, 1)]
+    gui.Searchbox.extend_values(mock, records)
+    gui.Searchbox.extend_values(mock, [dict(RECORD, ISBN=2)])
+    assert list(mock.values) == [f'{number} "Test me" by Mr Test'
+                                 for number in (1, 2, 3)]
+    mock.__setitem__.assert_called_with(
+        'values', ['1 "Test me" by Mr Test', '2 "Test me" by Mr Test'])
+
+
+def live_mock(mocker, enabled=True, record=None):
+    mock = mocker.MagicMock()
+    mock.enabled.get.return_value = enabled
+    mock.menu.search.box.get_record.return_value = record
+    mock.pending = 'after#1'
+    return mock
+
+
+def test_live_search_schedule(mocker):
+    mock = live_mock(mocker)
+    gui.LiveSearch.schedule(mock)
+    mock.after_cancel.assert_called_once_with('after#1')
+    mock.after.assert_called_once_with(mock.DELAY, mock.start)
+    assert mock.pending == mock.after()
+
+
+@pytest.mark.parametrize('enabled, record', (
+        (False, None),
+        (True, RECORD),
+))
+def test_live_search_schedule_skipped(enabled, record, mocker):
+    mock = live_mock(mocker, enabled, record)
+    gui.LiveSearch.schedule(mock)
+    mock.after.assert_not_called()
+    assert mock.pending is None
+
+
+def test_live_search_start(mocker):
+    mock = mocker.MagicMock()
+    mock.parameters.return_value = {'Title': 'Test'}
+    gui.LiveSearch.start(mock)
+    mock.stop.assert_called_once()
+    mock.menu.form.get.assert_called_once_with(True)
+    submit = mock.menu.worker.executor.submit
+    assert submit.call_args[0][:2] == (mock.fetch, {'Title': 'Test'})
+    assert mock.task[0] is submit()
+    mock.after.assert_called_once_with(gui.Worker.POLL, mock.poll,
+                                       mock.task, True)
+
+
+def test_live_search_start_without_parameters(mocker):
+    mock = mocker.MagicMock()
+    mock.parameters.return_value = {}
+    gui.LiveSearch.start(mock)
+    mock.stop.assert_called_once()
+    mock.menu.worker.executor.submit.assert_not_called()
+
+
+def test_live_search_stop(mocker):
+    mock = mocker.MagicMock()
+    future, stop = mocker.MagicMock(), gui.Event()
+    mock.task = future, stop, None
+    gui.LiveSearch.stop(mock)
+    assert stop.is_set()
+    future.cancel.assert_called_once()
+    assert mock.task is None
+
+
+def live_task(mocker, pages, done=True, error=None):
+    queue = gui.Queue()
+    for page in pages:
+        queue.put(page)
+    future = mocker.MagicMock()
+    future.done.return_value = done
+    future.exception.return_value = error
+    return future, gui.Event(), queue
+
+
+def test_live_search_poll_stale_task(mocker):
+    mock = mocker.MagicMock()
+    gui.LiveSearch.poll(mock, live_task(mocker, [[RECORD]]), True)
+    mock.menu.search.box.extend_values.assert_not_called()
+
+
+def test_live_search_poll_pages(mocker):
+    mock = mocker.MagicMock()
+    mock.task = live_task(mocker, [[RECORD], [RECORD]], done=False)
+    gui.LiveSearch.poll(mock, mock.task, True)
+    box = mock.menu.search.box
+    box.clear.assert_called_once()
+    assert box.extend_values.call_count == 2
+    mock.after.assert_called_once_with(gui.Worker.POLL, mock.poll,
+                                       mock.task, False)
+
+
+def test_live_search_poll_done(mocker):
+    mock = mocker.MagicMock()
+    task = mock.task = live_task(mocker, [[RECORD]])
+    gui.LiveSearch.poll(mock, task, False)
+    mock.menu.search.box.clear.assert_not_called()
+    mock.after.assert_not_called()
+    assert mock.task is None
+
+
+@pytest.mark.parametrize('error, cleared', (
+        (None, True),
+        (ConnectionError(), False),
+))
+def test_live_search_poll_no_results(error, cleared, mocker):
+    mock = mocker.MagicMock()
+    mock.task = live_task(mocker, [], error=error)
+    gui.LiveSearch.poll(mock, mock.task, True)
+    assert mock.menu.search.box.clear.called is cleared
+
+
+def test_live_search_parameters():
+    record = gui.Record(Title='Test (me', Author='M', ISBN=9780340425626,
+                        Hardcover=False)
+    assert gui.LiveSearch.parameters(record) == {
+        'Title': {'$regex': r'^Test\ \(me', '$options': 'i'},
+        'ISBN': 9780340425626}
+
+
+def test_live_search_fetch_limit(mocker):
+    mocked = mocker.patch('bookmeister.gui.Database.iter_pages',
+                          return_value=iter([[RECORD] * 50] * 20))
+    pages = gui.Queue()
+    gui.LiveSearch.fetch({'Title': 'Test'}, gui.Event(), pages)
+    mocked.assert_called_once_with({'Title': 'Test'}, 50,
+                                   gui.Searchbox.SUMMARY)
+    assert pages.qsize() == 10
+
+
+def test_live_search_fetch_stopped(mocker):
+    mocker.patch('bookmeister.gui.Database.iter_pages',
+                 return_value=iter([[RECORD]] * 3))
+    pages, stop = gui.Queue(), gui.Event()
+    stop.set()
+    gui.LiveSearch.fetch({'Title': 'Test'}, stop, pages)
+    assert pages.empty()
+
+
+@pytest.fixture
+def summary(mocker):
+    mocker.patch('tkinter.ttk.Combobox.get', return_value='Test me')
+    mock = mocker.MagicMock()
+    mock.values = {'Test me': gui.BookRecord(
+        {'_id': '5eb00ffce332cd260015d67c', 'ISBN': 9780340425626,
+         'Title': 'Test me'}, partial=True)}
+    mock.HYDRATED, mock.HYDRATED_TTL = 2, 60
+    mock.hydrated = gui.OrderedDict()
+    mock.get_hydrated.return_value = None
+    return mock
+
+
+def test_searchbox_do_on_select_hydrates(summary):
+    gui.Searchbox.do_on_select(summary)
+    summary.worker.run.assert_called_once()
+    assert summary.worker.run.call_args[0][2] == '5eb00ffce332cd260015d67c'
+    summary.empty.assert_called_once()
+    summary.fill.assert_not_called()
+
+
+@pytest.mark.parametrize('busy', (True, False))
+def test_searchbox_do_on_select_not_hydrated(summary, busy, mocker):
+    mocked = mocker.patch('tkinter.messagebox.showinfo')
+    if busy:
+        summary.worker.run.return_value = False
+    else:
+        summary.worker = None
+    gui.Searchbox.do_on_select(summary)
+    mocked.assert_called_once()
+    summary.empty.assert_called_once()
+    summary.fill.assert_not_called()
+
+
+def test_searchbox_do_on_select_hydrated(summary):
+    whole = gui.BookRecord(dict(RECORD, _id='5eb00ffce332cd260015d67c'))
+    summary.get_hydrated.return_value = whole
+    gui.Searchbox.do_on_select(summary)
+    summary.worker.run.assert_not_called()
+    assert summary.values['Test me'] is whole
+    summary.fill.assert_called_once_with(whole)
+
+
+@pytest.mark.parametrize('data', (
+        dict(RECORD, _id='5eb00ffce332cd260015d67c'),
+        {'_id': '5eb00ffce332cd260015d67c', 'ISBN': 9780340425626,
+         'Title': 'Test me'},
+))
+def test_searchbox_do_on_select_whole_record(data, mocker):
+    mocker.patch('tkinter.ttk.Combobox.get', return_value='Test me')
+    mock = mocker.MagicMock()
+    mock.values = {'Test me': gui.BookRecord(data)}
+    gui.Searchbox.do_on_select(mock)
+    mock.worker.run.assert_not_called()
+    mock.fill.assert_called_once_with(mock.values['Test me'])
+
+
+def test_searchbox_finish_hydrate(summary):
+    data = dict(RECORD, _id='5eb00ffce332cd260015d67c')
+    gui.Searchbox.finish_hydrate(summary, 'Test me', data)
+    assert summary.values['Test me'] == data
+    assert summary.hydrated['5eb00ffce332cd260015d67c'][1] == data
+    summary.fill.assert_called_once_with(summary.values['Test me'])
+
+
+def test_searchbox_finish_hydrate_other_selected(summary):
+    data = dict(RECORD, _id='5eb00ffce332cd260015d67c')
+    gui.Searchbox.finish_hydrate(summary, 'Other', data)
+    summary.fill.assert_not_called()
+    assert '5eb00ffce332cd260015d67c' in summary.hydrated
+
+
+def test_searchbox_finish_hydrate_limit(summary):
+    for number in range(3):
+        gui.Searchbox.finish_hydrate(summary, 'Other',
+                                     dict(RECORD, _id=str(number)))
+    assert list(summary.hydrated) == ['1', '2']
+
+
+def test_searchbox_finish_hydrate_no_connection(summary, mocker):
+    mocked = mocker.patch('bookmeister.gui.show_no_connection')
+    gui.Searchbox.finish_hydrate(summary, 'Test me', None)
+    mocked.assert_called_once()
+    summary.empty.assert_called_once()
+    summary.fill.assert_not_called()
+
+
+def test_searchbox_finish_hydrate_no_connection_other_selected(summary,
+                                                               mocker):
+    mocker.patch('bookmeister.gui.show_no_connection')
+    gui.Searchbox.finish_hydrate(summary, 'Other', None)
+    summary.empty.assert_not_called()
+
+
+def test_searchbox_get_hydrated(summary, mocker):
+    record = gui.BookRecord(RECORD)
+    summary.hydrated.update({'1': (100, record), '2': (200, record)})
+    mocker.patch('bookmeister.gui.monotonic', return_value=150)
+    assert gui.Searchbox.get_hydrated(summary, '1') is None
+    assert '1' not in summary.hydrated
+    assert gui.Searchbox.get_hydrated(summary, '2') is record
+    assert gui.Searchbox.get_hydrated(summary, '3') is None
+
+
+def test_searchbox_fill(mocker):
+    mock = mocker.MagicMock()
+    variable = mocker.MagicMock()
+    mock.variables = {'Title': variable, 'Pages': mocker.MagicMock()}
+    gui.Searchbox.fill(mock, gui.BookRecord({'Title': 'Test me'}))
+    variable.set.assert_called_once_with('Test me')
+
+
+def test_searchbox_select(mocker):
+    mock = mocker.MagicMock()
+    gui.Searchbox.select(mock, 'Test me')
+    mock.set.assert_called_once_with('Test me')
     mock.do_on_select.assert_called_once()
 
 
@@ -121,6 +403,13 @@ def test_searchbox_get_connects_with_combobox(mocker):
     mocked.assert_called_once()
 
 
+def test_searchbox_get_record(mocker):
+    mocker.patch('tkinter.ttk.Combobox.get', return_value='Test me')
+    mock = mocker.MagicMock()
+    mock.values = {'Test me': RECORD}
+    assert gui.Searchbox.get_record(mock) == RECORD
+
+
 def test_searchbox_get_image_error(mocker):
     mocked = mocker.patch('tkinter.ttk.Combobox.get')
     mocked.side_effect = KeyError()
@@ -133,11 +422,288 @@ def test_searchbox_get_image_connects_with_combobox(mocker):
     mocked.assert_called_once()
 
 
+@pytest.fixture
+def listed(mocker):
+    mocker.patch('tkinter.ttk.Combobox.get', return_value='First')
+    mock = mocker.MagicMock()
+    mock.values = {
+        'First': gui.BookRecord({'_id': '1', 'Title': 'First'}),
+        'Second': gui.BookRecord({'_id': '2', 'Title': 'Second'})}
+    mock.hydrated = {'1': (0, None), '3': (0, None)}
+    return mock
+
+
+def test_searchbox_remove(listed):
+    gui.Searchbox.remove(listed, ['First'])
+    assert list(listed.values) == ['Second']
+    assert list(listed.hydrated) == ['3']
+    listed.set.assert_called_once_with('')
+    listed.extend_values.assert_called_once_with([])
+
+
+def test_searchbox_change(listed):
+    gui.Searchbox.change(listed, ['Second'], {'Price': 12.5})
+    assert list(listed.values) == ['First']
+    listed.set.assert_not_called()
+    listed.extend_values.assert_called_once_with(
+        [{'_id': '2', 'Title': 'Second', 'Price': 12.5}])
+
+
 def test_searchbox_clear(mocker):
     mock = mocker.MagicMock()
     gui.Searchbox.clear(mock)
     mock.values.clear.assert_called_once()
     mock.set.assert_called_once()
+    mock.table.assign.assert_called_once_with(mock.values)
+
+
+def test_search_show_table(mocker):
+    mocked_window = mocker.patch('tkinter.Toplevel')
+    mocked_table = mocker.patch('bookmeister.gui.ResultsTable')
+    mocked_editor = mocker.patch('bookmeister.gui.BatchEditor')
+    mock = mocker.MagicMock()
+    mock.box.table = None
+    gui.Search.show_table(mock)
+    mocked_window.assert_called_once_with(mock)
+    mocked_table.assert_called_once_with(mocked_window(), mock.box.select)
+    mocked_table().assign.assert_called_once_with(mock.box.values)
+    mocked_editor.assert_called_once_with(mocked_window(), mocked_table(),
+                                          mock.menu)
+    assert mock.box.table is mocked_table()
+
+
+def test_search_show_open_table(mocker):
+    mocked = mocker.patch('tkinter.Toplevel')
+    mock = mocker.MagicMock()
+    gui.Search.show_table(mock)
+    mocked.assert_not_called()
+    mock.box.table.master.lift.assert_called_once()
+
+
+def test_search_close_table(mocker):
+    mock, window = mocker.MagicMock(), mocker.MagicMock()
+    gui.Search.close_table(mock, window)
+    assert mock.box.table is None
+    window.destroy.assert_called_once()
+
+
+def table_mock(mocker, count):
+    mock = mocker.MagicMock()
+    mock.ROWS, mock.COLUMNS = 3, gui.ResultsTable.COLUMNS
+    mock.sort_key = gui.ResultsTable.sort_key
+    mock.scroll_to = lambda offset: gui.ResultsTable.scroll_to(mock, offset)
+    mock.render = lambda: gui.ResultsTable.render(mock)
+    records = {str(number): {'ISBN': number, 'Title': f'{number % 3}'}
+               for number in range(count)}
+    gui.ResultsTable.assign(mock, records)
+    return mock
+
+
+def test_results_table_renders_visible_rows(mocker):
+    mock = table_mock(mocker, 10)
+    assert mock.tree.insert.call_count == 3
+    mock.tree.insert.assert_called_with(
+        '', 'end', iid='2', values=[2, '2', '', '', ''])
+    mock.scrollbar.set.assert_called_once_with(0, 0.3)
+
+
+def test_results_table_empty(mocker):
+    mock = table_mock(mocker, 0)
+    mock.tree.insert.assert_not_called()
+    mock.scrollbar.set.assert_called_once_with(0, 1)
+
+
+@pytest.mark.parametrize('args, offset', (
+        (('moveto', '0.5'), 5),
+        (('moveto', '1.0'), 7),
+        (('moveto', '-0.1'), 0),
+        (('scroll', '1', 'units'), 1),
+        (('scroll', '2', 'pages'), 6),
+        (('scroll', '-1', 'units'), 0),
+))
+def test_results_table_yview(args, offset, mocker):
+    mock = table_mock(mocker, 10)
+    gui.ResultsTable.yview(mock, *args)
+    assert mock.offset == offset
+    assert mock.tree.insert.call_args[1]['iid'] == str(offset + 2)
+
+
+@pytest.mark.parametrize('num, delta, offset', (
+        (5, 0, 3),
+        (4, 0, 0),
+        (0, -120, 3),
+))
+def test_results_table_on_wheel(num, delta, offset, mocker):
+    mock = table_mock(mocker, 10)
+    event = mocker.MagicMock(num=num, delta=delta)
+    assert gui.ResultsTable.on_wheel(mock, event) == 'break'
+    assert mock.offset == offset
+
+
+def test_results_table_sort(mocker):
+    mock = table_mock(mocker, 6)
+    mock.scroll_to = mocker.MagicMock()
+    gui.ResultsTable.sort(mock, 'Title')
+    assert mock.rows == ['0', '3', '1', '4', '2', '5']
+    gui.ResultsTable.sort(mock, 'Title')
+    assert mock.rows == ['2', '5', '1', '4', '0', '3']
+    gui.ResultsTable.sort(mock, 'ISBN')
+    assert mock.rows == ['0', '1', '2', '3', '4', '5']
+    assert list(mock._keys) == ['Title', 'ISBN']
+    mock.scroll_to.assert_called_with(0)
+
+
+def test_results_table_sort_key():
+    values = ['b', None, 10, 'A', '', 2.5, True]
+    assert sorted(values, key=gui.ResultsTable.sort_key) == [
+        2.5, 10, 'A', 'b', True, None, '']
+
+
+def test_results_table_on_select(mocker):
+    mock = mocker.MagicMock()
+    mock.selected = set()
+    mock.tree.selection.return_value = ('Test me',)
+    gui.ResultsTable.on_select(mock)
+    mock.select.assert_called_once_with('Test me')
+
+
+def test_results_table_on_select_nothing(mocker):
+    mock = mocker.MagicMock()
+    mock.selected = set()
+    mock.tree.selection.return_value = ()
+    gui.ResultsTable.on_select(mock)
+    mock.select.assert_not_called()
+
+
+def test_results_table_selection_kept_after_scroll(mocker):
+    mock = table_mock(mocker, 10)
+    mock.tree.get_children.return_value = ('0', '1', '2')
+    mock.tree.selection.return_value = ('0', '1')
+    gui.ResultsTable.on_select(mock)
+    mock.select.assert_not_called()
+    gui.ResultsTable.yview(mock, 'scroll', '1', 'pages')
+    mock.tree.selection_set.assert_called_with([])
+    mock.tree.get_children.return_value = ('3', '4', '5')
+    mock.tree.selection.return_value = ('4',)
+    gui.ResultsTable.on_select(mock)
+    assert gui.ResultsTable.chosen(mock) == ['0', '1', '4']
+    mock.summary.configure.assert_called_with(text='Selected: 3 of 10')
+    gui.ResultsTable.yview(mock, 'moveto', '0')
+    mock.tree.selection_set.assert_called_with(['0', '1'])
+
+
+def test_results_table_select_all(mocker):
+    mock = table_mock(mocker, 5)
+    gui.ResultsTable.select_all(mock)
+    assert gui.ResultsTable.chosen(mock) == ['0', '1', '2', '3', '4']
+    mock.tree.selection_set.assert_called_with(['0', '1', '2'])
+
+
+@pytest.mark.parametrize('state,region,cleared', (
+        (0, 'cell', True),
+        (0x0004, 'cell', False),
+        (0x0001, 'cell', False),
+        (0, 'heading', False),
+))
+def test_results_table_on_click(state, region, cleared, mocker):
+    mock = mocker.MagicMock()
+    mock.MODIFIERS = gui.ResultsTable.MODIFIERS
+    mock.selected = {'Test me'}
+    mock.tree.identify_region.return_value = region
+    gui.ResultsTable.on_click(mock, mocker.MagicMock(state=state))
+    assert mock.selected == (set() if cleared else {'Test me'})
+
+
+@pytest.fixture
+def editor(mocker):
+    mock = mocker.MagicMock()
+    mock.table.records = {
+        'First': gui.BookRecord({'_id': '1', 'Title': 'First'}),
+        'Second': gui.BookRecord({'_id': '2', 'Title': 'Second'})}
+    mock.table.chosen.return_value = ['First', 'Second']
+    mock.selected = lambda: gui.BatchEditor.selected(mock)
+    mock.field.get.return_value = 'Price'
+    mock.value.get.return_value = '12.50'
+    return mock
+
+
+def test_batch_editor_selected_nothing(editor, mocker):
+    mocked = mocker.patch('tkinter.messagebox.showerror')
+    editor.table.chosen.return_value = []
+    assert gui.BatchEditor.selected(editor) == ([], [])
+    mocked.assert_called_once()
+
+
+def test_batch_editor_revise(editor, mocker):
+    mocker.patch('tkinter.messagebox.askyesno', return_value=True)
+    gui.BatchEditor.revise(editor)
+    run = editor.menu.worker.run
+    run.assert_called_once()
+    assert run.call_args[0][2:] == (['1', '2'], {'Price': 12.5})
+
+
+def test_batch_editor_revise_not_confirmed(editor, mocker):
+    mocker.patch('tkinter.messagebox.askyesno', return_value=False)
+    gui.BatchEditor.revise(editor)
+    editor.menu.worker.run.assert_not_called()
+
+
+def test_batch_editor_revise_wrong_value(editor, mocker):
+    mocked = mocker.patch('tkinter.messagebox.showerror')
+    editor.value.get.return_value = '12.345'
+    gui.BatchEditor.revise(editor)
+    assert 'Price' in mocked.call_args[0][1]
+    editor.menu.worker.run.assert_not_called()
+
+
+def test_batch_editor_delete(editor, mocker):
+    mocker.patch('tkinter.messagebox.askyesno', return_value=True)
+    editor.isbns.return_value = [None, 9780340425626]
+    gui.BatchEditor.delete(editor)
+    operation, _, ids = editor.menu.worker.run.call_args[0]
+    assert ids == ['1', '2']
+    assert editor.menu.worker.run.call_args[1] == {'writes': True}
+    assert operation.keywords == {'isbns': [None, 9780340425626]}
+
+
+@pytest.mark.parametrize('method', ('revise', 'delete'))
+def test_batch_editor_busy(editor, method, mocker):
+    mocker.patch('tkinter.messagebox.askyesno', return_value=True)
+    mocked = mocker.patch('bookmeister.gui.show_busy')
+    editor.menu.worker.run.return_value = False
+    getattr(gui.BatchEditor, method)(editor)
+    mocked.assert_called_once()
+
+
+def test_batch_editor_not_busy(editor, mocker):
+    mocker.patch('tkinter.messagebox.askyesno', return_value=True)
+    mocked = mocker.patch('bookmeister.gui.show_busy')
+    gui.BatchEditor.delete(editor)
+    mocked.assert_not_called()
+
+
+def test_batch_editor_isbns(editor):
+    editor.table.records['Second']['ISBN'] = 9780340425626
+    assert gui.BatchEditor.isbns(editor, ['First', 'Second']) == [
+        None, 9780340425626]
+
+
+def test_batch_editor_finish_delete(editor, mocker):
+    mocked = mocker.patch('tkinter.messagebox.showinfo')
+    gui.BatchEditor.finish(editor, ['First', 'Second'], None, [True, True])
+    editor.menu.search.box.remove.assert_called_once_with(['First', 'Second'])
+    assert mocked.call_args[0][1] == 'Removed 2 of 2 records.'
+
+
+def test_batch_editor_finish_update_failed(editor, mocker):
+    mocked = mocker.patch('tkinter.messagebox.showwarning')
+    editor.REPORTED = 1
+    gui.BatchEditor.finish(editor, ['First', 'Second', 'Third'],
+                           {'Price': 12.5}, [True, False, False])
+    editor.menu.search.box.change.assert_called_once_with(
+        ['First'], {'Price': 12.5})
+    assert mocked.call_args[0][1] == (
+        'Updated 1 of 3 records.\n\nFailed:\nSecond\nand 1 more')
 
 
 def test_form_frame_init(mocker):
@@ -187,16 +753,63 @@ def test_form_frame_clear(parameter, mocker):
 
 
 def test_add_image(mocker):
-    mocker.patch('bookmeister.gui.askopenfile')
-    mocker.patch('bookmeister.connection.Database.upload_image')
-    mocker.patch('bookmeister.connection.Database.update')
+    mocker.patch('tkinter.filedialog.askopenfile')
+    mock = mocker.MagicMock()
+    gui.Image.add_image(mock)
+    mock.menu.worker.run.assert_called_once()
+
+
+def test_finish_upload(mocker):
     mocked = mocker.patch('tkinter.messagebox.showinfo')
-    gui.Image.add_image(mocker.MagicMock())
+    mock = mocker.MagicMock()
+    gui.Image.finish_upload(mock, '5fc00c0d')
+    mock.menu.search.box.assign_image.assert_called_once_with('5fc00c0d')
     mocked.assert_called_once()
 
 
+def test_upload(mocker):
+    prepare = mocker.patch('bookmeister.picture.prepare')
+    mocked = mocker.patch('bookmeister.connection.Database.upload_image')
+    mocked.return_value = '5fc00c0d'
+    mock = mocker.patch('bookmeister.connection.Database.update')
+    assert gui.Image.upload('5eb00ffce332cd260015d67c', 'test.png') == \
+        '5fc00c0d'
+    prepare.assert_called_once_with('test.png')
+    mocked.assert_called_once_with(prepare.return_value)
+    mock.assert_called_once_with('5eb00ffce332cd260015d67c',
+                                 {'Cover': '5fc00c0d'})
+
+
+def test_upload_prepared_cover(mocker):
+    mocked = mocker.patch('bookmeister.connection.Database.upload_image')
+    mocker.patch('bookmeister.connection.Database.update')
+    gui.Image.upload('5eb00ffce332cd260015d67c', 'bookmeister/bookmeister.png')
+    picture = mocked.call_args[0][0]
+    assert picture.name == 'cover.jpg'
+    assert picture.read(3) == b'\xff\xd8\xff'
+
+
+def test_upload_unreadable_image(mocker):
+    mocked = mocker.patch('bookmeister.connection.Database.upload_image')
+    assert gui.Image.upload('5eb00ffce332cd260015d67c', 'test.png') is None
+    mocked.assert_not_called()
+
+
+@pytest.mark.parametrize('image_id,updated', (
+        (None, True),
+        ('5fc00c0d', False),
+))
+def test_upload_failed(image_id, updated, mocker):
+    mocker.patch('bookmeister.picture.prepare')
+    mocked = mocker.patch('bookmeister.connection.Database.upload_image')
+    mocked.return_value = image_id
+    mock = mocker.patch('bookmeister.connection.Database.update')
+    mock.return_value = updated
+    assert gui.Image.upload('5eb00ffce332cd260015d67c', 'test.png') is None
+
+
 def test_add_image_no_connection(mocker):
-    mocker.patch('bookmeister.gui.askopenfile')
+    mocker.patch('tkinter.filedialog.askopenfile')
     mocked = mocker.patch('tkinter.messagebox.showerror')
     mock = mocker.MagicMock()
     mock.verify.return_value = False
@@ -205,21 +818,52 @@ def test_add_image_no_connection(mocker):
 
 
 def test_add_image_wrong_format(mocker):
-    mocker.patch('bookmeister.gui.askopenfile')
-    mocker.patch('bookmeister.connection.Database.upload_image')
     mocked = mocker.patch('bookmeister.gui.show_no_connection')
-    mock = mocker.patch('bookmeister.connection.Database.update')
-    mock.return_value = None
-    gui.Image.add_image(mocker.MagicMock())
+    gui.Image.finish_upload(mocker.MagicMock(), None)
     mocked.assert_called_once()
 
 
-
 def test_view_image(mocker):
     mocked = mocker.MagicMock()
-    mocked.menu.search.box.get_image.return_value = True
+    mocked.menu.search.box.get_image.return_value = '5fc00c0d'
     gui.Image.view_image(mocked)
-    mocked.open_image.assert_called_once()
+    mocked.menu.worker.run.assert_called_once()
+    assert mocked.menu.worker.run.call_args[0][0] is mocked.load
+    assert mocked.menu.worker.run.call_args[0][2] == '5fc00c0d'
+
+
+def test_finish_view(mocker):
+    mocker.patch('tkinter.Toplevel')
+    mocker.patch('tkinter.Button')
+    label = mocker.patch('tkinter.Label')
+    photo = mocker.patch('PIL.ImageTk.PhotoImage')
+    gui.Image.finish_view(mocker.MagicMock(), '5fc00c0d', 'image')
+    assert photo.call_args[0] == ('image',)
+    assert label.return_value.image is photo.return_value
+
+
+def test_finish_view_failed(mocker):
+    mocked = mocker.patch('bookmeister.gui.show_no_connection')
+    gui.Image.finish_view(mocker.MagicMock(), '5fc00c0d', None)
+    mocked.assert_called_once()
+
+
+def test_load_image(mocker):
+    with open('bookmeister/bookmeister.png', 'rb') as icon:
+        data = icon.read()
+    mocked = mocker.patch('bookmeister.connection.Database.download_image')
+    mocked.return_value = data
+    mocker.patch.object(gui.Image, 'VIEW_SIZE', (20, 20))
+    image = gui.Image.load('5fc00c0d')
+    mocked.assert_called_once_with('5fc00c0d')
+    assert max(image.size) == 20
+
+
+@pytest.mark.parametrize('data', (None, b'not image'))
+def test_load_image_failed(data, mocker):
+    mocked = mocker.patch('bookmeister.connection.Database.download_image')
+    mocked.return_value = data
+    assert gui.Image.load('5fc00c0d') is None
 
 
 def test_view_no_image(mocker):
@@ -244,42 +888,255 @@ def test_image_verify(name, result):
     assert gui.Image.verify('bookmeister/' + name) == result
 
 
+def test_buttons_process_data_in_background(mocker):
+    mock = mocker.MagicMock()
+    operation = mocker.MagicMock()
+    gui.Buttons.process_data(mock, RECORD, operation, 'id')
+    mock.menu.worker.run.assert_called_once_with(
+        operation, mock.finish_save, 'id', RECORD, writes=True)
+
+
+def test_buttons_process_incomplete_data(mocker):
+    mock = mocker.MagicMock()
+    gui.Buttons.process_data(mock, {'Title': 'Test me'}, None)
+    mock.menu.worker.run.assert_not_called()
+
+
 def test_buttons_process_wrong_data(mocker):
     mocked = mocker.patch('bookmeister.gui.show_no_connection')
-    gui.Buttons.process_data(mocker.MagicMock(), RECORD, lambda x: None)
+    gui.Buttons.finish_save(mocker.MagicMock(), None)
     mocked.assert_called_once()
 
 
-def test_buttons_add_no_connection(mocker):
-    mocked = mocker.patch('bookmeister.gui.show_no_connection')
+def test_buttons_save_success(mocker):
+    mocked = mocker.patch('tkinter.messagebox.showinfo')
     mock = mocker.MagicMock()
-    mock.exist_check.return_value = None
+    gui.Buttons.finish_save(mock, True)
+    mocked.assert_called_once()
+    mock.menu.form.clear.assert_called_once()
+
+
+def test_buttons_add_in_background(mocker):
+    mock = mocker.MagicMock()
+    mock.menu.form.get.return_value = RECORD
     gui.Buttons.add(mock)
+    args = mock.menu.worker.run.call_args[0]
+    assert args[0] == mock.exist_check
+    assert args[2] == RECORD['ISBN']
+
+
+def test_buttons_add_no_connection(mocker):
+    mocked = mocker.patch('bookmeister.gui.show_no_connection')
+    gui.Buttons.finish_add(mocker.MagicMock(), RECORD, None)
     mocked.assert_called_once()
 
 
 def test_buttons_add_existing_record(mocker):
     mock = mocker.MagicMock()
-    mock.exist_check.return_value = True
-    gui.Buttons.add(mock)
+    gui.Buttons.finish_add(mock, RECORD, [RECORD])
     mock.menu.show_error.assert_called_once()
 
 
+def test_buttons_add_new_record(mocker):
+    mock = mocker.MagicMock()
+    gui.Buttons.finish_add(mock, RECORD, [])
+    mock.process_data.assert_called_once()
+
+
+def test_buttons_search_in_background(mocker):
+    mock = mocker.MagicMock()
+    gui.Buttons.search(mock)
+    mock.menu.worker.run.assert_called_once()
+    assert mock.menu.worker.run.call_args[0][3] == gui.Searchbox.SUMMARY
+    mock.menu.search.live.stop.assert_called_once()
+
+
 def test_buttons_search_no_connection(mocker):
     mocked = mocker.patch('bookmeister.gui.show_no_connection')
-    mock = mocker.patch('bookmeister.connection.Database.search')
-    mock.return_value = None
-    gui.Buttons.search(mocker.MagicMock())
+    gui.Buttons.finish_search(mocker.MagicMock(), None)
     mocked.assert_called_once()
 
 
+def test_buttons_search_results(mocker):
+    mock = mocker.MagicMock()
+    gui.Buttons.finish_search(mock, [RECORD])
+    mock.menu.search.box.assign_values.assert_called_once_with([RECORD])
+    mock.menu.search.show_table.assert_not_called()
+
+
+def test_buttons_search_many_results(mocker):
+    mock = mocker.MagicMock()
+    records = [RECORD] * (gui.Searchbox.LISTED + 1)
+    gui.Buttons.finish_search(mock, records)
+    mock.menu.search.show_table.assert_called_once()
+
+
+@pytest.fixture
+def revised(mocker):
+    mock = mocker.MagicMock()
+    mock.menu.form.get.return_value = gui.Record(RECORD)
+    mock.menu.search.box.get.return_value = '5eb00ffce332cd260015d67c'
+    mock.menu.search.box.get_record.return_value = gui.BookRecord(
+        dict(RECORD, _id='5eb00ffce332cd260015d67c', Price=4.5, Pages=1))
+    return mock
+
+
+def test_buttons_revise_sends_changes(revised):
+    gui.Buttons.revise(revised)
+    revised.menu.search.box.hydrated.pop.assert_called_once_with(
+        '5eb00ffce332cd260015d67c', None)
+    run = revised.menu.worker.run
+    run.assert_called_once()
+    assert run.call_args[0][2:] == ('5eb00ffce332cd260015d67c',
+                                    {'Price': 5.75, 'Pages': 999})
+
+
+def test_buttons_revise_no_changes(revised, mocker):
+    mocked = mocker.patch('tkinter.messagebox.showinfo')
+    revised.menu.search.box.get_record.return_value = gui.BookRecord(
+        dict(RECORD, _id='5eb00ffce332cd260015d67c'))
+    gui.Buttons.revise(revised)
+    mocked.assert_called_once()
+    revised.menu.worker.run.assert_not_called()
+
+
+def test_buttons_revise_not_hydrated(revised, mocker):
+    mocked = mocker.patch('tkinter.messagebox.showerror')
+    revised.menu.search.box.get_record.return_value = gui.BookRecord(
+        {'_id': '5eb00ffce332cd260015d67c', 'Title': 'Test me'}, True)
+    gui.Buttons.revise(revised)
+    mocked.assert_called_once()
+    revised.menu.worker.run.assert_not_called()
+
+
+def test_buttons_revise_whole_record_without_field(revised):
+    revised.menu.search.box.get_record.return_value = gui.BookRecord(
+        {'_id': '5eb00ffce332cd260015d67c', 'Title': 'Test me'})
+    gui.Buttons.revise(revised)
+    revised.menu.worker.run.assert_called_once()
+
+
+def test_buttons_revise_wrong_values(revised):
+    revised.menu.form.get.return_value = gui.Record(Title='Test me')
+    gui.Buttons.revise(revised)
+    revised.menu.worker.run.assert_not_called()
+
+
+def test_buttons_revise_not_selected(revised):
+    revised.menu.search.box.get.return_value = None
+    gui.Buttons.revise(revised)
+    revised.menu.worker.run.assert_not_called()
+
+
+def test_buttons_delete_in_background(mocker):
+    mock = mocker.MagicMock()
+    mock.menu.search.box.get_record.return_value = RECORD
+    gui.Buttons.delete(mock)
+    mock.menu.worker.run.assert_called_once()
+    assert mock.menu.worker.run.call_args[0][2:] == (
+        mock.menu.search.box.get(), RECORD['ISBN'])
+    assert mock.menu.worker.run.call_args[1] == {'writes': True}
+
+
 def test_buttons_delete_no_connection(mocker):
     mocked = mocker.patch('bookmeister.gui.show_no_connection')
-    mock = mocker.patch('bookmeister.connection.Database.delete')
-    mock.return_value = None
-    gui.Buttons.delete(mocker.MagicMock())
+    gui.Buttons.finish_delete(mocker.MagicMock(), None)
     mocked.assert_called_once()
 
 
+def test_buttons_exist_check_unknown_number(mocker):
+    mocked = mocker.patch('bookmeister.connection.Database.search')
+    isbns = mocker.patch('bookmeister.connection.Database.isbns')
+    isbns.__contains__.return_value = False
+    assert gui.Buttons.exist_check(9780340425626) == []
+    mocked.assert_not_called()
+
+
+@pytest.mark.parametrize('known,force', ((True, False), (False, True)))
+def test_buttons_exist_check_possible_number(known, force, mocker):
+    mocked = mocker.patch('bookmeister.connection.Database.search')
+    isbns = mocker.patch('bookmeister.connection.Database.isbns')
+    isbns.__contains__.return_value = known
+    gui.Buttons.exist_check(9780340425626, force)
+    mocked.assert_called_once_with({'ISBN': 9780340425626})
+
+
+def test_worker_run(mocker):
+    mock = mocker.MagicMock()
+    mock.task = None
+    assert gui.Worker.run(mock, abs, print, -5)
+    mock.executor.submit.assert_called_once_with(abs, -5)
+    mock.set_busy.assert_called_once_with(True)
+    mock.after.assert_called_once()
+
+
+@pytest.mark.parametrize('writes,state', ((False, 'normal'),
+                                           (True, 'disabled')))
+def test_worker_run_stop_only_reads(writes, state, mocker):
+    mock = mocker.MagicMock()
+    mock.task = None
+    gui.Worker.run(mock, abs, print, -5, writes=writes)
+    mock.stop.configure.assert_called_once_with(state=state)
+
+
+def test_worker_run_busy(mocker):
+    mock = mocker.MagicMock()
+    assert not gui.Worker.run(mock, print, print)
+    mock.executor.submit.assert_not_called()
+
+
+def test_worker_poll_done(mocker):
+    mock = mocker.MagicMock()
+    callback = mocker.MagicMock()
+    future = mocker.MagicMock()
+    future.done.return_value = True
+    mock.task = (future, callback)
+    gui.Worker.poll(mock, mock.task)
+    callback.assert_called_once_with(future.result())
+    mock.set_busy.assert_called_once_with(False)
+    assert mock.task is None
+
+
+def test_worker_poll_pending(mocker):
+    mock = mocker.MagicMock()
+    callback = mocker.MagicMock()
+    future = mocker.MagicMock()
+    future.done.return_value = False
+    mock.task = (future, callback)
+    gui.Worker.poll(mock, mock.task)
+    callback.assert_not_called()
+    mock.after.assert_called_once_with(mock.POLL, mock.poll, mock.task)
+
+
+def test_worker_poll_cancelled(mocker):
+    mock = mocker.MagicMock()
+    mock.task = None
+    callback = mocker.MagicMock()
+    gui.Worker.poll(mock, (mocker.MagicMock(), callback))
+    callback.assert_not_called()
+
+
+def test_worker_cancel(mocker):
+    mock = mocker.MagicMock()
+    future = mock.task[0]
+    gui.Worker.cancel(mock)
+    future.cancel.assert_called_once()
+    mock.set_busy.assert_called_once_with(False)
+    assert mock.task is None
+
+
+def test_worker_set_busy(mocker):
+    mock = mocker.MagicMock()
+    widget = mocker.MagicMock()
+    widget.cget.return_value = 'readonly'
+    mock.widgets = [widget]
+    gui.Worker.set_busy(mock, True)
+    widget.configure.assert_called_with(state='disabled')
+    mock.progress.start.assert_called_once()
+    gui.Worker.set_busy(mock, False)
+    widget.configure.assert_called_with(state='readonly')
+    mock.progress.stop.assert_called_once()
+
+
 def test_buttons_exist_check_no_number():
     assert gui.Buttons.exist_check(None) == False
@@ -0,0 +1,173 @@
+import csv
+from io import StringIO
+from json import dumps
+import pytest
+
+from bookmeister import importer
+
+RECORD = {
+    'Title': 'Test me',
+    'Author': 'Mr Test',
+    'Type': 'Test',
+    'Publisher': 'Tester',
+    'ISBN': '9780340425626',
+    'Release': '2020',
+    'Language': 'EN',
+    'Pages': '999',
+    'Quantity': '123',
+    'Price': '5.75',
+    'Discount': '5',
+    'Hardcover': 'false',
+}
+
+ROWS = (
+    RECORD,
+    dict(RECORD, ISBN='9780340425620'),
+    dict(RECORD, Price='5.7.5'),
+)
+
+
+@pytest.fixture(params=('csv', 'jsonl'))
+def path(request, tmp_path):
+    path = tmp_path / f'books.{request.param}'
+    with open(path, 'w', newline='') as file:
+        if request.param == 'csv':
+            writer = csv.DictWriter(file, RECORD.keys())
+            writer.writeheader()
+            writer.writerows(ROWS)
+        else:
+            file.write('\n'.join(dumps(row) for row in ROWS) + '\n')
+    return str(path)
+
+
+def test_read_rows(path):
+    rows = list(importer.read_rows(path))
+    assert [number for number, _ in rows] == [1, 2, 3]
+    assert importer.parse_row(rows[0][1])['Title'] == 'Test me'
+
+
+def test_parse_row():
+    record = importer.parse_row(RECORD)
+    assert record['ISBN'] == 9780340425626
+    assert record['Price'] == 5.75
+    assert record['Hardcover'] is False
+
+
+def test_parse_row_numbers():
+    record = importer.parse_row(dict(RECORD, Pages=999, Hardcover=True))
+    assert record['Pages'] == 999
+    assert record['Hardcover'] is True
+
+
+@pytest.mark.parametrize('row,message', (
+        ({'Title': 'Test me'}, 'Missing fields'),
+        (dict(RECORD, Language='E~'), 'Wrong value for field "Language"'),
+        ('{"Title": "Test me"', 'Expecting'),
+        ('["Test me"]', 'JSON object'),
+        (dict(RECORD, Notes='Signed'), 'Unknown fields: Notes'),
+        (dict(RECORD, _id='5eb00ffce332cd260015d67c'), 'Unknown fields'),
+        (dumps(dict(RECORD, Title=None)), 'Values cannot be null'),
+))
+def test_parse_row_error(row, message):
+    with pytest.raises(ValueError, match=message):
+        importer.parse_row(row)
+
+
+def isbn(number):
+    digits = f'978{number:09}'
+    check = -sum(int(digit) * (3 if index % 2 else 1)
+                 for index, digit in enumerate(digits)) % 10
+    return f'{digits}{check}'
+
+
+@pytest.fixture
+def search(mocker):
+    return mocker.patch('bookmeister.connection.Database.search',
+                        return_value=[])
+
+
+def test_check_repeated():
+    seen = {}
+    importer.check_repeated(seen, 1, {'ISBN': 9780340425626})
+    importer.check_repeated(seen, 2, {'ISBN': 9780340425619})
+    with pytest.raises(ValueError, match='first found in row 1'):
+        importer.check_repeated(seen, 3, {'ISBN': 9780340425626})
+
+
+def test_split_existing(search):
+    search.return_value = [{'_id': '1', 'ISBN': 9780340425626}]
+    batch = [(1, {'ISBN': 9780340425626}), (2, {'ISBN': 9780340425619})]
+    new, refused = importer.split_existing(importer.Database(), batch)
+    search.assert_called_once_with(
+        {'ISBN': {'$in': [9780340425626, 9780340425619]}}, ('ISBN',))
+    assert new == batch[1:]
+    assert refused == [(1, 'record with ISBN 9780340425626 already exists '
+                           'in database.')]
+
+
+def test_split_existing_known(search, mocker):
+    mocker.patch('bookmeister.connection.Database.isbns', {9780340425626})
+    batch = [(1, {'ISBN': 9780340425619})]
+    assert importer.split_existing(importer.Database(), batch) == (batch, [])
+    search.assert_not_called()
+
+
+def test_split_existing_no_connection(search):
+    search.return_value = None
+    batch = [(1, {'ISBN': 9780340425626}), (2, {'ISBN': 9780340425619})]
+    new, refused = importer.split_existing(importer.Database(), batch)
+    assert new == []
+    assert [number for number, _ in refused] == [1, 2]
+
+
+def test_read_rows_wrong_length(tmp_path):
+    path = tmp_path / 'books.csv'
+    path.write_text('Title,Author\nTest me,Mr Test,EXTRA\nTest me\n')
+    rows = [row for _, row in importer.read_rows(str(path))]
+    with pytest.raises(ValueError, match='more values than header'):
+        importer.parse_row(rows[0], False)
+    with pytest.raises(ValueError, match='fewer values than header'):
+        importer.parse_row(rows[1], False)
+
+
+def test_import_file(path, search, mocker):
+    mocked = mocker.patch('bookmeister.connection.Database.add_many')
+    mocked.side_effect = lambda records, _: [True] * len(records)
+    errors = StringIO()
+    assert importer.import_file(path, errors=errors) == (1, 2)
+    assert errors.getvalue().startswith('Row 2: Wrong value for field "ISBN"')
+    assert 'Row 3: ' in errors.getvalue()
+
+
+def test_import_file_in_batches(path, search, mocker):
+    mocked = mocker.patch('bookmeister.connection.Database.add_many')
+    mocked.side_effect = lambda records, _: [False] * len(records)
+    rows = [(number, dict(RECORD, ISBN=isbn(number)))
+            for number in range(1, 6)]
+    mocker.patch('bookmeister.importer.read_rows', return_value=rows)
+    errors = StringIO()
+    assert importer.import_file(path, batch_size=2, errors=errors) == (0, 5)
+    assert mocked.call_count == search.call_count == 3
+    assert errors.getvalue().count('could not save record') == 5
+
+
+def test_import_file_existing_and_repeated(path, search, mocker):
+    mocked = mocker.patch('bookmeister.connection.Database.add_many')
+    mocked.side_effect = lambda records, _: [True] * len(records)
+    search.return_value = [{'_id': '1', 'ISBN': int(isbn(2))}]
+    rows = [(1, dict(RECORD, ISBN=isbn(1))), (2, dict(RECORD, ISBN=isbn(2))),
+            (3, dict(RECORD, ISBN=isbn(1)))]
+    mocker.patch('bookmeister.importer.read_rows', return_value=rows)
+    errors = StringIO()
+    assert importer.import_file(path, errors=errors) == (1, 2)
+    assert len(mocked.call_args[0][0]) == 1
+    assert 'Row 2: record with ISBN' in errors.getvalue()
+    assert 'Row 3: ISBN' in errors.getvalue()
+
+
+def test_main(path, mocker, capsys):
+    mocked = mocker.patch('bookmeister.importer.import_file')
+    mocked.return_value = (3, 0)
+    assert importer.main([path, '--batch-size', '50']) == 0
+    mocked.assert_called_once_with(path, batch_size=50)
+    assert 'Stored 3 records, 0 failed' in capsys.readouterr().out
@@ -0,0 +1,118 @@
+import pytest
+from requests.exceptions import HTTPError
+
+from bookmeister import known
+
+NUMBERS = (9780340425626, 9780099578031, 9780141190419, 9780515055160)
+
+
+@pytest.fixture(params=('set', 'bloom'))
+def numbers(request):
+    if request.param == 'set':
+        return known.IsbnSet(NUMBERS)
+    bloom = known.BloomFilter(len(NUMBERS))
+    for isbn in NUMBERS:
+        bloom.add(isbn)
+    return bloom
+
+
+@pytest.mark.parametrize('isbn', NUMBERS)
+def test_stored(numbers, isbn):
+    assert isbn in numbers
+
+
+def test_not_stored(numbers):
+    assert 9780330102360 not in numbers
+
+
+def test_add(numbers):
+    numbers.add(9780330102360)
+    assert 9780330102360 in numbers
+
+
+def test_isbn_set_discard():
+    numbers = known.IsbnSet(NUMBERS)
+    numbers.add(9780330102360)
+    for isbn in (9780330102360, NUMBERS[0], 9781856132657):
+        numbers.discard(isbn)
+        assert isbn not in numbers
+    assert len(numbers) == len(NUMBERS) - 1
+    numbers.add(NUMBERS[0])
+    assert NUMBERS[0] in numbers
+    assert len(numbers) == len(NUMBERS)
+
+
+def test_bloom_filter_error_rate():
+    bloom = known.BloomFilter(10000, 0.01)
+    for isbn in range(9780000000000, 9780000010000):
+        bloom.add(isbn)
+    positives = sum(isbn in bloom for isbn in range(9790000000000,
+                                                    9790000010000))
+    assert positives < 300
+
+
+@pytest.fixture
+def database(mocker):
+    mock = mocker.MagicMock()
+    mock.iter_pages.return_value = [[{'ISBN': isbn} for isbn in NUMBERS], [
+        {'_id': 'No number'}]]
+    return mock
+
+
+def test_not_loaded():
+    assert 9780330102360 in known.KnownIsbns()
+
+
+@pytest.mark.parametrize('bloom_above,storage', (
+        (10, known.IsbnSet),
+        (2, known.BloomFilter),
+))
+def test_load(database, bloom_above, storage):
+    numbers = known.KnownIsbns(bloom_above)
+    assert numbers.load(database)
+    database.iter_pages.assert_called_once_with({}, 1000, ('ISBN',))
+    assert isinstance(numbers.numbers, storage)
+    assert str(NUMBERS[0]) in numbers
+    assert 9780330102360 not in numbers
+
+
+def test_changes_during_load_applied(database):
+    numbers = known.KnownIsbns()
+    numbers.add(9780330102360)
+    numbers.discard(NUMBERS[0])
+    numbers.load(database)
+    assert 9780330102360 in numbers
+    assert NUMBERS[0] not in numbers
+    numbers.discard(9780330102360)
+    assert 9780330102360 not in numbers
+
+
+def test_load_no_connection(database):
+    database.iter_pages.side_effect = ConnectionError
+    numbers = known.KnownIsbns()
+    assert not numbers.load(database)
+    assert numbers.numbers is None
+
+
+@pytest.mark.parametrize('page', (
+        [{'ISBN': 'wrong'}],
+        [{'ISBN': None}],
+        ['ISBN'],
+        [{'ISBN': -1}],
+))
+def test_load_malformed_page(database, page):
+    database.iter_pages.return_value = [[{'ISBN': NUMBERS[0]}], page]
+    numbers = known.KnownIsbns()
+    assert not numbers.load(database)
+    assert numbers.numbers is None
+
+
+def test_load_error_page(database):
+    def pages(*_):
+        yield [{'ISBN': NUMBERS[0]}]
+        raise HTTPError('503 Server Error')
+
+    database.iter_pages.side_effect = pages
+    numbers = known.KnownIsbns()
+    assert not numbers.load(database)
+    assert numbers.numbers is None
@@ -1,8 +1,15 @@
 import pytest
+import subprocess
+import sys
 from sys import platform
 
-from bookmeister.__main__ import main
+from bookmeister.__main__ import finish_setup, main
+from bookmeister.breaker import CircuitBreaker
+from bookmeister.cache import SearchCache
+from bookmeister.connection import Database
 from bookmeister.gui import Gui
+from bookmeister.known import KnownIsbns
+from bookmeister.metrics import Metrics
 
 
 @pytest.mark.parametrize('size', (
@@ -13,6 +20,78 @@ from bookmeister.gui import Gui
 ))
 def test_launch_app(mocker, size):
     mocker.patch.object(Gui, 'mainloop')
+    mocker.patch.object(Database, 'cache')
+    mocker.patch.object(Database, 'isbns')
+    mocker.patch.object(Database, 'breaker')
+    mocker.patch.object(Database, 'covers')
+    covers = mocker.patch('bookmeister.__main__.CoverCache')
+    mocked_thread = mocker.patch('bookmeister.__main__.Thread')
     mocked = mocker.patch('bookmeister.__main__.Gui')
     main()
     mocked.assert_called_once_with('Bookstore Manager', size)
+    assert isinstance(Database.cache, SearchCache)
+    assert isinstance(Database.isbns, KnownIsbns)
+    assert isinstance(Database.breaker, CircuitBreaker)
+    covers.assert_not_called()
+    mocked_thread.assert_not_called()
+    mocked.return_value.after_idle.assert_called_once_with(
+        finish_setup, mocked.return_value)
+    mocked.return_value.mainloop.assert_called_once()
+
+
+def test_finish_setup(mocker):
+    mocker.patch.dict('os.environ')
+    mocker.patch.object(Database, 'isbns')
+    mocker.patch.object(Database, 'covers')
+    covers = mocker.patch('bookmeister.__main__.CoverCache')
+    mocked_thread = mocker.patch('bookmeister.__main__.Thread')
+    gui = mocker.MagicMock()
+    finish_setup(gui)
+    assert Database.covers is covers.return_value
+    mocked_thread.return_value.start.assert_called_once()
+    gui.destroy.assert_not_called()
+
+
+def test_finish_setup_startup_benchmark(mocker):
+    mocker.patch.dict('os.environ', {'BOOKMEISTER_STARTUP': '1'})
+    mocker.patch.object(Database, 'isbns')
+    mocker.patch.object(Database, 'covers')
+    mocker.patch('bookmeister.__main__.CoverCache')
+    mocker.patch('bookmeister.__main__.Thread')
+    gui = mocker.MagicMock()
+    finish_setup(gui)
+    gui.destroy.assert_called_once()
+
+
+def test_launch_app_with_metrics(mocker):
+    mocker.patch.dict('os.environ', {'BOOKMEISTER_METRICS': 'metrics.prom'})
+    mocker.patch.object(Database, 'cache')
+    mocker.patch.object(Database, 'isbns')
+    mocker.patch.object(Database, 'breaker')
+    mocker.patch.object(Database, 'metrics')
+    mocker.patch.object(Database, 'covers')
+    mocker.patch('bookmeister.__main__.CoverCache')
+    mocker.patch('bookmeister.__main__.Thread')
+    mocker.patch('bookmeister.__main__.Gui')
+    mocked = mocker.patch('bookmeister.__main__.register')
+    main()
+    assert isinstance(Database.metrics, Metrics)
+    mocked.assert_called_once_with(Database.metrics.export, 'metrics.prom')
+
+
+def test_finish_setup_without_cover_cache(mocker):
+    mocker.patch.object(Database, 'isbns')
+    mocker.patch.object(Database, 'covers', None)
+    mocker.patch('bookmeister.__main__.CoverCache', side_effect=OSError)
+    mocker.patch('bookmeister.__main__.Thread')
+    finish_setup(mocker.MagicMock())
+    assert Database.covers is None
+
+
+def test_heavy_modules_imported_on_first_use():
+    code = ('import sys, bookmeister.__main__; '
+            'print(sorted({"PIL", "webbrowser", "tkinter.filedialog", '
+            '"bookmeister.picture"} & set(sys.modules)))')
+    result = subprocess.run([sys.executable, '-c', code], check=True,
+                            capture_output=True, text=True)
+    assert result.stdout.strip() == '[]'
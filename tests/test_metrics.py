@@ -0,0 +1,78 @@
+from json import loads
+
+from bookmeister import metrics
+
+
+def test_histogram_buckets():
+    histogram = metrics.Histogram((0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 5):
+        histogram.observe(value)
+    assert histogram.counts == [2, 1, 1]
+    assert histogram.count == 4
+    assert histogram.sum == 5.65
+    assert histogram.cumulative() == [(0.1, 2), (1.0, 3), (float('inf'), 4)]
+
+
+def test_counters_identified_by_labels():
+    registry = metrics.Metrics()
+    registry.inc('requests_total', operation='add', status='201')
+    registry.inc('requests_total', status='201', operation='add')
+    registry.inc('requests_total', 5, operation='search', status='200')
+    assert registry.snapshot()['counters'] == [
+        {'name': 'requests_total',
+         'labels': {'operation': 'add', 'status': '201'}, 'value': 2},
+        {'name': 'requests_total',
+         'labels': {'operation': 'search', 'status': '200'}, 'value': 5}]
+
+
+def test_snapshot_histograms():
+    registry = metrics.Metrics(buckets=(1.0,))
+    registry.observe('request_seconds', 0.5, operation='add')
+    registry.observe('request_seconds', 2, operation='add')
+    assert registry.snapshot()['histograms'] == [
+        {'name': 'request_seconds', 'labels': {'operation': 'add'},
+         'buckets': [1.0], 'counts': [1, 1], 'sum': 2.5, 'count': 2}]
+
+
+def test_clear():
+    registry = metrics.Metrics()
+    registry.inc('requests_total')
+    registry.observe('request_seconds', 1)
+    registry.clear()
+    assert registry.snapshot() == {'counters': [], 'histograms': []}
+
+
+def test_prometheus_format():
+    registry = metrics.Metrics(buckets=(0.5,))
+    registry.inc('requests_total', operation='add', status='201')
+    registry.inc('requests_total', operation='say "hi"\n', status='201')
+    registry.observe('request_seconds', 0.25, operation='add')
+    assert registry.to_prometheus() == (
+        '# TYPE bookmeister_requests_total counter\n'
+        'bookmeister_requests_total{operation="add",status="201"} 1\n'
+        'bookmeister_requests_total{operation="say \\"hi\\"\\n",'
+        'status="201"} 1\n'
+        '# TYPE bookmeister_request_seconds histogram\n'
+        'bookmeister_request_seconds_bucket{operation="add",le="0.5"} 1\n'
+        'bookmeister_request_seconds_bucket{operation="add",le="+Inf"} 1\n'
+        'bookmeister_request_seconds_sum{operation="add"} 0.25\n'
+        'bookmeister_request_seconds_count{operation="add"} 1\n')
+
+
+def test_prometheus_without_labels():
+    registry = metrics.Metrics(prefix='app')
+    registry.inc('started_total')
+    assert registry.to_prometheus() == (
+        '# TYPE app_started_total counter\napp_started_total 1\n')
+
+
+def test_export(tmp_path):
+    registry = metrics.Metrics()
+    registry.inc('requests_total', operation='add')
+    registry.export(str(tmp_path / 'metrics.json'))
+    registry.export(str(tmp_path / 'metrics.prom'))
+    snapshot = loads((tmp_path / 'metrics.json').read_text())
+    assert snapshot == registry.snapshot()
+    assert (tmp_path / 'metrics.prom').read_text() == registry.to_prometheus()
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        'metrics.json', 'metrics.prom']
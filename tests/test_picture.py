@@ -0,0 +1,94 @@
+from io import BytesIO
+
+import PIL.Image
+import pytest
+
+from bookmeister import picture
+
+
+def encoded(size=(2000, 1500), mode='RGB', image_format='PNG', color=1,
+            **params):
+    image = PIL.Image.new(mode, size, color)
+    output = BytesIO()
+    image.save(output, image_format, **params)
+    output.seek(0)
+    return output
+
+
+@pytest.mark.parametrize('size,expected', (
+        ((2000, 1500), (800, 600)),
+        ((1000, 3000), (400, 1200)),
+        ((300, 200), (300, 200)),
+))
+def test_prepare_scales_down(size, expected):
+    with PIL.Image.open(picture.prepare(encoded(size))) as image:
+        assert image.size == expected
+        assert image.format == 'JPEG'
+
+
+def test_prepare_custom_size():
+    prepared = picture.prepare(encoded(), max_size=(100, 100))
+    with PIL.Image.open(prepared) as image:
+        assert image.size == (100, 75)
+
+
+def test_prepare_progressive_jpeg():
+    prepared = picture.prepare(encoded())
+    assert prepared.name == 'cover.jpg'
+    assert prepared.tell() == 0
+    with PIL.Image.open(prepared) as image:
+        assert image.info.get('progressive')
+
+
+def test_prepare_webp():
+    prepared = picture.prepare(encoded(mode='RGBA', color=(255, 0, 0, 128)),
+                               image_format='webp')
+    assert prepared.name == 'cover.webp'
+    with PIL.Image.open(prepared) as image:
+        assert image.format == 'WEBP'
+        assert image.mode == 'RGBA'
+
+
+@pytest.mark.parametrize('mode', ('RGBA', 'LA', 'P', 'L', 'CMYK'))
+def test_prepare_jpeg_modes(mode):
+    image_format = 'JPEG' if mode == 'CMYK' else 'PNG'
+    prepared = picture.prepare(encoded((50, 50), mode, image_format))
+    with PIL.Image.open(prepared) as image:
+        assert image.mode == 'RGB'
+
+
+def test_prepare_strips_metadata():
+    exif = PIL.Image.Exif()
+    exif[0x010F] = 'Phone maker'
+    source = encoded(image_format='JPEG', exif=exif.tobytes(),
+                     icc_profile=b'profile')
+    with PIL.Image.open(picture.prepare(source)) as image:
+        assert 'exif' not in image.info
+        assert 'icc_profile' not in image.info
+
+
+def test_prepare_applies_orientation():
+    exif = PIL.Image.Exif()
+    exif[0x0112] = 6
+    source = encoded((400, 200), image_format='JPEG', exif=exif.tobytes())
+    with PIL.Image.open(picture.prepare(source)) as image:
+        assert image.size == (200, 400)
+
+
+def test_prepare_smaller_than_source():
+    source = PIL.Image.effect_noise((2000, 1500), 64).convert('RGB')
+    output = BytesIO()
+    source.save(output, 'PNG')
+    output.seek(0)
+    assert len(picture.prepare(output).getvalue()) * 10 < len(
+        output.getvalue())
+
+
+def test_prepare_unsupported_format():
+    with pytest.raises(ValueError):
+        picture.prepare(encoded(), image_format='GIF')
+
+
+def test_prepare_not_image():
+    with pytest.raises(OSError):
+        picture.prepare(BytesIO(b'not image'))
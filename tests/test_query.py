@@ -0,0 +1,97 @@
+from json import loads
+from urllib.parse import unquote
+import pytest
+
+from bookmeister.query import Query
+
+
+def test_query_chain():
+    query = Query({'Language': 'EN'}).prefix('Author', 'tolk').between(
+        'Price', '10', 25.5).sort('Release', descending=True).sort(
+        'Title').limit(20)
+    assert query.parameters == {
+        'Language': 'EN',
+        'Author': {'$regex': '^tolk', '$options': 'i'},
+        'Price': {'$gte': 10.0, '$lte': 25.5},
+    }
+    assert query.order == {'Release': -1, 'Title': 1}
+    assert query.maximum == 20
+    assert not query.plain
+
+
+def test_query_plain():
+    query = Query().equal('ISBN', 9780340425626)
+    assert query.plain
+    assert query == Query({'ISBN': 9780340425626})
+    assert query != Query({'ISBN': 9780340425626}).limit(1)
+
+
+def test_query_prefix_escaped():
+    query = Query().prefix('Title', 'C++ (2nd')
+    assert query.parameters['Title']['$regex'] == r'^C\+\+\ \(2nd'
+
+
+@pytest.mark.parametrize('minimum,maximum,expected', (
+        (2000, None, {'$gte': 2000}),
+        (None, '2010', {'$lte': 2010}),
+        (2000, 2000, {'$gte': 2000, '$lte': 2000}),
+))
+def test_query_between(minimum, maximum, expected):
+    assert Query().between('Release', minimum, maximum).parameters == {
+        'Release': expected}
+
+
+@pytest.mark.parametrize('field,minimum,maximum,message', (
+        ('Title', 1, 2, 'cannot be searched by range'),
+        ('Quantity', None, None, 'needs minimum or maximum'),
+        ('Quantity', 'few', None, 'needs numbers'),
+        ('Price', 10, 5, 'greater than maximum'),
+))
+def test_query_between_error(field, minimum, maximum, message):
+    with pytest.raises(ValueError, match=message):
+        Query().between(field, minimum, maximum)
+
+
+@pytest.mark.parametrize('field,text', (('ISBN', '978'), ('Title', '')))
+def test_query_prefix_error(field, text):
+    with pytest.raises(ValueError, match='(?i)prefix'):
+        Query().prefix(field, text)
+
+
+def test_query_sort_again():
+    query = Query().sort('Title').sort('Price').sort('Title', True)
+    assert list(query.order.items()) == [('Price', 1), ('Title', -1)]
+
+
+def test_query_sort_error():
+    with pytest.raises(ValueError, match='cannot be sorted'):
+        Query().sort('Colour')
+
+
+@pytest.mark.parametrize('count', (0, -1, 2.5, True, '10'))
+def test_query_limit_error(count):
+    with pytest.raises(ValueError, match='positive integer'):
+        Query().limit(count)
+
+
+@pytest.mark.parametrize('query,arguments,expected', (
+        (Query(), (), '?q={}'),
+        (Query({'Type': 'Test'}).limit(5), (None, 0, None),
+         '?q={"Type": "Test"}&max=5'),
+        (Query().sort('Price', True).limit(5), (['Title'],),
+         '?q={}&h={"$orderby": {"Price": -1}, "$fields": {"Title": 1}}'
+         '&max=5'),
+        (Query().limit(5), (None, 4, 2),
+         '?q={}&h={"$orderby": {"_id": 1}}&skip=4&max=2'),
+        (Query().sort('Release').limit(3), (None, 2, 10),
+         '?q={}&h={"$orderby": {"Release": 1, "_id": 1}}&skip=2&max=3'),
+))
+def test_query_url(query, arguments, expected):
+    assert unquote(query.url(*arguments)) == expected
+
+
+def test_query_url_reserved_characters():
+    query = Query().prefix('Title', 'C++ & C#').equal('Type', '50% = ?/;')
+    url = query.url(['Title'])
+    assert not set('&#+=?/; ') & set(url.split('&h=')[0][3:])
+    assert loads(unquote(url.split('&h=')[0][3:])) == query.parameters
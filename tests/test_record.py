@@ -254,3 +254,87 @@ def test_record_raise_error(key, value):
 ))
 def test_record_cast_values(cast_record, expected):
     assert cast_record == expected
+
+
+@pytest.mark.parametrize('original,expected', (
+        ({'Title': 'Test me', 'Price': 5.75, 'Hardcover': False}, {}),
+        ({'Title': 'Tested', 'Price': 5.75, 'Hardcover': False},
+         {'Title': 'Test me'}),
+        ({'Title': 'Test me', 'Price': 5, 'Hardcover': False},
+         {'Price': 5.75}),
+        ({'Title': 'Test me', 'Price': 5.75}, {'Hardcover': False}),
+        (None, {'Title': 'Test me', 'Price': 5.75, 'Hardcover': False}),
+))
+def test_record_changes(original, expected):
+    changed = record.Record(Title='Test me', Price=5.75, Hardcover=False)
+    assert changed.changes(original) == expected
+    if original is not None:
+        assert changed.changes(record.BookRecord(original)) == expected
+
+
+def test_record_changes_partial_original():
+    changed = record.Record(Title='Test me', Price=5.75)
+    original = {'_id': '5eb00ffce332cd260015d67c', 'Title': 'Test me',
+                'Price': 5.75}
+    with pytest.raises(ValueError, match='downloaded partially'):
+        changed.changes(record.BookRecord(original, partial=True))
+
+
+DATA = {'_id': '5fc00c0d', 'Title': 'Test me', 'ISBN': 9780340425626,
+        'Price': 5.75, 'Hardcover': True, '_created': '2020-05-01'}
+
+
+def test_book_record_from_and_to_dict():
+    book = record.BookRecord(DATA)
+    assert book.to_dict() == DATA
+    assert book.extra == {'_created': '2020-05-01'}
+    assert book == DATA
+    assert dict(book) == DATA
+    assert len(book) == len(DATA)
+
+
+def test_book_record_without_extra_fields():
+    book = record.BookRecord({'Title': 'Test me'})
+    assert book.extra is None
+    assert book.keys() == ['Title']
+    assert repr(book) == "BookRecord({'Title': 'Test me'})"
+
+
+def test_book_record_missing_field():
+    book = record.BookRecord(DATA)
+    assert 'Author' not in book and 'Title' in book and '_created' in book
+    assert book.get('Author', 'none') == 'none'
+    with pytest.raises(KeyError):
+        book['Author']
+    with pytest.raises(KeyError):
+        record.BookRecord()['_created']
+
+
+def test_book_record_uses_slots():
+    book = record.BookRecord(DATA)
+    assert not hasattr(book, '__dict__')
+    with pytest.raises(TypeError):
+        hash(book)
+
+
+@pytest.mark.parametrize('key, value', (
+        ('Title', ''),
+        ('ISBN', '9780340425620'),
+        ('Price', '12.345'),
+        ('Language', 'E2'),
+        ('Release', '1321'),
+))
+def test_book_record_raise_error(key, value):
+    with pytest.raises(ValueError):
+        record.BookRecord()[key] = value
+
+
+def test_book_record_cast_like_record():
+    values = {'Title': 'Test me', 'ISBN': '9780340425626', 'Price': '5.75',
+              'Pages': '999', 'Discount': '5', 'Cover': '5fc00c0e'}
+    book, expected = record.BookRecord(), record.Record()
+    for key, value in values.items():
+        book[key] = expected[key] = value
+    book.cast()
+    expected.cast()
+    assert book == expected
@@ -0,0 +1,99 @@
+import pytest
+from requests.exceptions import ConnectionError
+
+from bookmeister.replica import Replica
+
+RECORDS = [
+    {'_id': '1', '_changed': '2020-05-01T10:00:00.000Z', 'Title': 'Test me',
+     'Author': 'Mr Test', 'ISBN': 9780340425626, 'Pages': 999},
+    {'_id': '2', '_changed': '2020-05-02T10:00:00.000Z',
+     'Title': 'Testing madness', 'Author': 'Mr Test', 'ISBN': 9780141190419,
+     'Pages': 529},
+    {'_id': '3', '_changed': '2020-05-03T10:00:00.000Z', 'Title': 'Test me',
+     'Author': 'T. Tested', 'ISBN': 9780515055160, 'Pages': 728},
+]
+
+
+@pytest.fixture
+def database(mocker):
+    mock = mocker.MagicMock()
+    mock.iter_pages.return_value = [RECORDS[:2], RECORDS[2:]]
+    return mock
+
+
+@pytest.fixture
+def replica(database):
+    tested = Replica()
+    tested.sync(database)
+    return tested
+
+
+def test_full_sync(replica, database):
+    database.iter_pages.assert_called_once_with({}, 500)
+    assert len(replica) == 3
+    assert replica.last_change == '2020-05-03T10:00:00.000Z'
+
+
+def test_incremental_sync(replica, database):
+    changed = dict(RECORDS[0], Pages=1000, _changed='2020-06-01T10:00:00Z')
+    database.iter_pages.return_value = [[changed]]
+    assert replica.sync(database) == 1
+    database.iter_pages.assert_called_with(
+        {'_changed': {'$gte': {'$date': '2020-05-03T10:00:00.000Z'}}}, 500)
+    assert replica.search({'_id': '1'})[0]['Pages'] == 1000
+    assert len(replica) == 3
+
+
+def test_full_sync_removes_deleted(replica, database):
+    database.iter_pages.return_value = [RECORDS[1:]]
+    replica.sync(database, full=True)
+    assert replica.search({'_id': '1'}) == []
+    assert len(replica) == 2
+
+
+def test_sync_error_keeps_records(replica, database):
+    def pages(*_):
+        yield [dict(RECORDS[0], Pages=1)]
+        raise ConnectionError
+
+    database.iter_pages.side_effect = pages
+    with pytest.raises(ConnectionError):
+        replica.sync(database, full=True)
+    assert replica.search({'_id': '1'})[0]['Pages'] == 999
+    assert replica.last_change == '2020-05-03T10:00:00.000Z'
+
+
+def test_not_synchronized():
+    assert Replica().search({'Title': 'Test me'}) is None
+
+
+@pytest.mark.parametrize('parameters,expected', (
+        ({'Title': 'Test me'}, ['1', '3']),
+        ({'Title': 'Test me', 'Author': 'Mr Test'}, ['1']),
+        ({'ISBN': 9780141190419}, ['2']),
+        ({'Pages': 728}, ['3']),
+        ({'Author': 'Mr Test', 'Pages': 529}, ['2']),
+        ({}, ['1', '2', '3']),
+        ({'Title': 'test me'}, []),
+))
+def test_search(replica, parameters, expected):
+    assert [record['_id'] for record in replica.search(parameters)] == \
+        expected
+
+
+def test_search_with_operators(replica):
+    assert replica.search({'Price': {'$gt': 10}}) is None
+
+
+def test_store_and_remove(replica):
+    replica.store([dict(RECORDS[0], _id='4', _changed='2021-01-01')])
+    assert len(replica.search({'Title': 'Test me'})) == 3
+    assert replica.last_change == '2020-05-03T10:00:00.000Z'
+    replica.remove('1')
+    assert len(replica.search({'Title': 'Test me'})) == 2
+
+
+def test_file(tmp_path, database):
+    path = str(tmp_path / 'books.sqlite')
+    Replica(path).sync(database)
+    assert len(Replica(path).search({'Author': 'Mr Test'})) == 2
@@ -0,0 +1,140 @@
+from io import StringIO
+from json import dumps
+
+import PIL.Image
+import pytest
+
+from bookmeister import uploader
+
+ISBNS = ('9780340425626', '9788324631766', '9780306406157')
+
+
+@pytest.fixture
+def directory(tmp_path):
+    for isbn in ISBNS:
+        PIL.Image.new('RGB', (40, 60), 'red').save(tmp_path / f'{isbn}.png')
+    (tmp_path / '978-0-7432-7356-5.JPG').write_bytes(b'not image')
+    (tmp_path / '9780340425620.png').write_bytes(b'wrong number')
+    (tmp_path / 'notes.txt').write_text('not image')
+    return tmp_path
+
+
+@pytest.fixture
+def database(mocker):
+    mocked = mocker.MagicMock()
+    mocked.search.side_effect = lambda parameters, fields: [
+        {'_id': f'id{isbn}', 'ISBN': isbn}
+        for isbn in parameters['ISBN']['$in'] if isbn != int(ISBNS[2])]
+    mocked.upload_image.return_value = '5fc00c0d'
+    mocked.update.return_value = True
+    return mocked
+
+
+def test_find_images(directory):
+    images, unknown = uploader.find_images(directory)
+    assert sorted(images) == sorted(ISBNS + ('9780743273565',))
+    assert [path.name for path in unknown] == ['9780340425620.png']
+
+
+def test_prepare_file(directory):
+    data = uploader.prepare_file(directory / f'{ISBNS[0]}.png')
+    assert data.startswith(b'\xff\xd8\xff')
+    assert uploader.prepare_file(directory / 'notes.txt') is None
+
+
+def test_resolve_in_chunks(database):
+    ids = uploader.resolve(database, ISBNS, chunk_size=2)
+    assert ids == {ISBNS[0]: f'id{ISBNS[0]}', ISBNS[1]: f'id{ISBNS[1]}'}
+    assert database.search.call_count == 2
+    assert database.search.call_args[0][1] == ('ISBN',)
+
+
+def test_resolve_no_connection(database):
+    database.search.side_effect = None
+    database.search.return_value = None
+    assert uploader.resolve(database, ISBNS) is None
+
+
+def test_state(tmp_path):
+    path = tmp_path / 'state.json'
+    assert uploader.load_state(path) == {'uploaded': {}, 'done': set()}
+    state = {'uploaded': {ISBNS[0]: '5fc00c0d'}, 'done': {ISBNS[0]}}
+    uploader.save_state(path, state)
+    assert uploader.load_state(path) == state
+
+
+@pytest.mark.parametrize('image_id,updated,expected', (
+        ('5fc00c0d', True, ('5fc00c0d', True)),
+        ('5fc00c0d', False, ('5fc00c0d', False)),
+        (None, True, (None, False)),
+))
+def test_attach(database, image_id, updated, expected):
+    database.upload_image.return_value = image_id
+    database.update.return_value = updated
+    assert uploader.attach(database, 'id', b'image') == expected
+    assert database.upload_image.call_args[0][0].read() == b'image'
+
+
+def test_attach_uploaded_before(database):
+    assert uploader.attach(database, 'id', b'image', 'ab12') == ('ab12', True)
+    database.upload_image.assert_not_called()
+    database.update.assert_called_once_with('id', {'Cover': 'ab12'})
+
+
+def test_upload_covers(directory, database):
+    errors, progress = StringIO(), []
+    assert uploader.upload_covers(
+        directory, database, processes=0, batch_size=1, errors=errors,
+        progress=lambda *args: progress.append(args)) == (2, 3)
+    assert database.update.call_count == 2
+    assert progress == [(1, 3), (2, 3), (3, 3)]
+    report = errors.getvalue()
+    assert '9780340425620.png: name is not correct' in report
+    assert f'{ISBNS[2]}.png: no record' in report
+    assert '978-0-7432-7356-5.JPG: wrong image file format' in report
+    state = uploader.load_state(directory / uploader.STATE)
+    assert state['done'] == set(ISBNS[:2])
+
+
+def test_upload_covers_in_processes(directory, database):
+    assert uploader.upload_covers(directory, database, processes=2,
+                                  errors=StringIO()) == (2, 3)
+
+
+def test_upload_covers_resumed(directory, database, tmp_path, mocker):
+    spy = mocker.spy(uploader, 'prepare_file')
+    state_path = tmp_path / 'state.json'
+    state_path.write_text(dumps({'uploaded': {ISBNS[0]: 'a1', ISBNS[1]: 'b2'},
+                                 'done': [ISBNS[0]]}))
+    assert uploader.upload_covers(directory, database, processes=0,
+                                  state_path=str(state_path),
+                                  errors=StringIO()) == (1, 3)
+    database.upload_image.assert_not_called()
+    database.update.assert_called_once_with(f'id{ISBNS[1]}', {'Cover': 'b2'})
+    assert [call[0][0].stem for call in spy.call_args_list] == [
+        '978-0-7432-7356-5']
+
+
+def test_upload_covers_failed_upload(directory, database):
+    database.upload_image.return_value = None
+    errors = StringIO()
+    assert uploader.upload_covers(directory, database, processes=0,
+                                  errors=errors) == (0, 5)
+    assert errors.getvalue().count('could not save cover') == 2
+
+
+def test_upload_covers_no_connection(directory, database):
+    database.search.side_effect = None
+    database.search.return_value = None
+    errors = StringIO()
+    assert uploader.upload_covers(directory, database, processes=0,
+                                  errors=errors) == (0, 5)
+    assert 'Could not search records' in errors.getvalue()
+
+
+def test_main(directory, mocker, capsys):
+    mocked = mocker.patch('bookmeister.uploader.upload_covers')
+    mocked.return_value = (3, 0)
+    assert uploader.main([str(directory), '--threads', '2']) == 0
+    assert mocked.call_args[1]['threads'] == 2
+    assert 'Attached 3 covers, 0 failed' in capsys.readouterr().out